@@ -0,0 +1,612 @@
+"""Synthetic-load benchmarks for ChaoSmart's collectors, models and tabs.
+
+psutil, the filesystem and winreg are replaced with generated stand-ins
+(10k processes, a directory with 1M entries, a deep registry tree), so the
+numbers depend on ChaoSmart's code rather than on the machine's state.
+
+    python benchmarks.py                     # headless and offscreen Qt, compare to baseline
+    python benchmarks.py --quick             # a tenth of the scale
+    python benchmarks.py --no-qt             # collectors only, no QApplication
+    python benchmarks.py --output run.json   # also write the results
+    python benchmarks.py --save-baseline     # record this run as the new baseline
+
+A benchmark regresses when its fastest run is slower than the baseline's
+fastest run by more than --tolerance (a fraction) plus --slack
+milliseconds; the minimum is far less noisy than the median. Any regression
+makes the run exit with status 1. Baselines only compare against runs at
+the same scale. A few correctness checks run alongside (edge cases a
+timing alone would not catch); a failed check also exits with status 1.
+"""
+import argparse
+import contextlib
+import json
+import os
+import platform
+import shutil
+import socket
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from array import array
+from collections import namedtuple
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarks_baseline.json")
+SCALES = {
+    "full": {"processes": 10000, "entries": 1000000, "registry_depth": 7, "registry_fanout": 5,
+             "connections": 10000},
+    "quick": {"processes": 1000, "entries": 100000, "registry_depth": 5, "registry_fanout": 5,
+              "connections": 1000},
+}
+
+# ==========================
+# Fake psutil
+# ==========================
+CpuTimes = namedtuple("CpuTimes", "user system")
+MemoryInfo = namedtuple("MemoryInfo", "rss vms")
+VirtualMemory = namedtuple("VirtualMemory", "total available percent used")
+DiskUsage = namedtuple("DiskUsage", "total used free percent")
+DiskPartition = namedtuple("DiskPartition", "device mountpoint fstype opts")
+DiskIo = namedtuple("DiskIo", "read_bytes write_bytes")
+NetIo = namedtuple("NetIo", "bytes_sent bytes_recv packets_sent packets_recv")
+Address = namedtuple("Address", "family address")
+SocketAddress = namedtuple("SocketAddress", "ip port")
+Connection = namedtuple("Connection", "fd family type laddr raddr status pid")
+
+class FakeProcessError(Exception):
+    pass
+
+class FakeProcess:
+    """A psutil.Process look-alike whose counters advance on every read."""
+    def __init__(self, psutil, pid):
+        if pid not in psutil.table:
+            raise psutil.NoSuchProcess(pid)
+        self.psutil = psutil
+        self.pid = pid
+        self.info = {"name": psutil.table[pid][0]}
+
+    def is_running(self):
+        return self.pid in self.psutil.table
+
+    def create_time(self):
+        return self.psutil.table[self.pid][1]
+
+    def name(self):
+        return self.psutil.table[self.pid][0]
+
+    def cpu_times(self):
+        self.psutil.ticks += 1
+        base = self.pid * 0.01 + self.psutil.ticks * 1e-6
+        return CpuTimes(base, base / 2)
+
+    def ppid(self):
+        # An eight-way tree a handful of levels deep, rooted at PID 1
+        return self.pid // 8
+
+    def memory_info(self):
+        return MemoryInfo((self.pid % 512) << 20, (self.pid % 512) << 21)
+
+    def io_counters(self):
+        return DiskIo(self.psutil.ticks * self.pid, self.psutil.ticks)
+
+    @contextlib.contextmanager
+    def oneshot(self):
+        yield
+
+    def as_dict(self, attrs, ad_value=None):
+        return {attr: getattr(self, attr)() for attr in attrs}
+
+class FakePsutil:
+    """Enough of psutil for ChaoSmart, with a configurable number of processes."""
+    class NoSuchProcess(FakeProcessError):
+        pass
+
+    class AccessDenied(FakeProcessError):
+        pass
+
+    class ZombieProcess(NoSuchProcess):
+        pass
+
+    class TimeoutExpired(FakeProcessError):
+        pass
+
+    def __init__(self, processes=10000, connections=10000, cores=8, nics=4, disks=8):
+        self.table = {pid: (f"process-{pid % 997}", 1_600_000_000.0 + pid) for pid in range(1, processes + 1)}
+        self.connection_count = connections
+        self.cores = cores
+        self.nics = [f"eth{index}" for index in range(nics)]
+        self.disks = [f"sd{chr(ord('a') + index)}" for index in range(disks)]
+        self.ticks = 0
+
+    def Process(self, pid=None):
+        return FakeProcess(self, pid if pid is not None else 1)
+
+    def pids(self):
+        return list(self.table)
+
+    def process_iter(self, attrs=None):
+        return (FakeProcess(self, pid) for pid in list(self.table))
+
+    def cpu_percent(self, interval=None, percpu=False):
+        self.ticks += 1
+        value = float(self.ticks % 100)
+        return [value] * self.cores if percpu else value
+
+    def virtual_memory(self):
+        return VirtualMemory(16 << 30, 8 << 30, 50.0, 8 << 30)
+
+    def disk_usage(self, path):
+        return DiskUsage(512 << 30, 256 << 30, 256 << 30, 50.0)
+
+    def disk_partitions(self, all=False):
+        return [DiskPartition(f"/dev/{disk}1", "/" if index == 0 else f"/mnt/{disk}", "ext4", "rw")
+                for index, disk in enumerate(self.disks)]
+
+    def disk_io_counters(self, perdisk=False):
+        counters = DiskIo(self.ticks * 4096, self.ticks * 8192)
+        return {disk: counters for disk in self.disks} if perdisk else counters
+
+    def net_if_addrs(self):
+        return {nic: [Address(socket.AF_INET, f"10.0.{index}.1")] for index, nic in enumerate(self.nics)}
+
+    def net_io_counters(self, pernic=False):
+        counters = NetIo(self.ticks * 1000, self.ticks * 2000, self.ticks, self.ticks * 2)
+        return {nic: counters for nic in self.nics} if pernic else counters
+
+    def net_connections(self, kind="inet"):
+        pids = list(self.table)
+        return [Connection(-1, socket.AF_INET, socket.SOCK_STREAM,
+                           SocketAddress("127.0.0.1", 1024 + index % 60000),
+                           SocketAddress("10.1.2.3", 443) if index % 3 else (),
+                           "ESTABLISHED" if index % 3 else "LISTEN", pids[index % len(pids)])
+                for index in range(self.connection_count)]
+
+# ==========================
+# Fake filesystem
+# ==========================
+FakeStat = namedtuple("FakeStat", "st_size st_mtime st_mtime_ns st_mode")
+
+class FakeDirEntry:
+    __slots__ = ("name", "path", "folder")
+
+    def __init__(self, root, index):
+        self.name = f"file-{index:07d}.dat" if index % 10 else f"folder-{index:07d}"
+        self.path = root + "/" + self.name
+        self.folder = not index % 10
+
+    def is_dir(self):
+        return self.folder
+
+    def is_file(self):
+        return not self.folder
+
+    def stat(self):
+        return FakeStat(4096, 1_700_000_000.0, 1_700_000_000_000_000_000, 0o100644)
+
+class FakeScandir:
+    def __init__(self, root, entries):
+        self.iterator = (FakeDirEntry(root, index) for index in range(entries))
+
+    def __enter__(self):
+        return self.iterator
+
+    def __exit__(self, *exc):
+        return False
+
+    def __iter__(self):
+        return self.iterator
+
+@contextlib.contextmanager
+def fake_directory(entries, root="/chaosmart-benchmark"):
+    """Make os.scandir/os.stat report `entries` entries under root; other paths are untouched."""
+    real_scandir, real_stat = os.scandir, os.stat
+
+    def scandir(path="."):
+        if str(path) == root:
+            return FakeScandir(root, entries)
+        return real_scandir(path)
+
+    def stat(path, *args, **kwargs):
+        if isinstance(path, str) and path.startswith(root):
+            return FakeStat(4096, 1_700_000_000.0, 1_700_000_000_000_000_000, 0o040755)
+        return real_stat(path, *args, **kwargs)
+
+    os.scandir, os.stat = scandir, stat
+    try:
+        yield root
+    finally:
+        os.scandir, os.stat = real_scandir, real_stat
+
+# ==========================
+# Fake registry
+# ==========================
+def registry_tree(depth, fanout, values=4):
+    """A {"values": ..., "keys": ...} tree in MemoryRegistryBackend's format."""
+    def build(level, prefix):
+        node = {"values": [[f"Value{index}", 1, f"{prefix} data {index}"] for index in range(values)]}
+        if level < depth:
+            node["keys"] = {f"Key{index}": build(level + 1, f"{prefix}.{index}") for index in range(fanout)}
+        return node
+    software = build(1, "root")
+    software["keys"]["Wide"] = {"keys": {f"Entry{index:05d}": {} for index in range(fanout ** 4)}}
+    return {"HKEY_CURRENT_USER": {"keys": {"Software": software}}}
+
+class FakeKeyHandle:
+    def __init__(self, key):
+        self.key = key
+        self.subkeys = None
+        self.values = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def Close(self):
+        pass
+
+class FakeWinreg:
+    """The winreg functions WinRegistryBackend calls, over a MemoryRegistryBackend tree."""
+    KEY_READ = 0x20019
+    KEY_SET_VALUE = 0x0002
+
+    def __init__(self, memory_backend):
+        self.memory = memory_backend
+        for hive in memory_backend.hives:
+            setattr(self, hive, hive)
+
+    def OpenKey(self, hive, sub_key, reserved=0, access=KEY_READ):
+        return FakeKeyHandle(self.memory._key(hive + "\\" + sub_key if sub_key else hive))
+
+    def CreateKey(self, hive, sub_key):
+        return FakeKeyHandle(self.memory._key(hive + "\\" + sub_key, create=True))
+
+    def QueryInfoKey(self, handle):
+        return len(handle.key.subkeys), len(handle.key.values), handle.key.last_write
+
+    def EnumKey(self, handle, index):
+        if handle.subkeys is None:
+            handle.subkeys = [child.name for child in handle.key.subkeys.values()]
+        try:
+            return handle.subkeys[index]
+        except IndexError:
+            raise OSError("No more data is available") from None
+
+    def EnumValue(self, handle, index):
+        if handle.values is None:
+            handle.values = list(handle.key.values.values())
+        try:
+            return handle.values[index]
+        except IndexError:
+            raise OSError("No more data is available") from None
+
+    def SetValueEx(self, handle, name, reserved, value_type, data):
+        handle.key.values[name.lower()] = (name, data, value_type)
+
+    def DeleteValue(self, handle, name):
+        if handle.key.values.pop(name.lower(), None) is None:
+            raise FileNotFoundError(name)
+
+# ==========================
+# Runner
+# ==========================
+class Suite:
+    def __init__(self, scale, repeat):
+        self.scale = scale
+        self.repeat = repeat
+        self.results = {}
+        self.failures = []  # (check name, reason)
+
+    def measure(self, name, func, setup=None, repeat=None):
+        """Time func(state) after setup() for each run; report min and median in ms."""
+        timings = []
+        for _ in range(repeat or self.repeat):
+            state = setup() if setup is not None else None
+            started = time.perf_counter()
+            func(state)
+            timings.append((time.perf_counter() - started) * 1000)
+        self.results[name] = {"min_ms": round(min(timings), 3), "median_ms": round(statistics.median(timings), 3),
+                              "runs": len(timings)}
+        print(f"  {name:<34} {self.results[name]['median_ms']:>10.2f} ms", flush=True)
+
+    def check(self, name, func, timeout=10.0):
+        """Run func() on a daemon thread; it fails by raising or by not returning within timeout."""
+        errors = []
+
+        def run():
+            try:
+                func()
+            except Exception as e:
+                errors.append(f"{type(e).__name__}: {e}")
+
+        thread = threading.Thread(target=run, name=name, daemon=True)
+        thread.start()
+        thread.join(timeout)
+        reason = f"no result after {timeout:.0f} s" if thread.is_alive() else (errors[0] if errors else None)
+        if reason is not None:
+            self.failures.append((name, reason))
+        print(f"  {name:<34} {'FAILED' if reason else 'ok':>13}", flush=True)
+
+def lttb_bucket_edges(chaosmart):
+    """Decimate a series with a gap before a sample exactly on a bucket edge.
+
+    Float bucket edges k * width can floor to k - 1, which used to leave the
+    decimator stuck on the empty bucket before such a sample.
+    """
+    start, span, buckets = 1700134364.2441125, 3600.0, 114
+    width = span / buckets
+    edge = next(k * width for k in range(int((start + span / 2) // width) + 2, int((start + span) // width))
+                if (k * width) // width == k - 1)
+    times = array('d', [start + second for second in range(int(span / 2))] + [edge]
+                  + [edge + 1 + second for second in range(100)])
+    values = array('d', (float(index % 7) for index in range(len(times))))
+    points, final = chaosmart.LttbDecimator().decimate(times, values, start, start + span, buckets)
+    stamps = [t for t, value in points]
+    assert stamps == sorted(set(stamps)), "points out of order"
+    assert start <= stamps[0] and stamps[-1] == times[-1], "points outside the series"
+    assert len(points) <= buckets + 1, f"{len(points)} points for {buckets} buckets"
+
+def headless_benchmarks(suite, chaosmart, workdir):
+    scale = suite.scale
+    fake = chaosmart.psutil
+
+    registry = chaosmart.ProcessRegistry()
+    suite.measure("process_snapshot_cold", lambda _: chaosmart.ProcessRegistry().snapshot())
+    registry.snapshot()
+    suite.measure("process_snapshot_warm", lambda _: registry.snapshot())
+
+    names = {pid: name for pid, (name, created) in fake.table.items()}
+    suite.measure("collect_connections", lambda _: chaosmart.collect_connections(lambda: names))
+
+    sampler = chaosmart.MetricsSampler()
+    suite.measure("sampler_sample", lambda _: [sampler.sample() for _ in range(100)])
+
+    with fake_directory(scale["entries"]) as root:
+        suite.measure("scan_directory", lambda _: sum(len(chunk[0]) for chunk in
+                                                      chaosmart.scan_directory(root, lambda: False)))
+
+    memory = chaosmart.MemoryRegistryBackend()
+    memory.load(registry_tree(scale["registry_depth"], scale["registry_fanout"]))
+    deep = "HKEY_CURRENT_USER\\Software" + "\\Key1" * (scale["registry_depth"] - 1)
+    sys.modules["winreg"] = FakeWinreg(memory)
+    try:
+        winreg_backend = chaosmart.WinRegistryBackend()
+    finally:
+        del sys.modules["winreg"]
+    suite.measure("winreg_subkeys_wide", lambda _: winreg_backend.subkeys("HKEY_CURRENT_USER\\Software\\Wide"))
+    suite.measure("winreg_values_deep", lambda _: [winreg_backend.values(deep) for _ in range(1000)])
+    suite.measure("registry_search", lambda _: chaosmart.RegistrySearch(
+        memory, "HKEY_CURRENT_USER\\Software", "data 3").run(lambda hits: None, interval=0.01))
+
+    times = array('d', (1_700_000_000.0 + second for second in range(86400)))
+    values = array('d', (float(second % 100) for second in range(86400)))
+    suite.measure("lttb_24h_cold", lambda _: chaosmart.LttbDecimator().decimate(
+        times, values, times[0], times[-1] + 1, 800))
+    decimator = chaosmart.LttbDecimator()
+    decimator.decimate(times, values, times[0], times[-1] + 1, 800)
+    suite.measure("lttb_24h_incremental", lambda _: decimator.decimate(
+        times, values, times[0], times[-1] + 1, 800))
+    suite.check("lttb_bucket_edges", lambda: lttb_bucket_edges(chaosmart))
+
+    stores = []
+
+    def new_store():
+        stores.append(chaosmart.MetricStore(os.path.join(workdir, f"history{len(stores)}"), capacity=86400))
+        return stores[-1]
+
+    def append(store):
+        sample = dict.fromkeys(store.metrics, 1.0)
+        for second in range(10000):
+            sample["timestamp"] = 1_700_000_000.0 + second
+            store.record(sample)
+    suite.measure("metric_store_append_10k", append, setup=new_store)
+    suite.measure("metric_store_range", lambda store: store.range(1_700_000_100.0, 1_700_009_000.0),
+                  setup=lambda: stores[-1])
+    for store in stores:
+        store.close()
+
+    records = registry.snapshot()
+    rates = {nic: (1.0, 2.0, 3.0, 4.0) for nic in fake.nics}
+    disks = sampler.disk_snapshot()
+    suite.measure("render_prometheus", lambda _: chaosmart.render_prometheus(sampler.latest(), rates, records,
+                                                                             disks=disks))
+
+    # 500 rules of every kind over the sampled metrics, partitions and process names
+    metrics = list(chaosmart.MetricsSampler.series_names())
+    metrics += [f"fs:{mountpoint}" for mountpoint in disks[3].mountpoints]
+    metrics += [f"process_rss:{record.name}" for record in records[:50]]
+    kinds = [{"above": 90.0}, {"below": 1.0, "for": 30}, {"of": "mean", "above": 50.0, "window": 300},
+             {"of": "rate", "above": 5.0, "window": 60}, {"fills_within": 3600, "window": 600}]
+    rules = [chaosmart.AlertRule.from_config(dict(kinds[index % len(kinds)], metric=metrics[index % len(metrics)],
+                                                  name=f"rule{index}")) for index in range(500)]
+    engine = chaosmart.AlertEngine(rules)
+    sample = sampler.latest()
+
+    def observe(_):
+        for second in range(1000):
+            sample["timestamp"] = 1_700_000_000.0 + second
+            engine.observe_sample(sample, disks)
+    suite.measure("alerts_500_rules_1k_samples", observe)
+    suite.measure("alerts_observe_processes", lambda _: engine.observe_processes(1_700_000_000.0, records))
+
+def wait_for(app, condition, timeout=120.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise TimeoutError("Benchmark did not finish in time")
+        app.processEvents()
+        time.sleep(0.001)
+
+def qt_benchmarks(suite, chaosmart, workdir):
+    from PyQt5.QtWidgets import QApplication
+    app = QApplication.instance() or QApplication([sys.argv[0], "-platform", "offscreen"])
+    scale = suite.scale
+
+    registry = chaosmart.ProcessRegistry()
+    records = registry.snapshot()
+    churned = records[len(records) // 10:] + [record._replace(pid=-record.pid) for record in records[:100]]
+    suite.measure("process_model_fill", lambda model: model.update(records),
+                  setup=chaosmart.ProcessTableModel)
+
+    def filled():
+        model = chaosmart.ProcessTableModel()
+        model.update(records)
+        return model
+    suite.measure("process_model_churn", lambda model: model.update(churned), setup=filled)
+
+    slots = array("q", range(len(records)))
+    cpu = filled().columns.cpu
+    suite.measure("process_sort_cpu", lambda _: chaosmart.sort_slots(slots, cpu, descending=True))
+    suite.measure("process_top_20", lambda _: chaosmart.sort_slots(slots, cpu, descending=True, limit=20))
+    suite.measure("process_model_sort", lambda model: model.sort(2, chaosmart.Qt.DescendingOrder), setup=filled)
+    suite.measure("process_model_filter", lambda model: model.set_filter("process-1"), setup=filled)
+
+    suite.measure("process_tree_fill", lambda model: model.update(records),
+                  setup=chaosmart.ProcessTreeModel)
+
+    def filled_tree():
+        model = chaosmart.ProcessTreeModel()
+        model.update(records)
+        return model
+    suite.measure("process_tree_churn", lambda model: model.update(churned), setup=filled_tree)
+
+    processes = chaosmart.ProcessManagerTab()
+
+    def load_processes(tab):
+        done = []
+        tab.snapshot_worker.snapshot_ready.connect(done.append)
+        tab.load_processes()
+        wait_for(app, lambda: done)
+        tab.snapshot_worker.snapshot_ready.disconnect(done.append)
+    suite.measure("load_processes", load_processes, setup=lambda: processes)
+    processes.snapshot_worker.stop()
+
+    explorer = chaosmart.FileExplorerTab()
+    explorer.index.stop()
+    with fake_directory(scale["entries"]) as root:
+        def load_directory(tab):
+            tab.current_path = root
+            tab.cache.invalidate(root)
+            tab.load_directory()
+            wait_for(app, lambda: tab.status_label.text() == f"{scale['entries']:,} items")
+        suite.measure("load_directory", load_directory, setup=lambda: explorer)
+
+        def load_cached(tab):
+            tab.load_directory()
+            wait_for(app, lambda: tab.status_label.text() == f"{scale['entries']:,} items")
+        suite.measure("load_directory_cached", load_cached, setup=lambda: explorer)
+        explorer.loader.cancel()
+        explorer.loader.pool.waitForDone()
+
+    memory = chaosmart.MemoryRegistryBackend()
+    memory.load(registry_tree(scale["registry_depth"], scale["registry_fanout"]))
+    editor = chaosmart.RegistryEditorTab(memory)
+    deep = "HKEY_CURRENT_USER\\Software" + "\\Key1" * (scale["registry_depth"] - 1)
+
+    def load_registry_key(tab):
+        tab.key_input.setText(deep)
+        tab.load_registry_key()
+    suite.measure("load_registry_key", load_registry_key,
+                  setup=lambda: chaosmart.RegistryEditorTab(memory), repeat=max(1, suite.repeat // 2))
+    suite.measure("load_registry_key_warm", load_registry_key, setup=lambda: editor)
+
+    sampler = chaosmart.MetricsSampler()
+    for _ in range(300):
+        sampler.sample()
+    system = chaosmart.SystemInfoTab(sampler)
+    system.resize(1000, 700)
+    system.show()
+    app.processEvents()
+
+    def update_system(tab):
+        tab.update_info()
+        tab.repaint()
+    suite.measure("system_update_info", update_system, setup=lambda: system)
+    network = chaosmart.NetworkInfoTab(sampler)
+    suite.measure("network_update_info", lambda tab: tab.update_info(), setup=lambda: network)
+
+def compare(results, baseline, tolerance, slack):
+    """Return [(name, baseline ms, current ms)] for benchmarks slower than allowed."""
+    regressions = []
+    for name, result in results.items():
+        before = baseline.get(name)
+        if before is None:
+            continue
+        allowed = before["min_ms"] * (1 + tolerance) + slack
+        if result["min_ms"] > allowed:
+            regressions.append((name, before["min_ms"], result["min_ms"]))
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--quick", action="store_true", help="run at a tenth of the scale")
+    parser.add_argument("--no-qt", action="store_true", help="skip the offscreen Qt benchmarks")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per benchmark (default 5)")
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    parser.add_argument("--baseline", default=BASELINE, help="baseline JSON file to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="store this run as the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.3, help="allowed slowdown as a fraction (default 0.3)")
+    parser.add_argument("--slack", type=float, default=2.0, help="allowed slowdown in ms on top (default 2)")
+    args = parser.parse_args(argv)
+
+    scale_name = "quick" if args.quick else "full"
+    scale = SCALES[scale_name]
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    workdir = tempfile.mkdtemp(prefix="chaosmart-bench-")
+    try:
+        sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+        import chaosmart
+        chaosmart.CHAOSMART_HOME = workdir
+        chaosmart.psutil = FakePsutil(scale["processes"], scale["connections"])
+        suite = Suite(scale, args.repeat)
+        print(f"Headless benchmarks ({scale_name} scale)")
+        headless_benchmarks(suite, chaosmart, workdir)
+        if not args.no_qt:
+            print("Qt benchmarks (offscreen)")
+            qt_benchmarks(suite, chaosmart, workdir)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {
+        "scale": scale_name,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "created": time.time(),
+        "results": suite.results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    status = 0
+    for name, reason in suite.failures:
+        print(f"FAILED {name}: {reason}")
+        status = 1
+    if args.save_baseline:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, encoding="utf-8") as f:
+                baseline = json.load(f)
+        baseline[scale_name] = report
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+        print(f"Saved {scale_name} baseline to {args.baseline}")
+    elif os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f).get(scale_name)
+        if baseline is None:
+            print(f"No {scale_name} baseline in {args.baseline}; nothing to compare")
+        else:
+            regressions = compare(suite.results, baseline["results"], args.tolerance, args.slack)
+            for name, before, after in regressions:
+                print(f"REGRESSION {name}: {before:.2f} ms -> {after:.2f} ms")
+            if regressions:
+                status = 1
+            else:
+                print(f"No regressions against {args.baseline}")
+    return status
+
+if __name__ == "__main__":
+    sys.exit(main())
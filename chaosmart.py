@@ -1,18 +1,73 @@
 import sys
 import os
+import json
 import platform
+import re
 import socket
-import psutil
+import threading
+import time
+import importlib
+import struct
+import contextlib
+import functools
+import heapq
+import operator
+import io
+import logging
+import queue
+from collections import OrderedDict, deque, namedtuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 import ctypes
-import winreg
+from array import array
+from bisect import bisect_left
+from itertools import compress
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QWidget, QTabWidget, QVBoxLayout,
     QLabel, QPushButton, QFileDialog, QListWidget, QHBoxLayout,
     QMessageBox, QLineEdit, QTableWidget, QTableWidgetItem,
-    QHeaderView, QProgressBar, QGraphicsOpacityEffect
+    QHeaderView, QGraphicsOpacityEffect, QTableView,
+    QAbstractItemView, QDialog, QCheckBox, QTreeView, QSplitter, QComboBox,
+    QGridLayout, QSpinBox, QShortcut, QSystemTrayIcon, QStyle
 )
-from PyQt5.QtCore import Qt, QTimer, QPropertyAnimation, QRect
-from PyQt5.QtGui import QIcon, QFont, QColor, QPixmap
+from PyQt5.QtCore import (
+    Qt, QTimer, QPropertyAnimation, QAbstractTableModel, QModelIndex,
+    QAbstractItemModel, QObject, QRunnable, QThreadPool, QFileSystemWatcher,
+    QEvent, pyqtSignal
+)
+from PyQt5.QtGui import (
+    QIcon, QFont, QColor, QPainter, QPainterPath, QPen, QTransform, QKeySequence
+)
+
+class LazyModule:
+    """Imports a module on first attribute access, keeping it off the startup path."""
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attr)
+
+# First used by the sampler thread, so the import cost never hits the GUI thread
+psutil = LazyModule("psutil")
+
+# Only needed by the headless daemon, the file index, the metric store and the profiler
+asyncio = LazyModule("asyncio")
+sqlite3 = LazyModule("sqlite3")
+mmap = LazyModule("mmap")
+cProfile = LazyModule("cProfile")
+pstats = LazyModule("pstats")
+
+log = logging.getLogger("chaosmart")
+
+@functools.lru_cache(maxsize=None)
+def optional_import(name):
+    """The named module, or None if it is not installed; imported on first call."""
+    try:
+        return importlib.import_module(name)
+    except ImportError:
+        return None
 
 # ==========================
 # Function to Check Administrative Privileges
@@ -33,9 +88,6 @@ def run_as_admin():
         QMessageBox.critical(None, "Error", f"Failed to elevate privileges:\n{e}")
     sys.exit()
 
-if not is_admin():
-    run_as_admin()
-
 # ==========================
 # Custom Stylesheet for ChaoSmart
 # ==========================
@@ -89,7 +141,7 @@ QListWidget {
     border: 1px solid #555;
 }
 
-QTableWidget {
+QTableWidget, QTableView {
     background-color: #2d2d2d;
     color: #ffffff;
     border: 1px solid #555;
@@ -129,12 +181,1001 @@ QMessageBox {
 }
 """
 
+# ==========================
+# Application Data
+# ==========================
+CHAOSMART_HOME = os.path.join(os.path.expanduser("~"), ".chaosmart")
+
+def data_path(name):
+    """Return the path of a file in ChaoSmart's per-user data directory."""
+    os.makedirs(CHAOSMART_HOME, exist_ok=True)
+    return os.path.join(CHAOSMART_HOME, name)
+
+# ==========================
+# Instrumentation
+# ==========================
+class LatencyHistogram:
+    """Log-linear histogram of durations: 8 buckets per power of two of µs.
+
+    Recording is one bucket increment (about 12% resolution), so hooks can
+    stay on permanently; percentiles are read from the bucket counts.
+    """
+    SUB_BITS = 3
+    BUCKETS = 256
+
+    def __init__(self):
+        self.counts = array('Q', bytes(8 * self.BUCKETS))
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def bucket(cls, us):
+        if us < 1 << (cls.SUB_BITS + 1):
+            return us
+        shift = us.bit_length() - (cls.SUB_BITS + 1)
+        return min((shift << cls.SUB_BITS) + (us >> shift), cls.BUCKETS - 1)
+
+    @classmethod
+    def bucket_range(cls, index):
+        """(low, high) µs covered by a bucket."""
+        if index < 1 << (cls.SUB_BITS + 1):
+            return index, index + 1
+        shift = (index >> cls.SUB_BITS) - 1
+        mantissa = index - (shift << cls.SUB_BITS)
+        return mantissa << shift, (mantissa + 1) << shift
+
+    def record(self, ms):
+        index = self.bucket(int(ms * 1000))
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.total_ms += ms
+            if ms > self.max_ms:
+                self.max_ms = ms
+
+    def percentile(self, fraction):
+        """Approximate duration in ms below which `fraction` of the samples fall."""
+        with self._lock:
+            target = fraction * self.count
+            seen = 0
+            for index, count in enumerate(self.counts):
+                seen += count
+                if count and seen >= target:
+                    low, high = self.bucket_range(index)
+                    return min((low + high) / 2000, self.max_ms)
+        return 0.0
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total_ms / self.count, 3) if self.count else 0.0,
+            "p50_ms": round(self.percentile(0.5), 3),
+            "p99_ms": round(self.percentile(0.99), 3),
+            "max_ms": round(self.max_ms, 3),
+        }
+
+class Instruments:
+    """Named latency histograms for the hot paths, plus on-demand profiling.
+
+    profile_next(n, path) runs the next n top-level refresh entry points
+    (hooks made with timed_refresh) under cProfile and writes the stats to path (and a readable
+    summary to path + ".txt").
+    """
+    def __init__(self):
+        self.histograms = {}
+        self._lock = threading.Lock()
+        self._main_thread = threading.main_thread().ident
+        self._depth = 0
+        self._profile = None  # [profiler, calls left, path]
+
+    def histogram(self, name):
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            with self._lock:
+                histogram = self.histograms.setdefault(name, LatencyHistogram())
+        return histogram
+
+    def record(self, name, ms):
+        self.histogram(name).record(ms)
+
+    def summaries(self):
+        return {name: self.histograms[name].summary() for name in sorted(self.histograms)}
+
+    def dump(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"created": time.time(), "hooks": self.summaries()}, f, indent=2)
+
+    def profile_next(self, count, path):
+        self._profile = [cProfile.Profile(), count, path]
+
+    def call(self, name, func, args, kwargs, refresh=False):
+        profile = None
+        if threading.get_ident() == self._main_thread:
+            if self._depth == 0 and refresh:
+                profile = self._profile
+            self._depth += 1
+        started = time.perf_counter()
+        try:
+            if profile is not None:
+                return profile[0].runcall(func, *args, **kwargs)
+            return func(*args, **kwargs)
+        finally:
+            self.record(name, (time.perf_counter() - started) * 1000)
+            if threading.get_ident() == self._main_thread:
+                self._depth -= 1
+            if profile is not None:
+                profile[1] -= 1
+                if profile[1] <= 0:
+                    self._profile = None
+                    self._write_profile(*profile)
+
+    def _write_profile(self, profiler, calls_left, path):
+        try:
+            profiler.dump_stats(path)
+            text = io.StringIO()
+            pstats.Stats(profiler, stream=text).sort_stats("cumulative").print_stats(40)
+            with open(path + ".txt", "w", encoding="utf-8") as f:
+                f.write(text.getvalue())
+        except OSError:
+            pass
+
+INSTRUMENTS = Instruments()
+
+def timed(func, refresh=False):
+    """Record every call of func in the histogram named after its qualified name.
+
+    Surplus positional arguments are dropped, as PyQt does when it calls a
+    plain slot (e.g. the checked flag of QPushButton.clicked).
+    """
+    name = func.__qualname__
+    code = func.__code__
+    arity = None if code.co_flags & 0x04 else code.co_argcount  # 0x04: CO_VARARGS
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        return INSTRUMENTS.call(name, func, args[:arity], kwargs, refresh)
+    return wrapper
+
+def timed_refresh(func):
+    """timed() for a tab refresh entry point; these are what profile_next() captures."""
+    return timed(func, refresh=True)
+
+class EventLoopProbe(QObject):
+    """Measures event-loop latency: how late a periodic timer actually fires."""
+    def __init__(self, interval=100, name="event_loop.latency"):
+        super().__init__()
+        self.interval = interval
+        self.histogram = INSTRUMENTS.histogram(name)
+        self.timer = QTimer(self)
+        self.timer.setTimerType(Qt.PreciseTimer)
+        self.timer.timeout.connect(self.tick)
+        self.expected = None
+
+    def start(self):
+        self.expected = time.perf_counter() + self.interval / 1000
+        self.timer.start(self.interval)
+
+    def stop(self):
+        self.timer.stop()
+
+    def tick(self):
+        now = time.perf_counter()
+        self.histogram.record(max(0.0, (now - self.expected) * 1000))
+        self.expected = now + self.interval / 1000
+
+# ==========================
+# Metrics Sampler
+# ==========================
+class RingBuffer:
+    """Fixed-size history of timestamped rows backed by preallocated arrays."""
+    def __init__(self, capacity, columns=("value",)):
+        self.capacity = capacity
+        self.columns = columns
+        self.times = array('d', bytes(8 * capacity))
+        self.data = {name: array('d', bytes(8 * capacity)) for name in columns}
+        self.head = 0  # Next slot to write
+        self.count = 0
+
+    def append(self, timestamp, *values):
+        self.times[self.head] = timestamp
+        for name, value in zip(self.columns, values):
+            self.data[name][self.head] = value
+        self.head = (self.head + 1) % self.capacity
+        if self.count < self.capacity:
+            self.count += 1
+
+    def _ordered(self, column, skip=0):
+        start = (self.head - self.count + skip) % self.capacity
+        if start + self.count - skip <= self.capacity:
+            return column[start:start + self.count - skip]
+        return column[start:] + column[:self.head]
+
+    def _bisect(self, timestamp):
+        """Number of rows older than timestamp."""
+        base = self.head - self.count
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.times[(base + mid) % self.capacity] < timestamp:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def snapshot(self, start=None):
+        """Return (times, {column: values}) copies in chronological order, from start on if given."""
+        skip = 0 if start is None else self._bisect(start)
+        return self._ordered(self.times, skip), {name: self._ordered(col, skip) for name, col in self.data.items()}
+
+    def last(self):
+        if not self.count:
+            return None
+        index = (self.head - 1) % self.capacity
+        return self.times[index], tuple(self.data[name][index] for name in self.columns)
+
+class DownsampleTier:
+    """Min/avg/max aggregates of a metric over fixed-width time buckets."""
+    def __init__(self, period, capacity):
+        self.period = period
+        self.ring = RingBuffer(capacity, ("min", "avg", "max"))
+        self._bucket = None
+        self._n = 0
+        self._sum = 0.0
+        self._min = 0.0
+        self._max = 0.0
+
+    def add(self, timestamp, value):
+        bucket = int(timestamp // self.period)
+        if bucket != self._bucket:
+            self.flush()
+            self._bucket = bucket
+        if self._n:
+            self._min = min(self._min, value)
+            self._max = max(self._max, value)
+        else:
+            self._min = self._max = value
+        self._sum += value
+        self._n += 1
+
+    def flush(self):
+        if self._n:
+            self.ring.append(self._bucket * self.period, self._min, self._sum / self._n, self._max)
+        self._n = 0
+        self._sum = 0.0
+
+class MetricHistory:
+    """Raw samples of one metric plus its 1 s / 1 min / 1 h downsampling tiers."""
+    TIERS = ((1, 3600), (60, 1440), (3600, 720))  # (period s, buckets kept)
+
+    def __init__(self, capacity):
+        self.raw = RingBuffer(capacity)
+        self.tiers = {period: DownsampleTier(period, buckets) for period, buckets in self.TIERS}
+
+    def add(self, timestamp, value):
+        self.raw.append(timestamp, value)
+        for tier in self.tiers.values():
+            tier.add(timestamp, value)
+
+class NetRateTracker:
+    """Per-interface byte and packet rates from net_io_counters(pernic=True) deltas."""
+    def __init__(self, history=60):
+        self.history_length = history
+        self.previous = None  # (timestamp, counters)
+        self.rates = {}       # nic -> (rx B/s, tx B/s, rx packets/s, tx packets/s)
+        self.history = {}     # nic -> deque of (timestamp, rx B/s, tx B/s)
+
+    def update(self, timestamp, counters):
+        if self.previous is not None:
+            last_time, last = self.previous
+            elapsed = timestamp - last_time
+            if elapsed > 0:
+                rates = {}
+                for nic, now in counters.items():
+                    before = last.get(nic)
+                    if before is None:
+                        continue
+                    # Counters can wrap or reset; clamp those deltas to zero
+                    rate = tuple(max(0, a - b) / elapsed for a, b in (
+                        (now.bytes_recv, before.bytes_recv), (now.bytes_sent, before.bytes_sent),
+                        (now.packets_recv, before.packets_recv), (now.packets_sent, before.packets_sent),
+                    ))
+                    rates[nic] = rate
+                    history = self.history.get(nic)
+                    if history is None:
+                        history = self.history[nic] = deque(maxlen=self.history_length)
+                    history.append((timestamp, rate[0], rate[1]))
+                self.rates = rates
+                for nic in self.history.keys() - counters.keys():
+                    del self.history[nic]
+        self.previous = (timestamp, counters)
+
+class DiskRateTracker:
+    """Per-disk read/write byte rates from disk_io_counters(perdisk=True) deltas.
+
+    Rates are kept column-wise: disks names the rows of the read and write
+    arrays. Each update builds new arrays, so readers can hold on to the
+    old ones without copying.
+    """
+    def __init__(self):
+        self.previous = None  # (timestamp, counters)
+        self.disks = []
+        self.read = array('d')
+        self.write = array('d')
+
+    def update(self, timestamp, counters):
+        if self.previous is not None and timestamp > self.previous[0]:
+            last_time, last = self.previous
+            elapsed = timestamp - last_time
+            # Devices that have never been used (idle loop devices and the like) are left out
+            disks = sorted(disk for disk, now in counters.items() if now.read_bytes or now.write_bytes)
+            read, write = array('d'), array('d')
+            for disk in disks:
+                now, before = counters[disk], last.get(disk, counters[disk])
+                read.append(max(0, now.read_bytes - before.read_bytes) / elapsed)
+                write.append(max(0, now.write_bytes - before.write_bytes) / elapsed)
+            self.disks, self.read, self.write = disks, read, write
+        self.previous = (timestamp, counters)
+
+PartitionUsage = namedtuple("PartitionUsage", "mountpoints fstypes total used percent states")
+
+class PartitionPoller:
+    """disk_usage() for every mounted file system, each call on its own daemon thread.
+
+    poll() never waits: it starts a call for each idle mount whose answer is
+    older than period and returns the latest answers as a PartitionUsage of
+    parallel lists and arrays. A call still running after timeout seconds
+    marks its mount HUNG, and no new call starts until it returns, so a dead
+    NFS server ties up one thread rather than the sampler. Daemon threads
+    also keep a hung call from blocking exit, as a ThreadPoolExecutor would.
+    """
+    OK, PENDING, HUNG, FAILED = range(4)
+    STATE_NAMES = ("", "Checking...", "Not responding", "Unavailable")
+    # Kernel and in-memory file systems that say nothing about storage
+    PSEUDO_FILESYSTEMS = frozenset((
+        "autofs", "binfmt_misc", "bpf", "cgroup", "cgroup2", "configfs", "debugfs", "devpts",
+        "devtmpfs", "efivarfs", "fusectl", "hugetlbfs", "mqueue", "nsfs", "proc", "pstore",
+        "ramfs", "rpc_pipefs", "securityfs", "squashfs", "sysfs", "tmpfs", "tracefs",
+    ))
+
+    def __init__(self, timeout=2.0, period=5.0, rescan=60.0):
+        self.timeout = timeout
+        self.period = period
+        self.rescan = rescan
+        self.mounts = []   # (mountpoint, fstype)
+        self._scanned = None
+        self.started = {}  # mountpoint -> monotonic start of the call in flight
+        self.answers = {}  # mountpoint -> (monotonic time, (total, used, percent) or None)
+        self._lock = threading.Lock()
+
+    def _scan(self):
+        try:
+            partitions = psutil.disk_partitions(all=True)
+        except OSError:
+            return
+        mounts, seen = [], set()
+        for partition in partitions:
+            # No fstype: e.g. an empty CD drive on Windows
+            if not partition.fstype or partition.fstype in self.PSEUDO_FILESYSTEMS or partition.mountpoint in seen:
+                continue
+            seen.add(partition.mountpoint)
+            mounts.append((partition.mountpoint, partition.fstype))
+        self.mounts = mounts
+        with self._lock:
+            for mountpoint in self.answers.keys() - seen:
+                del self.answers[mountpoint]
+
+    def _measure(self, mountpoint):
+        try:
+            usage = psutil.disk_usage(mountpoint)
+            answer = (usage.total, usage.used, usage.percent)
+        except OSError:
+            answer = None
+        with self._lock:
+            self.started.pop(mountpoint, None)
+            self.answers[mountpoint] = (time.monotonic(), answer)
+
+    def poll(self):
+        now = time.monotonic()
+        if self._scanned is None or now - self._scanned >= self.rescan:
+            self._scanned = now
+            self._scan()
+        usage = PartitionUsage([], [], array('q'), array('q'), array('d'), bytearray())
+        with self._lock:
+            for mountpoint, fstype in self.mounts:
+                started = self.started.get(mountpoint)
+                last = self.answers.get(mountpoint)
+                if started is None and (last is None or now - last[0] >= self.period):
+                    started = self.started[mountpoint] = now
+                    threading.Thread(target=self._measure, args=(mountpoint,),
+                                     name="PartitionPoller", daemon=True).start()
+                answer = last[1] if last is not None else None
+                if started is not None and now - started >= self.timeout:
+                    state = self.HUNG  # The last answer, if any, is still shown
+                elif last is None:
+                    state = self.PENDING
+                else:
+                    state = self.OK if answer is not None else self.FAILED
+                total, used, percent = answer or (0, 0, 0.0)
+                usage.mountpoints.append(mountpoint)
+                usage.fstypes.append(fstype)
+                usage.total.append(total)
+                usage.used.append(used)
+                usage.percent.append(percent)
+                usage.states.append(state)
+        return usage
+
+class RingFile:
+    """Fixed-size ring of timestamped rows in a memory-mapped file.
+
+    The file holds a one-page header and one preallocated column per field
+    (float64 columns, plus fixed-width UTF-8 text columns), so its size
+    never changes. Opening it maps the file without reading it.
+
+    The header's row counter is a single aligned 8-byte store. It is only
+    bumped once the row's data has been written, so a crash mid-append
+    leaves the previous rows intact and the torn row out of range.
+    A file with a different layout is recreated rather than misread.
+    """
+    MAGIC = b"CHAOSRF1"
+    HEADER = 4096
+    TEXT_WIDTH = 24
+
+    def __init__(self, path, columns, capacity, text_columns=()):
+        self.path = path
+        self.columns = tuple(columns)
+        self.text_columns = tuple(text_columns)
+        self.capacity = capacity
+        layout = json.dumps({"columns": self.columns, "text_columns": self.text_columns,
+                             "text_width": self.TEXT_WIDTH}).encode()
+        if len(layout) > self.HEADER - 32:
+            raise ValueError("Too many columns for the ring file header")
+        size = self.HEADER + capacity * (8 * (1 + len(self.columns)) + self.TEXT_WIDTH * len(self.text_columns))
+
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            with os.fdopen(os.dup(fd), "r+b") as f:
+                header = f.read(32 + len(layout))
+                fresh = (len(header) < 32 or header[:8] != self.MAGIC
+                         or struct.unpack_from("<QI", header, 16) != (capacity, len(layout))
+                         or header[32:] != layout or os.fstat(fd).st_size != size)
+            if fresh:
+                os.ftruncate(fd, 0)
+                os.ftruncate(fd, size)
+            self.mm = mmap.mmap(fd, size)
+        finally:
+            os.close(fd)
+        if fresh:
+            self.mm[:8] = self.MAGIC
+            struct.pack_into("<QQI", self.mm, 8, 0, capacity, len(layout))
+            self.mm[32:32 + len(layout)] = layout
+
+        view = self._view = memoryview(self.mm)
+        offset = self.HEADER
+        self.counter = view[8:16].cast("Q")  # Rows ever written
+        self.times = view[offset:offset + 8 * capacity].cast("d")
+        self.data = {}
+        for name in self.columns:
+            offset += 8 * capacity
+            self.data[name] = view[offset:offset + 8 * capacity].cast("d")
+        offset += 8 * capacity
+        self.text = {}
+        for name in self.text_columns:
+            self.text[name] = view[offset:offset + self.TEXT_WIDTH * capacity]
+            offset += self.TEXT_WIDTH * capacity
+
+    @property
+    def count(self):
+        return min(self.counter[0], self.capacity)
+
+    def append(self, timestamp, values, texts=()):
+        written = self.counter[0]
+        slot = written % self.capacity
+        self.times[slot] = timestamp
+        for name, value in zip(self.columns, values):
+            self.data[name][slot] = value
+        width = self.TEXT_WIDTH
+        for name, value in zip(self.text_columns, texts):
+            cell = value.encode("utf-8")[:width].decode("utf-8", "ignore").encode("utf-8")
+            self.text[name][slot * width:(slot + 1) * width] = cell.ljust(width, b"\0")
+        self.counter[0] = written + 1  # Publishes the row
+
+    def _time_at(self, index):
+        return self.times[(self.counter[0] - self.count + index) % self.capacity]
+
+    def _bisect(self, timestamp, count):
+        lo, hi = 0, count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._time_at(mid) < timestamp:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def range(self, start=None, end=None):
+        """Rows with start <= time < end as zero-copy segments.
+
+        Returns a list of (times, {column: values}, {text column: raw cells})
+        memoryviews in chronological order: one segment, or two when the
+        range wraps around the end of the file. Views alias the file, so
+        copy what must outlive the next overwrite of those rows.
+        """
+        count = self.count
+        lo = 0 if start is None else self._bisect(start, count)
+        hi = count if end is None else self._bisect(end, count)
+        if lo >= hi:
+            return []
+        first = (self.counter[0] - count + lo) % self.capacity
+        spans = [(first, min(first + hi - lo, self.capacity))]
+        if first + hi - lo > self.capacity:
+            spans.append((0, first + hi - lo - self.capacity))
+        width = self.TEXT_WIDTH
+        return [(self.times[a:b], {name: column[a:b] for name, column in self.data.items()},
+                 {name: cells[a * width:b * width] for name, cells in self.text.items()})
+                for a, b in spans]
+
+    def last(self):
+        if not self.count:
+            return None
+        slot = (self.counter[0] - 1) % self.capacity
+        return self.times[slot], tuple(self.data[name][slot] for name in self.columns)
+
+    def flush(self):
+        self.mm.flush()
+
+    def close(self):
+        self.flush()
+        for view in (self.counter, self.times, *self.data.values(), *self.text.values(), self._view):
+            view.release()
+        try:
+            self.mm.close()
+        except BufferError:
+            pass  # A caller still holds a view; the map closes when it is released
+
+def text_cells(cells, width=RingFile.TEXT_WIDTH):
+    """Decode the fixed-width cells of a RingFile text column view."""
+    raw = bytes(cells)
+    return [raw[i:i + width].rstrip(b"\0").decode("utf-8", "replace") for i in range(0, len(raw), width)]
+
+class MetricStore:
+    """Persistent metric history in bounded ring files under one directory.
+
+    system.ring holds one row per sampler tick (a week at 1 s by default);
+    processes.ring holds the top_n processes by CPU about every
+    process_period seconds, as pid/cpu/name columns per rank; snapshots
+    taken on a timer of that period may arrive a little early and still count.
+    """
+    def __init__(self, directory, metrics=None, capacity=7 * 24 * 3600, top_n=8, process_period=5.0):
+        os.makedirs(directory, exist_ok=True)
+        self.metrics = tuple(metrics or MetricsSampler.series_names())
+        self.top_n = top_n
+        self.process_period = process_period
+        self._last_processes = 0.0
+        self.system = RingFile(os.path.join(directory, "system.ring"), self.metrics, capacity)
+        ranks = range(top_n)
+        self.processes = RingFile(
+            os.path.join(directory, "processes.ring"),
+            [f"pid{rank}" for rank in ranks] + [f"cpu{rank}" for rank in ranks],
+            int(capacity / max(process_period, 1)) + 1,
+            [f"name{rank}" for rank in ranks],
+        )
+
+    def record(self, sample):
+        self.system.append(sample["timestamp"], [sample.get(name, 0.0) for name in self.metrics])
+
+    def record_processes(self, timestamp, records):
+        if not records or timestamp - self._last_processes < self.process_period * 0.9:
+            return
+        self._last_processes = timestamp
+        busiest = heapq.nlargest(self.top_n, records, key=lambda record: record.cpu)
+        busiest += [ProcessRecord(0, 0.0, "", 0.0)] * (self.top_n - len(busiest))
+        self.processes.append(timestamp, [record.pid for record in busiest] + [record.cpu for record in busiest],
+                              [record.name for record in busiest])
+
+    def range(self, start=None, end=None):
+        return self.system.range(start, end)
+
+    def top_processes(self, start=None, end=None):
+        """Yield (timestamp, [(pid, name, cpu), ...]) rows, copied out of the file."""
+        ranks = range(self.top_n)
+        for times, data, text in self.processes.range(start, end):
+            names = [text_cells(text[f"name{rank}"]) for rank in ranks]
+            for row, timestamp in enumerate(times):
+                yield timestamp, [(int(data[f"pid{rank}"][row]), names[rank][row], data[f"cpu{rank}"][row])
+                                  for rank in ranks if data[f"pid{rank}"][row]]
+
+    def close(self):
+        self.system.close()
+        self.processes.close()
+
+def open_metric_store(directory=None):
+    """The MetricStore under ~/.chaosmart/history, or None if it cannot be opened."""
+    try:
+        return MetricStore(directory or data_path("history"))
+    except (OSError, ValueError):
+        return None
+
+class MetricsSampler:
+    """Samples system metrics on a worker thread into fixed-size histories.
+
+    The GUI only ever reads copies through latest() and history(), so a slow
+    psutil call stalls the sampler thread rather than the event loop. With a
+    MetricStore every sample is also persisted. Per-disk rates and partition
+    usage are kept as arrays next to the sample, see disk_snapshot().
+    Listeners are called with each new sample on the sampler thread.
+    """
+    METRICS = ("cpu", "memory", "disk")
+    RATES = ("disk_read", "disk_write", "net_recv", "net_sent")  # bytes/s
+
+    def __init__(self, interval=1.0, capacity=3600, store=None):
+        self.interval = interval
+        self.capacity = capacity
+        self.store = store
+        self.histories = {name: MetricHistory(capacity) for name in self.series_names()}
+        self.network = NetRateTracker()
+        self.disks = DiskRateTracker()
+        self.partitions = PartitionPoller()
+        self._partition_usage = PartitionUsage([], [], array('q'), array('q'), array('d'), bytearray())
+        self._disk_io = None  # (timestamp, read bytes, write bytes)
+        self.interfaces = {}  # nic -> [address strings]
+        self._latest = None
+        self.listeners = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="MetricsSampler", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval + 1)
+            self._thread = None
+
+    def _run(self):
+        primed = False
+        failure = None
+        while not self._stop.is_set():
+            started = time.monotonic()
+            try:
+                if not primed:
+                    psutil.cpu_percent(interval=None)  # Prime the CPU counters
+                    primed = True
+                self.sample()
+                failure = None
+            except Exception as e:
+                # One bad sample must not end sampling for the session; log each new error once
+                if repr(e) != failure:
+                    log.exception("Sampling failed")
+                failure = repr(e)
+            self._stop.wait(max(0.0, self.interval - (time.monotonic() - started)))
+
+    @classmethod
+    def series_names(cls):
+        """Every sampled series: the headline metrics, per-core CPU and the rates."""
+        cores = tuple(f"cpu{core}" for core in range(os.cpu_count() or 1))
+        return cls.METRICS + cores + cls.RATES
+
+    def collect(self):
+        values = {
+            "cpu": psutil.cpu_percent(interval=None),
+            "memory": psutil.virtual_memory().percent,
+            "disk": psutil.disk_usage('/').percent,
+        }
+        for core, percent in enumerate(psutil.cpu_percent(interval=None, percpu=True)):
+            values[f"cpu{core}"] = percent
+        io = psutil.disk_io_counters()
+        if io is not None:
+            values["disk_read"], values["disk_write"] = io.read_bytes, io.write_bytes
+        return values
+
+    def _disk_rates(self, timestamp, values):
+        """Replace the cumulative disk byte counters in values with rates."""
+        if "disk_read" not in values:
+            return
+        counters = (timestamp, values["disk_read"], values["disk_write"])
+        rates = (0.0, 0.0)
+        if self._disk_io is not None and timestamp > self._disk_io[0]:
+            elapsed = timestamp - self._disk_io[0]
+            rates = tuple(max(0, now - before) / elapsed for now, before in zip(counters[1:], self._disk_io[1:]))
+        values["disk_read"], values["disk_write"] = rates
+        self._disk_io = counters
+
+    def collect_disks(self):
+        try:
+            counters = psutil.disk_io_counters(perdisk=True) or {}
+        except (OSError, RuntimeError):
+            counters = {}  # No disk statistics, e.g. in some containers
+        return counters, self.partitions.poll()
+
+    def collect_network(self):
+        interfaces = {
+            nic: [addr.address for addr in addrs if addr.family in (socket.AF_INET, socket.AF_INET6)]
+            for nic, addrs in psutil.net_if_addrs().items()
+        }
+        return interfaces, psutil.net_io_counters(pernic=True)
+
+    @timed
+    def sample(self):
+        values = self.collect()
+        interfaces, counters = self.collect_network()
+        disk_counters, partition_usage = self.collect_disks()
+        timestamp = time.time()
+        self._disk_rates(timestamp, values)
+        with self._lock:
+            self.network.update(timestamp, counters)
+            self.disks.update(timestamp, disk_counters)
+            self._partition_usage = partition_usage
+            values["net_recv"] = sum(rate[0] for rate in self.network.rates.values())
+            values["net_sent"] = sum(rate[1] for rate in self.network.rates.values())
+            for name, value in values.items():
+                history = self.histories.get(name)
+                if history is None:
+                    history = self.histories[name] = MetricHistory(self.capacity)
+                history.add(timestamp, value)
+            values["timestamp"] = timestamp
+            self._latest = values
+            self.interfaces = interfaces
+        if self.store is not None:
+            self.store.record(values)
+        for listener in self.listeners:
+            try:
+                listener(values)
+            except Exception:
+                log.exception("Sample listener %r failed", listener)
+
+    def latest(self):
+        """Return the most recent sample as a dict, or None before the first one."""
+        with self._lock:
+            return dict(self._latest) if self._latest else None
+
+    def network_snapshot(self):
+        """Return (interfaces, rates, history) copies for the network tab."""
+        with self._lock:
+            history = {nic: list(samples) for nic, samples in self.network.history.items()}
+            return dict(self.interfaces), dict(self.network.rates), history
+
+    def disk_snapshot(self):
+        """Return (disks, read rates, write rates, PartitionUsage); the arrays are never modified."""
+        with self._lock:
+            return self.disks.disks, self.disks.read, self.disks.write, self._partition_usage
+
+    def history(self, metric, tier=None, start=None):
+        """Return (times, {column: values}) for raw samples or a downsampling tier,
+        only from start on if given."""
+        with self._lock:
+            history = self.histories.get(metric)
+            if history is None:
+                return array('d'), {}
+            ring = history.raw if tier is None else history.tiers[tier].ring
+            return ring.snapshot(start)
+
+# ==========================
+# Charts
+# ==========================
+class LttbDecimator:
+    """Largest-Triangle-Three-Buckets decimation over time-aligned buckets.
+
+    Bucket edges are multiples of the bucket width in absolute time, so a
+    bucket's chosen point only depends on its neighbours. Once the next
+    bucket is complete the choice is final and cached, and a refresh only
+    decimates the newest buckets instead of the whole series.
+    """
+    def __init__(self):
+        self.width = None
+        self.final = deque()  # (bucket, (t, v)) whose choice is final, in time order
+
+    def decimate(self, times, values, start, end, buckets):
+        """Return ([(t, v)], final) for start <= t < end, about one point per bucket.
+
+        The first `final` points will be returned unchanged by later calls
+        for as long as they stay in range and the bucket width is the same.
+        """
+        lo = bisect_left(times, start)
+        hi = bisect_left(times, end, lo)
+        if hi - lo <= buckets:
+            self.width = None
+            return list(zip(times[lo:hi], values[lo:hi])), hi - lo
+        width = (end - start) / buckets
+        final = self.final
+        if width != self.width:
+            self.width = width
+            final.clear()
+        first = int(times[lo] // width)
+        newest = times[hi - 1]
+        while final and final[0][1][0] < start:
+            final.popleft()
+
+        # Resume after the last final bucket
+        points = [point for bucket, point in final]
+        if final:
+            bucket, previous = final[-1]
+            bucket += 1
+            lo = bisect_left(times, bucket * width, lo, hi)
+        else:
+            bucket, previous = first, None
+        while lo < hi:
+            upper = bisect_left(times, (bucket + 1) * width, lo, hi)
+            if upper == lo:
+                # Skip empty buckets; a time exactly on an edge can floor to the bucket before it
+                bucket = max(bucket + 1, int(times[lo] // width))
+                continue
+            following = bisect_left(times, (bucket + 2) * width, upper, hi)
+            if previous is None:
+                point = (times[lo], values[lo])
+            elif following == upper:
+                point = (times[upper - 1], values[upper - 1])  # Newest bucket
+            else:
+                n = following - upper
+                avg_t = sum(times[upper:following]) / n
+                avg_v = sum(values[upper:following]) / n
+                pt, pv = previous
+                best = -1.0
+                for index in range(lo, upper):
+                    area = abs((pt - avg_t) * (values[index] - pv) - (pt - times[index]) * (avg_v - pv))
+                    if area > best:
+                        best = area
+                        point = (times[index], values[index])
+            if newest >= (bucket + 2) * width and len(final) == len(points):
+                final.append((bucket, point))
+            points.append(point)
+            previous = point
+            lo = upper
+            bucket += 1
+        return points, len(final)
+
+class SeriesPath:
+    """A series' final points as a QPainterPath in data coordinates.
+
+    Final points never change, so the path only grows at the end; points
+    that scroll out of view are clipped until the path is rebuilt.
+    """
+    __slots__ = ("key", "base", "path", "last_time", "count")
+
+    def __init__(self, key, base):
+        self.key = key
+        self.base = base  # Time origin, keeping coordinates small
+        self.path = QPainterPath()
+        self.last_time = None
+        self.count = 0
+
+    def extend(self, points):
+        for t, value in points:
+            if self.count:
+                self.path.lineTo(t - self.base, value)
+            else:
+                self.path.moveTo(t - self.base, value)
+            self.count += 1
+            self.last_time = t
+
+    def with_tail(self, points, final):
+        """Append the new final points, then return a copy with the rest added."""
+        new = final
+        while new > 0 and (self.last_time is None or points[new - 1][0] > self.last_time):
+            new -= 1
+        self.extend(points[new:final])
+        path = QPainterPath(self.path)
+        for t, value in points[final:]:
+            if path.elementCount():
+                path.lineTo(t - self.base, value)
+            else:
+                path.moveTo(t - self.base, value)
+        return path
+
+class LineChart(QWidget):
+    """Scrolling line chart; each series is decimated and drawn as one path."""
+    MARGIN = 6
+
+    def __init__(self, title, maximum=None, formatter=None):
+        super().__init__()
+        self.title = title
+        self.maximum = maximum  # Fixed y range, or None to scale to the data
+        self.formatter = formatter or (lambda value: f"{value:.1f}%")
+        self.series = []  # [name, QPen, times, values, LttbDecimator, SeriesPath]
+        self.start = self.end = 0.0
+        self.summary = ""
+        self._points = None  # Decimated points for the current data and width
+        self.setMinimumHeight(120)
+
+    def add_series(self, name, color):
+        # Hairline pens stroke in a fraction of the time of wider antialiased ones
+        pen = QPen(QColor(color))
+        pen.setCosmetic(True)
+        pen.setWidth(1)
+        self.series.append([name, pen, array('d'), array('d'), LttbDecimator(), None])
+
+    def set_data(self, start, end, data, summary=""):
+        """data is one (times, values) pair per series, in add_series order."""
+        self.start, self.end = start, end
+        for entry, (times, values) in zip(self.series, data):
+            entry[2], entry[3] = times, values
+        self.summary = summary
+        self._points = None
+        self.update()
+
+    def decimated(self, buckets):
+        if self._points is None or self._points[0] != buckets:
+            self._points = (buckets, [entry[4].decimate(entry[2], entry[3], self.start, self.end, buckets)
+                                      for entry in self.series])
+        return self._points[1]
+
+    def path(self, entry, points, final, buckets):
+        key = (buckets, self.end - self.start, entry[4].width)
+        cache = entry[5]
+        if (cache is None or cache.key != key or cache.count > 2 * len(points) + 2
+                or (points and cache.last_time is not None and points[0][0] > cache.last_time)):
+            cache = entry[5] = SeriesPath(key, self.start)
+        return cache.base, cache.with_tail(points, final)
+
+    @timed
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+        rect = self.rect().adjusted(self.MARGIN, self.MARGIN, -self.MARGIN, -self.MARGIN)
+        painter.fillRect(self.rect(), QColor("#2d2d2d"))
+        painter.setPen(QColor("#555555"))
+        painter.drawRect(rect)
+
+        buckets = max(1, rect.width())
+        series_points = self.decimated(buckets)
+        top = self.maximum
+        if top is None:
+            top = max((max(points, key=lambda point: point[1])[1] for points, final in series_points if points),
+                      default=0.0) * 1.1 or 1.0
+        for fraction in (0.25, 0.5, 0.75):
+            y = rect.bottom() - fraction * rect.height()
+            painter.drawLine(rect.left(), int(y), rect.right(), int(y))
+
+        # Paths are in (seconds since base, value); the transform maps them to pixels
+        sx = rect.width() / ((self.end - self.start) or 1.0)
+        sy = rect.height() / top
+        painter.save()
+        painter.setClipRect(rect)
+        for entry, (points, final) in zip(self.series, series_points):
+            if len(points) < 2:
+                continue
+            base, path = self.path(entry, points, final, buckets)
+            painter.setTransform(QTransform(sx, 0, 0, -sy, rect.left() + (base - self.start) * sx, rect.bottom()))
+            painter.setPen(entry[1])
+            painter.drawPath(path)
+        painter.restore()
+
+        painter.setPen(QColor("#ffffff"))
+        painter.drawText(rect.adjusted(6, 4, -6, -4), Qt.AlignTop | Qt.AlignLeft,
+                         f"{self.title}  {self.summary}".rstrip())
+        painter.drawText(rect.adjusted(6, 4, -6, -4), Qt.AlignTop | Qt.AlignRight, self.formatter(top))
+        x = rect.right() - 6
+        for name, pen, *rest in reversed(self.series):
+            if not name:
+                continue
+            x -= painter.fontMetrics().horizontalAdvance(name)
+            painter.setPen(pen.color())
+            painter.drawText(x, rect.bottom() - 6, name)
+            x -= 12
+        painter.end()
+
 # ==========================
 # System Information Tab
 # ==========================
 class SystemInfoTab(QWidget):
-    def __init__(self):
+    # (label, seconds shown, history tier used when there is no metric store)
+    SPANS = (("5 minutes", 300, None), ("1 hour", 3600, None), ("24 hours", 86400, 60))
+    CORE_COLORS = ("#4fc3f7", "#81c784", "#ffb74d", "#ba68c8", "#f06292", "#aed581", "#4db6ac", "#ffd54f")
+    PARTITION_HEADERS = ("Mount", "Type", "Used", "Size", "Use %")
+    DISK_HEADERS = ("Disk", "Read/s", "Write/s")
+    FULL_PERCENT = 90  # Partitions at least this full are highlighted
+
+    def __init__(self, sampler, cached_sample=None):
         super().__init__()
+        self.sampler = sampler
+        self.cached_sample = cached_sample  # Shown until the first live sample
+        self.stored = {}  # series name -> (times, values) read from the metric store so far
         layout = QVBoxLayout()
 
         # Fonts
@@ -146,70 +1187,205 @@ class SystemInfoTab(QWidget):
         self.os_label = QLabel()
         self.os_label.setFont(header_font)
 
-        # CPU Usage
-        self.cpu_label = QLabel()
-        self.cpu_label.setFont(header_font)
-        self.cpu_progress = QProgressBar()
-        self.cpu_progress.setMaximum(100)
-        self.cpu_progress.setValue(0)
-
-        # Memory Usage
-        self.memory_label = QLabel()
-        self.memory_label.setFont(header_font)
-        self.memory_progress = QProgressBar()
-        self.memory_progress.setMaximum(100)
-        self.memory_progress.setValue(0)
-
-        # Disk Usage
-        self.disk_label = QLabel()
-        self.disk_label.setFont(header_font)
-        self.disk_progress = QProgressBar()
-        self.disk_progress.setMaximum(100)
-        self.disk_progress.setValue(0)
+        # Time span shown by the charts
+        self.span_combo = QComboBox()
+        for label, seconds, tier in self.SPANS:
+            self.span_combo.addItem(label)
+        self.span_combo.currentIndexChanged.connect(self.update_info)
+        header_layout = QHBoxLayout()
+        header_layout.addWidget(self.os_label)
+        header_layout.addStretch()
+        header_layout.addWidget(QLabel("Show:"))
+        header_layout.addWidget(self.span_combo)
+
+        # Charts
+        self.cores = [name for name in MetricsSampler.series_names()
+                      if name.startswith("cpu") and name[3:].isdigit()]
+        self.cpu_chart = LineChart("CPU", maximum=100)
+        for index, core in enumerate(self.cores):
+            color = self.CORE_COLORS[index % len(self.CORE_COLORS)]
+            self.cpu_chart.add_series("", "#60" + color[1:])  # Translucent #AARRGGBB
+        self.cpu_chart.add_series("Total", "#ffffff")
+        self.memory_chart = LineChart("Memory", maximum=100)
+        self.memory_chart.add_series("Used", "#ba68c8")
+        rate = lambda value: f"{format_bytes(value)}/s"
+        self.disk_chart = LineChart("Disk I/O", formatter=rate)
+        self.disk_chart.add_series("Read", "#4fc3f7")
+        self.disk_chart.add_series("Write", "#ffb74d")
+        self.network_chart = LineChart("Network", formatter=rate)
+        self.network_chart.add_series("Received", "#81c784")
+        self.network_chart.add_series("Sent", "#f06292")
+        self.charts = (
+            (self.cpu_chart, self.cores + ["cpu"]),
+            (self.memory_chart, ["memory"]),
+            (self.disk_chart, ["disk_read", "disk_write"]),
+            (self.network_chart, ["net_recv", "net_sent"]),
+        )
+        chart_layout = QGridLayout()
+        for index, (chart, series) in enumerate(self.charts):
+            chart_layout.addWidget(chart, index // 2, index % 2)
+
+        # Disk space per partition and I/O per disk
+        self.partition_table = self.make_table(self.PARTITION_HEADERS)
+        self.disk_table = self.make_table(self.DISK_HEADERS)
+        table_layout = QHBoxLayout()
+        table_layout.addWidget(self.partition_table, 3)
+        table_layout.addWidget(self.disk_table, 2)
 
         # Add Widgets to Layout
-        layout.addWidget(self.os_label)
-        layout.addWidget(QLabel("CPU Usage:"))
-        layout.addWidget(self.cpu_progress)
-        layout.addWidget(self.cpu_label)
-        layout.addWidget(QLabel("Memory Usage:"))
-        layout.addWidget(self.memory_progress)
-        layout.addWidget(self.memory_label)
-        layout.addWidget(QLabel("Disk Usage:"))
-        layout.addWidget(self.disk_progress)
-        layout.addWidget(self.disk_label)
+        layout.addLayout(header_layout)
+        layout.addLayout(chart_layout, 3)
+        layout.addLayout(table_layout, 1)
 
         self.setLayout(layout)
         self.update_info()
 
-        # Set up a timer to auto-update system info every 3 seconds
-        self.timer = QTimer()
-        self.timer.timeout.connect(self.update_info)
-        self.timer.start(3000)  # 3000 ms = 3 seconds
+    @staticmethod
+    def make_table(headers):
+        table = QTableWidget(0, len(headers))
+        table.setHorizontalHeaderLabels(headers)
+        table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        table.verticalHeader().setVisible(False)
+        table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        return table
+
+    def series_data(self, name, start, tier):
+        """(times, values) for one series since start, from disk when there is a store."""
+        store = self.sampler.store
+        if tier is not None and store is not None and name in store.system.data:
+            return self.stored_series(store, name, start)
+        times, columns = self.sampler.history(name, tier, start)
+        return times, columns.get("value", columns.get("avg", array('d')))
+
+    def stored_series(self, store, name, start):
+        """Like series_data() for the store, but only rows newer than the last call are copied.
 
+        The arrays are kept and grown in place; rows before start are left
+        for the chart to skip until they make up half the copy.
+        """
+        times, values = self.stored.setdefault(name, (array('d'), array('d')))
+        newest = times[-1] if times else None
+        if newest is None or newest < start:
+            del times[:], values[:]
+            newest = None
+        for segment_times, columns, text in store.range(start if newest is None else newest):
+            skip = 0
+            while newest is not None and skip < len(segment_times) and segment_times[skip] <= newest:
+                skip += 1
+            times.frombytes(segment_times[skip:].cast("B"))
+            values.frombytes(columns[name][skip:].cast("B"))
+        lo = bisect_left(times, start)
+        if lo > len(times) // 2:
+            del times[:lo], values[:lo]
+        return times, values
+
+    @timed_refresh
     def update_info(self):
         os_info = f"Operating System: {platform.system()} {platform.release()}"
-        cpu_usage = psutil.cpu_percent(interval=None)
-        memory_usage = psutil.virtual_memory().percent
-        disk_usage = psutil.disk_usage('/').percent
-
         self.os_label.setText(os_info)
 
-        self.cpu_progress.setValue(int(cpu_usage))
-        self.cpu_label.setText(f"{cpu_usage}%")
+        sample = self.sampler.latest() or self.cached_sample
+        if sample is None:
+            return
+        label, seconds, tier = self.SPANS[self.span_combo.currentIndex()]
+        end = sample["timestamp"]
+        start = end - seconds
+        rate = lambda name: format_bytes(sample.get(name, 0.0)) + "/s"
+        busiest = max((sample.get(core, 0.0) for core in self.cores), default=0.0)
+        summaries = (
+            f"{sample['cpu']}% (busiest core {busiest}%)",
+            f"{sample['memory']}%",
+            f"{rate('disk_read')} read, {rate('disk_write')} written",
+            f"{rate('net_recv')} in, {rate('net_sent')} out",
+        )
+        for (chart, series), summary in zip(self.charts, summaries):
+            chart.set_data(start, end, [self.series_data(name, start, tier) for name in series], summary)
+
+        self.update_disks()
 
-        self.memory_progress.setValue(int(memory_usage))
-        self.memory_label.setText(f"{memory_usage}%")
+    def update_disks(self):
+        disks, read, write, partitions = self.sampler.disk_snapshot()
+        table = self.partition_table
+        table.setRowCount(len(partitions.mountpoints))
+        for row, mountpoint in enumerate(partitions.mountpoints):
+            state = partitions.states[row]
+            percent = partitions.percent[row]
+            if state == PartitionPoller.OK or (state == PartitionPoller.HUNG and partitions.total[row]):
+                cells = [format_bytes(partitions.used[row]), format_bytes(partitions.total[row]), f"{percent:.1f}%"]
+            else:
+                cells = ["", "", ""]
+            if state != PartitionPoller.OK:
+                cells[2] = PartitionPoller.STATE_NAMES[state]
+            alert = state in (PartitionPoller.HUNG, PartitionPoller.FAILED) or percent >= self.FULL_PERCENT
+            set_table_row(table, row, [mountpoint, partitions.fstypes[row]] + cells, "#ff6b6b" if alert else None)
 
-        self.disk_progress.setValue(int(disk_usage))
-        self.disk_label.setText(f"{disk_usage}%")
+        table = self.disk_table
+        table.setRowCount(len(disks))
+        for row, disk in enumerate(disks):
+            set_table_row(table, row, (disk, f"{format_bytes(read[row])}/s", f"{format_bytes(write[row])}/s"))
+
+def set_table_row(table, row, cells, color=None):
+    """Fill a QTableWidget row, only touching items whose text or colour changed."""
+    for column, text in enumerate(cells):
+        item = table.item(row, column)
+        if item is None:
+            item = QTableWidgetItem(text)
+            table.setItem(row, column, item)
+        elif item.text() != text:
+            item.setText(text)
+        if color is not None or item.data(Qt.ForegroundRole) is not None:
+            item.setData(Qt.ForegroundRole, None if color is None else QColor(color))
 
 # ==========================
 # Network Information Tab
 # ==========================
+class ResolverCache:
+    """Resolves host names on daemon threads and caches the results.
+
+    lookup() never blocks: it returns the cached addresses (possibly stale
+    while a refresh runs in the background), or None before the first
+    answer. Failed lookups are cached as an empty tuple for a shorter TTL.
+    Each host has at most one lookup in flight, and as in PartitionPoller a
+    daemon thread keeps a getaddrinfo() stuck on a dead DNS server from
+    blocking exit.
+    """
+    def __init__(self, ttl=300, negative_ttl=30):
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.entries = {}  # host -> (expires, addresses)
+        self.pending = set()
+        self._lock = threading.Lock()
+
+    def lookup(self, host):
+        now = time.monotonic()
+        with self._lock:
+            entry = self.entries.get(host)
+            if (entry is None or entry[0] <= now) and host not in self.pending:
+                self.pending.add(host)
+                threading.Thread(target=self._resolve, args=(host,), name="Resolver", daemon=True).start()
+        return entry[1] if entry else None
+
+    @timed
+    def _resolve(self, host):
+        try:
+            infos = socket.getaddrinfo(host, None, type=socket.SOCK_STREAM)
+            addresses = tuple(sorted({info[4][0] for info in infos}, key=lambda a: (":" in a, a)))
+        except OSError:
+            addresses = ()
+        ttl = self.ttl if addresses else self.negative_ttl
+        with self._lock:
+            self.entries[host] = (time.monotonic() + ttl, addresses)
+            self.pending.discard(host)
+
 class NetworkInfoTab(QWidget):
-    def __init__(self):
+    HEADERS = ("Interface", "Addresses", "Rx/s", "Tx/s", "Rx pkt/s", "Tx pkt/s", "Peak Rx/Tx (1 min)")
+
+    def __init__(self, sampler, resolver=None):
         super().__init__()
+        self.sampler = sampler
+        self.resolver = resolver or ResolverCache()
         layout = QVBoxLayout()
 
         # Fonts
@@ -225,211 +1401,2966 @@ class NetworkInfoTab(QWidget):
         self.ip_label = QLabel()
         self.ip_label.setFont(header_font)
 
+        # Interface Table
+        self.interface_table = QTableWidget(0, len(self.HEADERS))
+        self.interface_table.setHorizontalHeaderLabels(self.HEADERS)
+        self.interface_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.interface_table.horizontalHeader().setSectionResizeMode(1, QHeaderView.Stretch)
+        self.interface_table.verticalHeader().setVisible(False)
+        self.interface_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.interface_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+
         # Add Widgets to Layout
         layout.addWidget(self.hostname_label)
         layout.addWidget(self.ip_label)
+        layout.addWidget(self.interface_table)
 
         self.setLayout(layout)
         self.update_info()
 
-        # Set up a timer to auto-update network info every 3 seconds
-        self.timer = QTimer()
-        self.timer.timeout.connect(self.update_info)
-        self.timer.start(3000)  # 3000 ms = 3 seconds
-
+    @timed_refresh
     def update_info(self):
         hostname = socket.gethostname()
-        try:
-            ip_address = socket.gethostbyname(hostname)
-        except socket.error:
+        addresses = self.resolver.lookup(hostname)
+        if addresses is None:
+            ip_address = "Resolving..."
+        elif addresses:
+            ip_address = ", ".join(addresses)
+        else:
             ip_address = "Unable to retrieve IP"
 
         self.hostname_label.setText(f"Hostname: {hostname}")
         self.ip_label.setText(f"IP Address: {ip_address}")
+        self.update_interfaces()
+
+    def update_interfaces(self):
+        interfaces, rates, history = self.sampler.network_snapshot()
+        nics = sorted(interfaces.keys() | rates.keys())
+        table = self.interface_table
+        table.setRowCount(len(nics))
+        for row, nic in enumerate(nics):
+            rx, tx, rx_packets, tx_packets = rates.get(nic, (0.0, 0.0, 0.0, 0.0))
+            samples = history.get(nic, ())
+            peak_rx = max((sample[1] for sample in samples), default=0.0)
+            peak_tx = max((sample[2] for sample in samples), default=0.0)
+            cells = (
+                nic, ", ".join(interfaces.get(nic, ())),
+                f"{format_bytes(rx)}/s", f"{format_bytes(tx)}/s",
+                f"{rx_packets:,.0f}", f"{tx_packets:,.0f}",
+                f"{format_bytes(peak_rx)}/s / {format_bytes(peak_tx)}/s",
+            )
+            set_table_row(table, row, cells)
 
 # ==========================
-# File Explorer Tab
+# Directory Loading
 # ==========================
-class FileExplorerTab(QWidget):
-    def __init__(self):
-        super().__init__()
-        layout = QVBoxLayout()
+def format_bytes(size):
+    for unit in ("B", "KB", "MB", "GB", "TB"):
+        if abs(size) < 1024 or unit == "TB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
 
-        # Fonts
-        header_font = QFont()
-        header_font.setPointSize(12)
-        header_font.setBold(True)
+class DirectoryListing:
+    """Directory entries stored column-wise: names plus compact stat arrays."""
+    FOLDER, FILE, OTHER = 0, 1, 2
+    KIND_NAMES = ("Folder", "File", "Other")
 
-        # Current Path
-        self.path_label = QLabel("Current Path: ")
-        self.path_label.setFont(header_font)
+    def __init__(self, path):
+        self.path = path
+        self.names = []
+        self.kinds = array('b')
+        self.sizes = array('q')
+        self.mtimes = array('d')
 
-        # List Widget
-        self.list_widget = QListWidget()
-        self.list_widget.setFont(QFont("Arial", 12))
-        self.list_widget.itemDoubleClicked.connect(self.open_item)
+    def __len__(self):
+        return len(self.names)
 
-        # Open Directory Button
-        self.open_button = QPushButton("Open Directory")
-        self.open_button.setFixedWidth(150)
-        self.open_button.clicked.connect(self.open_directory)
+    def extend(self, chunk):
+        names, kinds, sizes, mtimes = chunk
+        self.names.extend(names)
+        self.kinds.extend(kinds)
+        self.sizes.extend(sizes)
+        self.mtimes.extend(mtimes)
 
-        # Add Widgets to Layout
-        layout.addWidget(self.path_label)
-        layout.addWidget(self.list_widget)
-        layout.addWidget(self.open_button)
+    def nbytes(self):
+        """Rough memory footprint, used to bound the directory cache."""
+        per_row = 8 + 49 + 1 + 8 + 8  # list slot, str header, kind, size, mtime
+        return sum(map(len, self.names)) + per_row * len(self.names)
 
-        self.setLayout(layout)
-        self.current_path = os.path.expanduser("~")
-        self.load_directory()
+class DirectoryCache:
+    """LRU cache of complete DirectoryListings, bounded by count and bytes.
 
-    def open_directory(self):
-        directory = QFileDialog.getExistingDirectory(self, "Select Directory", self.current_path)
-        if directory:
-            self.current_path = directory
-            self.load_directory()
+    A cached listing is served as long as the directory's mtime is unchanged,
+    which costs one stat. Cached directories are also watched through
+    QFileSystemWatcher (inotify on Linux) so changes evict them right away.
+    """
+    def __init__(self, max_listings=64, max_bytes=64 * 1024 * 1024):
+        self.max_listings = max_listings
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()  # path -> (mtime_ns, listing, nbytes)
+        self.total_bytes = 0
+        self.watcher = QFileSystemWatcher()
+        self.watcher.directoryChanged.connect(self.invalidate)
 
-    def load_directory(self):
-        self.path_label.setText(f"Current Path: {self.current_path}")
-        self.list_widget.clear()
+    def get(self, path):
+        entry = self.entries.get(path)
+        if entry is None:
+            return None
         try:
-            for item in os.listdir(self.current_path):
-                self.list_widget.addItem(item)
-        except PermissionError:
-            QMessageBox.warning(self, "Permission Denied", f"Cannot access {self.current_path}")
+            mtime_ns = os.stat(path).st_mtime_ns
+        except OSError:
+            mtime_ns = None
+        if mtime_ns != entry[0]:
+            self.invalidate(path)
+            return None
+        self.entries.move_to_end(path)
+        return entry[1]
 
-    def open_item(self, item):
-        path = os.path.join(self.current_path, item.text())
-        if os.path.isdir(path):
-            self.current_path = path
-            self.load_directory()
-        else:
+    def put(self, listing, mtime_ns):
+        path = listing.path
+        nbytes = listing.nbytes()
+        self.invalidate(path)
+        if nbytes > self.max_bytes:
+            return
+        self.entries[path] = (mtime_ns, listing, nbytes)
+        self.total_bytes += nbytes
+        self.watcher.addPath(path)
+        while len(self.entries) > self.max_listings or self.total_bytes > self.max_bytes:
+            self.invalidate(next(iter(self.entries)))
+
+    def invalidate(self, path):
+        entry = self.entries.pop(path, None)
+        if entry is not None:
+            self.total_bytes -= entry[2]
+            self.watcher.removePath(path)
+
+def scan_directory(path, cancelled, first_chunk=256, chunk_size=4096):
+    """Yield (names, kinds, sizes, mtimes) chunks of a directory via os.scandir.
+
+    The first chunk is kept small so the view can show rows immediately.
+    """
+    limit = first_chunk
+    chunk = ([], array('b'), array('q'), array('d'))
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if cancelled():
+                return
             try:
-                os.startfile(path)
-            except Exception as e:
-                QMessageBox.warning(self, "Error", f"Cannot open file:\n{e}")
+                if entry.is_dir():
+                    kind = DirectoryListing.FOLDER
+                elif entry.is_file():
+                    kind = DirectoryListing.FILE
+                else:
+                    kind = DirectoryListing.OTHER
+                stat = entry.stat()
+                size, mtime = stat.st_size, stat.st_mtime
+            except OSError:
+                kind, size, mtime = DirectoryListing.OTHER, -1, 0.0
+            names, kinds, sizes, mtimes = chunk
+            names.append(entry.name)
+            kinds.append(kind)
+            sizes.append(size)
+            mtimes.append(mtime)
+            if len(names) >= limit:
+                yield chunk
+                limit = chunk_size
+                chunk = ([], array('b'), array('q'), array('d'))
+    if chunk[0]:
+        yield chunk
+
+class DirectoryLoadSignals(QObject):
+    chunk = pyqtSignal(int, object)  # generation, (names, kinds, sizes, mtimes)
+    finished = pyqtSignal(int, object)  # generation, directory mtime_ns
+    failed = pyqtSignal(int, object)  # generation, OSError
+
+class DirectoryLoadTask(QRunnable):
+    def __init__(self, loader, generation, path):
+        super().__init__()
+        self.loader = loader
+        self.generation = generation
+        self.path = path
+
+    def run(self):
+        signals = self.loader.signals
+        cancelled = lambda: self.loader.generation != self.generation
+        try:
+            # Taken before scanning, so changes made meanwhile invalidate the cache
+            mtime_ns = os.stat(self.path).st_mtime_ns
+            for chunk in scan_directory(self.path, cancelled):
+                signals.chunk.emit(self.generation, chunk)
+        except OSError as e:
+            signals.failed.emit(self.generation, e)
+            return
+        signals.finished.emit(self.generation, mtime_ns)
+
+class DirectoryLoader(QObject):
+    """Streams directory chunks from a worker; a new load cancels the previous one."""
+    chunk_loaded = pyqtSignal(object)
+    finished = pyqtSignal(object)  # directory mtime_ns
+    failed = pyqtSignal(object)
 
-# ==========================
-# Process Manager Tab
-# ==========================
-class ProcessManagerTab(QWidget):
     def __init__(self):
         super().__init__()
-        layout = QVBoxLayout()
+        self.generation = 0
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(2)
+        self.signals = DirectoryLoadSignals()
+        self.signals.chunk.connect(self._chunk, Qt.QueuedConnection)
+        self.signals.finished.connect(self._finished, Qt.QueuedConnection)
+        self.signals.failed.connect(self._failed, Qt.QueuedConnection)
 
-        # Table Widget
-        self.process_table = QTableWidget()
-        self.process_table.setColumnCount(3)
-        self.process_table.setHorizontalHeaderLabels(["PID", "Name", "CPU Usage (%)"])
-        self.process_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
-        self.process_table.setSelectionBehavior(QTableWidget.SelectRows)
-        self.process_table.setEditTriggers(QTableWidget.NoEditTriggers)
-        self.process_table.setFont(QFont("Arial", 12))
+    def load(self, path):
+        self.generation += 1
+        self.pool.start(DirectoryLoadTask(self, self.generation, path))
 
-        # Apply styles to the table
-        self.process_table.setStyleSheet("""
-            QTableWidget {
-                background-color: #2d2d2d;
-                color: #ffffff;
-                border: 1px solid #555;
-            }
-            QHeaderView::section {
-                background-color: #0078d7;
-                color: #ffffff;
-                padding: 4px;
-                font-weight: bold;
-            }
-            QTableWidget::item:selected {
-                background-color: #1e90ff;
-                color: #ffffff;
-            }
-        """)
+    def cancel(self):
+        self.generation += 1
 
-        # Buttons
-        self.refresh_button = QPushButton("Refresh Processes")
-        self.kill_button = QPushButton("Kill Selected Process")
+    def _chunk(self, generation, chunk):
+        if generation == self.generation:
+            self.chunk_loaded.emit(chunk)
+
+    def _finished(self, generation, mtime_ns):
+        if generation == self.generation:
+            self.finished.emit(mtime_ns)
+
+    def _failed(self, generation, error):
+        if generation == self.generation:
+            self.failed.emit(error)
+
+class DirectoryModel(QAbstractTableModel):
+    """Lazy view over a DirectoryListing; rows are exposed through fetchMore."""
+    HEADERS = ("Name", "Size", "Type", "Modified")
+    FETCH_BATCH = 1000
+
+    def __init__(self):
+        super().__init__()
+        self.listing = DirectoryListing("")
+        self.loaded = 0
+
+    def reset(self, listing):
+        self.beginResetModel()
+        self.listing = listing
+        self.loaded = 0
+        self.endResetModel()
+        if len(listing):
+            self.fetchMore(QModelIndex())
+
+    @timed
+    def append_chunk(self, chunk):
+        self.listing.extend(chunk)
+        if self.loaded < self.FETCH_BATCH:
+            self.fetchMore(QModelIndex())
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.loaded
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def canFetchMore(self, parent):
+        return not parent.isValid() and self.loaded < len(self.listing)
+
+    def fetchMore(self, parent):
+        count = min(self.FETCH_BATCH, len(self.listing) - self.loaded)
+        if count <= 0:
+            return
+        self.beginInsertRows(QModelIndex(), self.loaded, self.loaded + count - 1)
+        self.loaded += count
+        self.endInsertRows()
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row, column = index.row(), index.column()
+        listing = self.listing
+        if role == Qt.DisplayRole:
+            if column == 0:
+                return listing.names[row]
+            if column == 1:
+                size = listing.sizes[row]
+                return "" if listing.kinds[row] == DirectoryListing.FOLDER or size < 0 else format_bytes(size)
+            if column == 2:
+                return DirectoryListing.KIND_NAMES[listing.kinds[row]]
+            mtime = listing.mtimes[row]
+            return time.strftime("%Y-%m-%d %H:%M", time.localtime(mtime)) if mtime else ""
+        if role == Qt.TextAlignmentRole and column == 1:
+            return Qt.AlignRight | Qt.AlignVCenter
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.HEADERS[section]
+        return None
+
+# ==========================
+# Disk Usage Analyzer
+# ==========================
+class DiskUsageScan:
+    """Totals disk usage under a root, per top-level entry, using a thread pool.
+
+    Each file is counted once per (st_dev, st_ino); only files with several
+    hard links are remembered, which keeps memory bounded. Directories on
+    another device are skipped unless cross_mounts is set.
+    """
+    def __init__(self, root, workers=8, cross_mounts=False):
+        self.root = root
+        self.workers = workers
+        self.cross_mounts = cross_mounts
+        self.totals = {}  # top-level name -> [bytes, files]
+        self.files = 0
+        self.bytes = 0
+        self.errors = 0
+        self.cancelled = threading.Event()
+        self._lock = threading.Lock()
+        self._linked = set()
+        self._pending = 0
+        self._root_dev = None
+
+    @staticmethod
+    def usage(stat):
+        blocks = getattr(stat, "st_blocks", None)
+        return stat.st_size if blocks is None else blocks * 512
+
+    def _counted(self, stat):
+        if stat.st_nlink <= 1:
+            return False
+        key = (stat.st_dev, stat.st_ino)
+        with self._lock:
+            if key in self._linked:
+                return True
+            self._linked.add(key)
+        return False
+
+    def _scan(self, path, bucket):
+        """Scan a directory tree, handing subdirectories back while the pool is idle."""
+        handoff = []
+        stack = [path]
+        size = files = errors = 0
+        while stack and not self.cancelled.is_set():
+            current = stack.pop()
+            try:
+                with os.scandir(current) as entries:
+                    for entry in entries:
+                        try:
+                            stat = entry.stat(follow_symlinks=False)
+                            if entry.is_dir(follow_symlinks=False):
+                                if stat.st_dev != self._root_dev and not self.cross_mounts:
+                                    continue
+                                size += self.usage(stat)
+                                if self._pending < self.workers * 4:
+                                    handoff.append(entry.path)
+                                else:
+                                    stack.append(entry.path)
+                            elif not self._counted(stat):
+                                size += self.usage(stat)
+                                files += 1
+                        except OSError:
+                            errors += 1
+            except OSError:
+                errors += 1
+        with self._lock:
+            totals = self.totals.setdefault(bucket, [0, 0])
+            totals[0] += size
+            totals[1] += files
+            self.bytes += size
+            self.files += files
+            self.errors += errors
+        return bucket, handoff
+
+    def snapshot(self):
+        with self._lock:
+            return {name: tuple(totals) for name, totals in self.totals.items()}
+
+    def run(self, publish, interval=0.25):
+        """Walk the tree, calling publish(totals) with partial results as they arrive."""
+        root_stat = os.stat(self.root)
+        self._root_dev = root_stat.st_dev
+        pending = set()
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            with os.scandir(self.root) as entries:
+                for entry in entries:
+                    try:
+                        stat = entry.stat(follow_symlinks=False)
+                    except OSError:
+                        with self._lock:
+                            self.errors += 1
+                        continue
+                    if entry.is_dir(follow_symlinks=False):
+                        if stat.st_dev == self._root_dev or self.cross_mounts:
+                            with self._lock:
+                                self.totals[entry.name] = [self.usage(stat), 0]
+                                self.bytes += self.usage(stat)
+                            pending.add(executor.submit(self._scan, entry.path, entry.name))
+                    elif not self._counted(stat):
+                        with self._lock:
+                            self.totals[entry.name] = [self.usage(stat), 1]
+                            self.files += 1
+                            self.bytes += self.usage(stat)
+            self._pending = len(pending)
+
+            published = time.monotonic()
+            while pending:
+                done, pending = wait(pending, timeout=interval, return_when=FIRST_COMPLETED)
+                for future in done:
+                    bucket, handoff = future.result()
+                    for path in handoff:
+                        pending.add(executor.submit(self._scan, path, bucket))
+                self._pending = len(pending)
+                if self.cancelled.is_set():
+                    for future in pending:
+                        future.cancel()
+                    break
+                if time.monotonic() - published >= interval:
+                    publish(self.snapshot())
+                    published = time.monotonic()
+        publish(self.snapshot())
+
+class DiskUsageSignals(QObject):
+    # Each carries the generation of the scan it came from
+    progress = pyqtSignal(int, object)  # {name: (bytes, files)}
+    finished = pyqtSignal(int, float)   # elapsed seconds
+    failed = pyqtSignal(int, object)
+
+class DiskUsageModel(QAbstractTableModel):
+    HEADERS = ("Name", "Size", "Files")
+
+    def __init__(self):
+        super().__init__()
+        self.rows = []
+
+    def set_totals(self, totals):
+        self.beginResetModel()
+        self.rows = sorted(((name, size, files) for name, (size, files) in totals.items()),
+                           key=lambda row: row[1], reverse=True)
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        name, size, files = self.rows[index.row()]
+        column = index.column()
+        if role == Qt.DisplayRole:
+            return (name, format_bytes(size), f"{files:,}")[column]
+        if role == Qt.TextAlignmentRole and column:
+            return Qt.AlignRight | Qt.AlignVCenter
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.HEADERS[section]
+        return None
+
+class DiskUsageDialog(QDialog):
+    def __init__(self, root, parent=None):
+        super().__init__(parent)
+        self.root = root
+        self.scan = None
+        self.generation = 0
+        self.started = 0.0
+        self.setWindowTitle(f"Disk Usage - {root}")
+        self.resize(700, 500)
+        layout = QVBoxLayout()
+
+        # Results Table
+        self.model = DiskUsageModel()
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+
+        # Options and Status
+        self.cross_mounts = QCheckBox("Cross mount points")
+        self.status_label = QLabel()
+
+        # Buttons
+        self.scan_button = QPushButton("Scan")
+        self.scan_button.clicked.connect(self.start_scan)
+        self.cancel_button = QPushButton("Cancel")
+        self.cancel_button.clicked.connect(self.cancel_scan)
+        button_layout = QHBoxLayout()
+        button_layout.addWidget(self.cross_mounts)
+        button_layout.addStretch()
+        button_layout.addWidget(self.scan_button)
+        button_layout.addWidget(self.cancel_button)
+
+        layout.addWidget(self.table)
+        layout.addWidget(self.status_label)
+        layout.addLayout(button_layout)
+        self.setLayout(layout)
+
+        self.signals = DiskUsageSignals()
+        self.signals.progress.connect(self.show_progress, Qt.QueuedConnection)
+        self.signals.finished.connect(self.scan_finished, Qt.QueuedConnection)
+        self.signals.failed.connect(self.scan_failed, Qt.QueuedConnection)
+        self.start_scan()
+
+    def start_scan(self):
+        self.cancel_scan()
+        scan = self.scan = DiskUsageScan(self.root, workers=min(32, (os.cpu_count() or 1) * 4),
+                                         cross_mounts=self.cross_mounts.isChecked())
+        self.generation += 1
+        self.started = time.monotonic()
+        self.scan_button.setEnabled(False)
+        self.status_label.setText("Scanning...")
+        threading.Thread(target=self._run, args=(scan, self.generation, self.started),
+                         name="DiskUsageScan", daemon=True).start()
+
+    def _run(self, scan, generation, started):
+        try:
+            scan.run(lambda totals: self.signals.progress.emit(generation, totals))
+        except Exception as e:
+            self.signals.failed.emit(generation, e)
+            return
+        self.signals.finished.emit(generation, time.monotonic() - started)
+
+    def cancel_scan(self):
+        if self.scan is not None:
+            self.scan.cancelled.set()
+
+    def show_progress(self, generation, totals):
+        if generation != self.generation:
+            return
+        scan = self.scan
+        self.model.set_totals(totals)
+        elapsed = time.monotonic() - self.started
+        self.status_label.setText(f"Scanning... {scan.files:,} files, {format_bytes(scan.bytes)} in {elapsed:.1f} s")
+
+    def scan_finished(self, generation, elapsed):
+        if generation != self.generation:
+            return
+        scan = self.scan
+        self.scan_button.setEnabled(True)
+        state = "Cancelled" if scan.cancelled.is_set() else "Done"
+        self.status_label.setText(
+            f"{state}: {scan.files:,} files, {format_bytes(scan.bytes)} in {elapsed:.1f} s"
+            + (f" ({scan.errors:,} unreadable)" if scan.errors else "")
+        )
+
+    def scan_failed(self, generation, error):
+        if generation == self.generation:
+            self.scan_button.setEnabled(True)
+            self.status_label.setText(f"Failed: {str(error) or type(error).__name__}")
+
+    def closeEvent(self, event):
+        self.cancel_scan()
+        super().closeEvent(event)
+
+# ==========================
+# Filename Index
+# ==========================
+class FilenameIndex:
+    """On-disk SQLite index of file names under a set of roots.
+
+    Names are indexed with an FTS5 trigram tokenizer, so substring and glob
+    searches are answered from the index; both ignore ASCII case. Later
+    updates only re-list directories whose mtime changed since the previous
+    run. Roots come from CHAOSMART_INDEX_ROOTS (os.pathsep separated), else
+    the home directory; only those are indexed.
+    """
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS dirs (
+        path TEXT PRIMARY KEY,
+        mtime_ns INTEGER NOT NULL,
+        seen INTEGER NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS entries (
+        id INTEGER PRIMARY KEY,
+        dir TEXT NOT NULL,
+        name TEXT NOT NULL,
+        is_dir INTEGER NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS entries_dir ON entries (dir);
+    CREATE VIRTUAL TABLE IF NOT EXISTS entries_fts USING fts5 (
+        name, content='entries', content_rowid='id', tokenize='trigram'
+    );
+    CREATE TRIGGER IF NOT EXISTS entries_insert AFTER INSERT ON entries BEGIN
+        INSERT INTO entries_fts (rowid, name) VALUES (new.id, new.name);
+    END;
+    CREATE TRIGGER IF NOT EXISTS entries_delete AFTER DELETE ON entries BEGIN
+        INSERT INTO entries_fts (entries_fts, rowid, name) VALUES ('delete', old.id, old.name);
+    END;
+    """
+    COMMIT_EVERY = 500  # directories
+
+    def __init__(self, path, roots):
+        self.path = path
+        self.roots = [os.path.abspath(root) for root in roots]
+        self.updating = False
+        self.cancelled = threading.Event()
+        self._reader = None
+        self._thread = None
+
+    @staticmethod
+    def default_roots():
+        configured = os.environ.get("CHAOSMART_INDEX_ROOTS", "")
+        roots = [root for root in configured.split(os.pathsep) if root]
+        return roots or [os.path.expanduser("~")]
+
+    def connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(self.SCHEMA)
+        return conn
+
+    def start(self):
+        """Update the index on a background thread."""
+        if self._thread is None or not self._thread.is_alive():
+            self.cancelled.clear()
+            self.updating = True
+            self._thread = threading.Thread(target=self._run, name="FilenameIndex", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self.cancelled.set()
+
+    def _run(self):
+        try:
+            self.update()
+        except sqlite3.Error:
+            pass
+        finally:
+            self.updating = False
+
+    def update(self):
+        conn = self.connect()
+        try:
+            run = conn.execute("SELECT COALESCE(MAX(seen), 0) + 1 FROM dirs").fetchone()[0]
+            stack = list(self.roots)
+            visited = 0
+            while stack:
+                if self.cancelled.is_set():
+                    conn.commit()
+                    return
+                directory = stack.pop()
+                try:
+                    mtime_ns = os.stat(directory).st_mtime_ns
+                except OSError:
+                    continue
+                row = conn.execute("SELECT mtime_ns FROM dirs WHERE path = ?", (directory,)).fetchone()
+                if row is not None and row[0] == mtime_ns:
+                    subdirs = [name for (name,) in conn.execute(
+                        "SELECT name FROM entries WHERE dir = ? AND is_dir = 1", (directory,))]
+                else:
+                    subdirs = self._relist(conn, directory)
+                conn.execute(
+                    "INSERT INTO dirs (path, mtime_ns, seen) VALUES (?, ?, ?) "
+                    "ON CONFLICT (path) DO UPDATE SET mtime_ns = excluded.mtime_ns, seen = excluded.seen",
+                    (directory, mtime_ns, run),
+                )
+                stack.extend(os.path.join(directory, name) for name in subdirs)
+                visited += 1
+                if not visited % self.COMMIT_EVERY:
+                    conn.commit()
+
+            # Drop directories that no longer exist
+            conn.execute("DELETE FROM entries WHERE dir IN (SELECT path FROM dirs WHERE seen != ?)", (run,))
+            conn.execute("DELETE FROM dirs WHERE seen != ?", (run,))
+            conn.commit()
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _relist(conn, directory):
+        rows = []
+        subdirs = []
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        is_dir = entry.is_dir(follow_symlinks=False)
+                    except OSError:
+                        is_dir = False
+                    rows.append((directory, entry.name, int(is_dir)))
+                    if is_dir:
+                        subdirs.append(entry.name)
+        except OSError:
+            pass
+        conn.execute("DELETE FROM entries WHERE dir = ?", (directory,))
+        conn.executemany("INSERT INTO entries (dir, name, is_dir) VALUES (?, ?, ?)", rows)
+        return subdirs
+
+    @staticmethod
+    def like_prefilter(glob):
+        """A LIKE pattern matching at least everything glob matches.
+
+        Wildcards and [...] sets become % and _; a literal % or _ in the glob
+        stays as a LIKE wildcard, which only widens the match.
+        """
+        out = []
+        i = 0
+        while i < len(glob):
+            c = glob[i]
+            if c == "*":
+                out.append("%")
+            elif c == "?":
+                out.append("_")
+            elif c == "[":
+                j = i + 1
+                if glob[j:j + 1] == "^":
+                    j += 1
+                if glob[j:j + 1] == "]":
+                    j += 1
+                end = glob.find("]", j)
+                i = len(glob) - 1 if end < 0 else end
+                out.append("_")
+            else:
+                out.append(c)
+            i += 1
+        return "".join(out)
+
+    def search(self, pattern, limit=1000):
+        """Return (dir, name, is_dir) rows whose name matches a substring or glob, ignoring ASCII case."""
+        if self._reader is None:
+            self._reader = self.connect()
+        if not any(c in pattern for c in "*?["):
+            escaped = "".join(f"[{c}]" if c in "*?[]" else c for c in pattern)
+            pattern = f"*{escaped}*"
+        # The case-insensitive LIKE is answered from the trigram index (LIKE with
+        # ESCAPE would not be); the GLOB on lower() then checks each candidate exactly
+        return self._reader.execute(
+            "SELECT entries.dir, entries.name, entries.is_dir FROM entries_fts "
+            "JOIN entries ON entries.id = entries_fts.rowid "
+            "WHERE entries_fts.name LIKE ? AND lower(entries.name) GLOB lower(?) LIMIT ?",
+            (self.like_prefilter(pattern), pattern, limit),
+        ).fetchall()
+
+# ==========================
+# File Explorer Tab
+# ==========================
+class FileExplorerTab(QWidget):
+    def __init__(self):
+        super().__init__()
+        layout = QVBoxLayout()
+
+        # Fonts
+        header_font = QFont()
+        header_font.setPointSize(12)
+        header_font.setBold(True)
+
+        # Current Path
+        self.path_label = QLabel("Current Path: ")
+        self.path_label.setFont(header_font)
+
+        # Search Box
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText("Search file names (substring or glob, e.g. *.log)")
+        self.search_input.setFont(QFont("Arial", 12))
+        self.search_timer = QTimer()
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(200)
+        self.search_timer.timeout.connect(self.search)
+        self.search_input.textChanged.connect(self.search_timer.start)
+
+        # Directory View
+        self.directory_model = DirectoryModel()
+        self.file_view = QTableView()
+        self.file_view.setModel(self.directory_model)
+        self.file_view.setFont(QFont("Arial", 12))
+        self.file_view.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.file_view.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.file_view.setShowGrid(False)
+        self.file_view.verticalHeader().setVisible(False)
+        self.file_view.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.file_view.doubleClicked.connect(self.open_item)
+
+        # Status
+        self.status_label = QLabel()
+
+        # Navigation Buttons
+        self.back_button = QPushButton("Back")
+        self.back_button.setFixedWidth(100)
+        self.back_button.clicked.connect(self.go_back)
+        self.forward_button = QPushButton("Forward")
+        self.forward_button.setFixedWidth(100)
+        self.forward_button.clicked.connect(self.go_forward)
+
+        # Open Directory Button
+        self.open_button = QPushButton("Open Directory")
+        self.open_button.setFixedWidth(150)
+        self.open_button.clicked.connect(self.open_directory)
+
+        # Disk Usage Button
+        self.usage_button = QPushButton("Disk Usage")
+        self.usage_button.setFixedWidth(150)
+        self.usage_button.clicked.connect(self.analyze_disk_usage)
+
+        # Button Layout
+        button_layout = QHBoxLayout()
+        button_layout.addWidget(self.back_button)
+        button_layout.addWidget(self.forward_button)
+        button_layout.addWidget(self.open_button)
+        button_layout.addWidget(self.usage_button)
+        button_layout.addStretch()
+
+        # Add Widgets to Layout
+        layout.addWidget(self.path_label)
+        layout.addWidget(self.search_input)
+        layout.addWidget(self.file_view)
+        layout.addWidget(self.status_label)
+        layout.addLayout(button_layout)
+
+        self.setLayout(layout)
+
+        # Directory entries are streamed in from a worker thread
+        self.loader = DirectoryLoader()
+        self.loader.chunk_loaded.connect(self.chunk_loaded)
+        self.loader.finished.connect(self.load_finished)
+        self.loader.failed.connect(self.load_failed)
+        self.cache = DirectoryCache()
+
+        # Navigation history for Back/Forward
+        self.history = []
+        self.history_index = -1
+
+        self.index = FilenameIndex(data_path("filenames.sqlite3"), FilenameIndex.default_roots())
+        self.index.start()
+
+        self.navigate(os.path.expanduser("~"))
+
+    def open_directory(self):
+        directory = QFileDialog.getExistingDirectory(self, "Select Directory", self.current_path)
+        if directory:
+            self.navigate(directory)
+
+    def analyze_disk_usage(self):
+        dialog = DiskUsageDialog(self.current_path, self)
+        dialog.setAttribute(Qt.WA_DeleteOnClose)
+        dialog.show()
+
+    def navigate(self, path):
+        del self.history[self.history_index + 1:]
+        self.history.append(path)
+        self.history_index = len(self.history) - 1
+        self.current_path = path
+        self.load_directory()
+
+    def go_back(self):
+        if self.history_index > 0:
+            self.history_index -= 1
+            self.current_path = self.history[self.history_index]
+            self.load_directory()
+
+    def go_forward(self):
+        if self.history_index < len(self.history) - 1:
+            self.history_index += 1
+            self.current_path = self.history[self.history_index]
+            self.load_directory()
+
+    def search(self):
+        pattern = self.search_input.text().strip()
+        if not pattern:
+            self.load_directory()
+            return
+        started = time.perf_counter()
+        try:
+            rows = self.index.search(pattern)
+        except sqlite3.Error as e:
+            self.status_label.setText(f"Search failed: {e}")
+            return
+        elapsed = (time.perf_counter() - started) * 1000
+
+        # Results are shown as a listing whose names are full paths
+        listing = DirectoryListing("")
+        for directory, name, is_dir in rows:
+            listing.names.append(os.path.join(directory, name))
+            listing.kinds.append(DirectoryListing.FOLDER if is_dir else DirectoryListing.FILE)
+            listing.sizes.append(-1)
+            listing.mtimes.append(0.0)
+        self.loader.cancel()
+        self.directory_model.reset(listing)
+        building = " (index still building)" if self.index.updating else ""
+        self.status_label.setText(f"{len(rows):,} matches in {elapsed:.0f} ms{building}")
+
+    @timed_refresh
+    def refresh(self):
+        """Re-run the active search, or reload the directory when there is none."""
+        if self.search_input.text().strip():
+            self.search()
+        else:
+            self.load_directory()
+
+    @timed
+    def load_directory(self):
+        if self.search_input.text():
+            self.search_input.blockSignals(True)
+            self.search_input.clear()
+            self.search_input.blockSignals(False)
+        self.path_label.setText(f"Current Path: {self.current_path}")
+        self.back_button.setEnabled(self.history_index > 0)
+        self.forward_button.setEnabled(self.history_index < len(self.history) - 1)
+
+        listing = self.cache.get(self.current_path)
+        if listing is not None:
+            self.loader.cancel()
+            self.directory_model.reset(listing)
+            self.show_item_count()
+            return
+
+        self.status_label.setText("Loading...")
+        self.directory_model.reset(DirectoryListing(self.current_path))
+        self.loader.load(self.current_path)
+
+    def chunk_loaded(self, chunk):
+        self.directory_model.append_chunk(chunk)
+        self.status_label.setText(f"Loading... {len(self.directory_model.listing):,} items")
+
+    def load_finished(self, mtime_ns):
+        self.cache.put(self.directory_model.listing, mtime_ns)
+        self.show_item_count()
+
+    def show_item_count(self):
+        self.status_label.setText(f"{len(self.directory_model.listing):,} items")
+
+    def load_failed(self, error):
+        self.status_label.setText("")
+        if isinstance(error, PermissionError):
+            QMessageBox.warning(self, "Permission Denied", f"Cannot access {self.current_path}")
+        else:
+            QMessageBox.warning(self, "Error", f"Cannot read directory:\n{error}")
+
+    def open_item(self, index):
+        listing = self.directory_model.listing
+        row = index.row()
+        path = os.path.join(listing.path, listing.names[row])
+        if listing.kinds[row] == DirectoryListing.FOLDER:
+            self.navigate(path)
+        else:
+            try:
+                os.startfile(path)
+            except Exception as e:
+                QMessageBox.warning(self, "Error", f"Cannot open file:\n{e}")
+
+# ==========================
+# Process Registry
+# ==========================
+# rss in bytes, io in bytes/s (read + write); defaults keep older snapshots loadable
+# unreadable lists the fields ("name cpu rss io") that access was denied to; they hold 0 or ""
+ProcessRecord = namedtuple("ProcessRecord", "pid create_time name cpu ppid rss io unreadable",
+                           defaults=(0, 0, 0.0, ""))
+
+class TrackedProcess:
+    """A live psutil.Process plus the CPU and I/O samples used for the next deltas."""
+    __slots__ = ("process", "create_time", "cpu_total", "io_total", "sampled_at")
+
+    def __init__(self, process):
+        self.process = process
+        try:
+            self.create_time = process.create_time()
+        except psutil.AccessDenied:
+            self.create_time = 0.0
+        self.cpu_total = None
+        self.io_total = None
+        self.sampled_at = None
+
+class ProcessRegistry:
+    """Keeps psutil.Process objects alive across refreshes.
+
+    Reusing the same Process objects means every refresh after the first has
+    a previous cpu_times sample to compute a real CPU% from. PID reuse is
+    detected through create_time, via Process.is_running().
+    """
+    ATTRS = ("name", "cpu_times", "ppid", "memory_info")
+
+    def __init__(self):
+        self.tracked = {}  # pid -> TrackedProcess
+
+    def _track(self, pid):
+        entry = self.tracked.get(pid)
+        if entry is not None and entry.process.is_running():
+            return entry
+        entry = TrackedProcess(psutil.Process(pid))
+        self.tracked[pid] = entry
+        return entry
+
+    @staticmethod
+    def _io_total(proc):
+        """Bytes read plus written so far, or None where that is not available."""
+        try:
+            counters = proc.io_counters()
+        except (psutil.AccessDenied, psutil.ZombieProcess, AttributeError, NotImplementedError):
+            return None  # Other users' processes, or no per-process I/O on this OS
+        return counters.read_bytes + counters.write_bytes
+
+    @timed
+    def snapshot(self, cancelled=None):
+        """Return a ProcessRecord for every running process.
+
+        Fields that cannot be read, e.g. for other users' processes, are
+        listed in the record's unreadable instead of dropping the process.
+        Returns None if the optional cancelled() callback fires part way.
+        """
+        records = []
+        alive = set()
+        for index, pid in enumerate(psutil.pids()):
+            if cancelled is not None and not index % 256 and cancelled():
+                return None
+            try:
+                entry = self._track(pid)
+                proc = entry.process
+                with proc.oneshot():
+                    info = proc.as_dict(self.ATTRS, ad_value=None)
+                    io_total = self._io_total(proc)
+                now = time.monotonic()
+            except psutil.NoSuchProcess:
+                self.tracked.pop(pid, None)
+                continue
+            times, memory = info["cpu_times"], info["memory_info"]
+            cpu_total = None if times is None else times.user + times.system
+            cpu = io = 0.0
+            if entry.sampled_at is not None and now > entry.sampled_at:
+                elapsed = now - entry.sampled_at
+                if cpu_total is not None and entry.cpu_total is not None:
+                    cpu = round(100.0 * (cpu_total - entry.cpu_total) / elapsed, 1)
+                if io_total is not None and entry.io_total is not None:
+                    io = max(io_total - entry.io_total, 0) / elapsed
+            entry.cpu_total = cpu_total
+            entry.io_total = io_total
+            entry.sampled_at = now
+            alive.add(pid)
+            unreadable = " ".join(field for field, value in (("name", info["name"]), ("cpu", times),
+                                                               ("rss", memory), ("io", io_total)) if value is None)
+            records.append(ProcessRecord(pid, entry.create_time, info["name"] or "", max(cpu, 0.0),
+                                         info["ppid"] or 0, 0 if memory is None else memory.rss, io, unreadable))
+
+        # Forget processes that have exited since the last refresh
+        for pid in self.tracked.keys() - alive:
+            del self.tracked[pid]
+        return records
+
+class SnapshotSignals(QObject):
+    finished = pyqtSignal(int, object)  # generation, tuple of records or None
+    failed = pyqtSignal(int, object)    # generation, exception
+
+class SnapshotTask(QRunnable):
+    def __init__(self, worker, generation):
+        super().__init__()
+        self.worker = worker
+        self.generation = generation
+
+    def run(self):
+        # An exception escaping QRunnable.run aborts the application under PyQt5
+        try:
+            records = self.worker.collect(cancelled=lambda: self.worker.generation != self.generation)
+        except Exception as e:
+            self.worker.signals.failed.emit(self.generation, e)
+            return
+        self.worker.signals.finished.emit(self.generation, None if records is None else tuple(records))
+
+class SnapshotWorker(QObject):
+    """Runs collect() on a thread pool and auto-refreshes its snapshots.
+
+    At most one snapshot runs at a time. Timer ticks that land while one is
+    running are coalesced into it; an explicit request() supersedes it, so
+    the stale result is dropped and a fresh snapshot starts straight away.
+    collect(cancelled) returns the records, or None once cancelled() is true.
+    With interval=None there is no timer and refreshes are driven by request(),
+    e.g. from the RefreshScheduler. If collect() raises, snapshot_failed
+    carries the exception and the next request or tick tries again.
+    """
+    snapshot_ready = pyqtSignal(object)  # tuple of records
+    snapshot_failed = pyqtSignal(object)  # exception
+
+    def __init__(self, collect, interval=None):
+        super().__init__()
+        self.collect = collect
+        self.generation = 0
+        self.latest = ()
+        self.active = False
+        self._running = False
+
+        # Collectors need not be thread-safe, so snapshots are serialized
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(1)
+        self.signals = SnapshotSignals()
+        self.signals.finished.connect(self._finished, Qt.QueuedConnection)
+        self.signals.failed.connect(self._failed, Qt.QueuedConnection)
+
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(lambda: self.request(supersede=False))
+        self.set_interval(interval)
+
+    def set_interval(self, interval):
+        self.interval = interval
+        if interval is None:
+            self.timer.stop()
+        else:
+            self.timer.setInterval(interval)
+            if self.active:
+                self.timer.start()
+
+    def start(self):
+        self.active = True
+        if self.interval is not None:
+            self.timer.start()
+        self.request()
+
+    def pause(self):
+        """Stop auto-refreshing and drop the running snapshot without waiting for it."""
+        self.active = False
+        self.timer.stop()
+        self.generation += 1  # Cancels the running snapshot
+
+    def stop(self):
+        self.pause()
+        self.pool.waitForDone()
+
+    def request(self, supersede=True):
+        if self._running:
+            if supersede:
+                self.generation += 1
+            return
+        self.generation += 1
+        self._start()
+
+    def _start(self):
+        self._running = True
+        self.pool.start(SnapshotTask(self, self.generation))
+
+    def _settle(self, generation):
+        """Mark the snapshot done; False if it was superseded, after starting its replacement."""
+        self._running = False
+        if generation != self.generation:
+            if self.active:
+                self._start()
+            return False
+        return True
+
+    def _finished(self, generation, records):
+        if self._settle(generation):
+            self.latest = records
+            self.snapshot_ready.emit(records)
+
+    def _failed(self, generation, error):
+        if self._settle(generation):
+            self.snapshot_failed.emit(error)
+
+class ProcessSnapshotWorker(SnapshotWorker):
+    """Takes ProcessRegistry snapshots off the GUI thread."""
+    def __init__(self, registry, interval=None):
+        super().__init__(self.collect_records, interval)
+        self.registry = registry
+
+    def collect_records(self, cancelled=None):
+        optional_import("numpy")  # The table's sorter; imported here rather than on the GUI thread
+        return self.registry.snapshot(cancelled)
+
+# ==========================
+# Process Table Model
+# ==========================
+def contiguous_ranges(rows):
+    """Group ascending row numbers into (first, last) runs."""
+    ranges = []
+    for row in rows:
+        if ranges and row == ranges[-1][1] + 1:
+            ranges[-1] = (ranges[-1][0], row)
+        else:
+            ranges.append((row, row))
+    return ranges
+
+class KeyedTableModel(QAbstractTableModel):
+    """Table rows keyed by key(record), updated by diffing whole snapshots.
+
+    Subclasses define HEADERS, key() and display().
+    """
+    HEADERS = ()
+
+    def __init__(self):
+        super().__init__()
+        self.records = []
+        self.rows = {}  # key -> row
+
+    @staticmethod
+    def key(record):
+        raise NotImplementedError
+
+    def display(self, record, column):
+        raise NotImplementedError
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.records)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role != Qt.DisplayRole:
+            return None
+        return self.display(self.record(index.row()), index.column())
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.HEADERS[section]
+        return None
+
+    def record(self, row):
+        return self.records[row]
+
+    @timed
+    def update(self, records):
+        """Apply a new snapshot, emitting only the row ranges that changed."""
+        incoming = {self.key(record): record for record in records}
+
+        # Remove vanished rows, highest first so indexes stay valid
+        gone = sorted(row for key, row in self.rows.items() if key not in incoming)
+        for first, last in reversed(contiguous_ranges(gone)):
+            self.beginRemoveRows(QModelIndex(), first, last)
+            del self.records[first:last + 1]
+            self.endRemoveRows()
+        if gone:
+            self.rows = {self.key(record): row for row, record in enumerate(self.records)}
+
+        # Update surviving rows in place
+        changed = []
+        for row, old in enumerate(self.records):
+            new = incoming.pop(self.key(old))
+            if new != old:
+                self.records[row] = new
+                changed.append(row)
+        last_column = len(self.HEADERS) - 1
+        for first, last in contiguous_ranges(changed):
+            self.dataChanged.emit(self.index(first, 0), self.index(last, last_column))
+
+        # Append new rows
+        if incoming:
+            first = len(self.records)
+            self.beginInsertRows(QModelIndex(), first, first + len(incoming) - 1)
+            for row, (key, record) in enumerate(incoming.items(), first):
+                self.records.append(record)
+                self.rows[key] = row
+            self.endInsertRows()
+
+def sort_slots(slots, values, descending=False, limit=None):
+    """Slots (an array("q")) ordered by values[slot]; ties keep their order in slots.
+
+    limit keeps only the first limit slots, i.e. a top-N. With numpy and an
+    array of values this is a stable argsort, after an argpartition when
+    only a top-N is wanted; otherwise Python's sort, which is stable too.
+    """
+    if limit is not None and limit >= len(slots):
+        limit = None
+    numpy = optional_import("numpy")
+    if numpy is None or not isinstance(values, array) or not slots:
+        key = values.__getitem__
+        if limit is not None:
+            return (heapq.nlargest if descending else heapq.nsmallest)(limit, slots, key=key)
+        return sorted(slots, key=key, reverse=descending)
+    indexes = numpy.frombuffer(slots, dtype=numpy.int64)
+    keys = numpy.frombuffer(values, dtype=values.typecode)[indexes]
+    if descending:
+        keys = -keys
+    if limit is not None:
+        # argpartition is not stable, so put the picked slots back in their order first
+        picked = numpy.sort(numpy.argpartition(keys, limit - 1)[:limit])
+        indexes, keys = indexes[picked], keys[picked]
+    return indexes[numpy.argsort(keys, kind="stable")].tolist()
+
+class ProcessColumns:
+    """Process records in reusable slots, with the sortable fields kept column-wise.
+
+    A vanished process frees its slot for a later new one, so the columns
+    never need compacting. names maps each distinct name to its slots; there
+    are far fewer distinct names than processes, so a substring filter only
+    tests the names, and a filter that extends the previous one only tests
+    the names that matched before. The index is only built, and from then on
+    maintained, once a filter is first set.
+    """
+    def __init__(self):
+        self.records = []  # slot -> ProcessRecord, kept after it is freed until reused
+        self.alive = bytearray()
+        self.slots = {}    # key -> slot
+        self.free = []
+        self.pid = array("q")
+        self.cpu = array("d")
+        self.rss = array("q")
+        self.io = array("d")
+        self.name = []     # slot -> lower-cased name
+        self.names = None  # name -> set of slots, once a filter has been set
+        self.pattern = ""
+        self.matched = None  # Names containing pattern, or None without a filter
+
+    def column(self, field):
+        return getattr(self, field)
+
+    def _index(self, name, slot):
+        if self.names is None:
+            return
+        slots = self.names.get(name)
+        if slots is None:
+            slots = self.names[name] = set()
+            if self.matched is not None and self.pattern in name.lower():
+                self.matched.add(name)
+        slots.add(slot)
+
+    def _unindex(self, name, slot):
+        if self.names is None:
+            return
+        slots = self.names[name]
+        slots.discard(slot)
+        if not slots:
+            del self.names[name]
+            if self.matched is not None:
+                self.matched.discard(name)
+
+    def apply(self, records, key):
+        """Store a snapshot; returns (added, removed, changed) slot lists."""
+        incoming = dict(zip(map(key, records), records))
+        if not self.slots and not self.free:
+            return self._extend(incoming.keys(), incoming.values()), [], []  # First fill: nothing to diff
+        removed = [slot for record_key, slot in self.slots.items() if record_key not in incoming]
+        for slot in removed:
+            record = self.records[slot]
+            del self.slots[key(record)]
+            self._unindex(record.name, slot)
+            self.alive[slot] = 0
+
+        added, changed, fresh_keys, fresh = [], [], [], []
+        for record_key, record in incoming.items():
+            slot = self.slots.get(record_key)
+            if slot is None:
+                if not self.free:
+                    fresh_keys.append(record_key)  # Appended to the columns in bulk below
+                    fresh.append(record)
+                    continue
+                slot = self.slots[record_key] = self.free.pop()
+                self.alive[slot] = 1
+                self._index(record.name, slot)
+                added.append(slot)
+            else:
+                old = self.records[slot]
+                if old == record:
+                    continue
+                if old.name != record.name:
+                    self._unindex(old.name, slot)
+                    self._index(record.name, slot)
+                changed.append(slot)
+            self.records[slot] = record
+            self.pid[slot] = record.pid
+            self.cpu[slot] = record.cpu
+            self.rss[slot] = record.rss
+            self.io[slot] = record.io
+            self.name[slot] = record.name.lower()
+
+        added.extend(self._extend(fresh_keys, fresh))
+        # Freed only now, so no slot is both removed and added in one snapshot
+        self.free.extend(removed)
+        return added, removed, changed
+
+    def _extend(self, keys, fresh):
+        """Append records under their keys to the columns in bulk; returns their slots."""
+        first = len(self.records)
+        self.slots.update(zip(keys, range(first, first + len(fresh))))
+        self.records.extend(fresh)
+        self.alive.extend(b"\1" * len(fresh))
+        self.pid.extend([record.pid for record in fresh])
+        self.cpu.extend([record.cpu for record in fresh])
+        self.rss.extend([record.rss for record in fresh])
+        self.io.extend([record.io for record in fresh])
+        self.name.extend([record.name.lower() for record in fresh])
+        if self.names is not None:
+            for slot, record in enumerate(fresh, first):
+                self._index(record.name, slot)
+        return range(first, len(self.records))
+
+    def set_filter(self, text):
+        text = text.strip().lower()
+        if not text:
+            self.pattern, self.matched = "", None
+            return
+        if self.names is None:
+            self.names = {}
+            for slot in compress(range(len(self.alive)), self.alive):
+                self.names.setdefault(self.records[slot].name, set()).add(slot)
+        names = self.matched if self.matched is not None and self.pattern in text else self.names
+        self.pattern = text
+        self.matched = {name for name in names if text in name.lower()}
+
+    def visible(self):
+        """The set of slots passing the filter, or None when every process does."""
+        if self.matched is None:
+            return None
+        return set().union(*(self.names[name] for name in self.matched))
+
+class ProcessTableModel(KeyedTableModel):
+    """Process rows keyed by (pid, create_time), sorted, filtered and cut to a top-N.
+
+    Records live in ProcessColumns; order lists the slots shown, row by row.
+    Each refresh re-sorts starting from the previous order, so processes
+    that tie keep their rows instead of shuffling.
+    """
+    HEADERS = ("PID", "Name", "CPU Usage (%)", "Memory", "I/O")
+    FIELDS = ("pid", "name", "cpu", "rss", "io")
+
+    def __init__(self):
+        super().__init__()
+        self.columns = ProcessColumns()
+        self.order = []  # row -> slot
+        self.sort_field = "pid"
+        self.descending = False
+        self.limit = None
+
+    @staticmethod
+    def key(record):
+        return record.pid, record.create_time
+
+    def display(self, record, column):
+        if record.unreadable and self.FIELDS[column] in record.unreadable.split():
+            return ""
+        if column == 0:
+            return str(record.pid)
+        if column == 1:
+            return record.name
+        if column == 2:
+            return str(record.cpu)
+        if column == 3:
+            return format_bytes(record.rss)
+        return f"{format_bytes(record.io)}/s"
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.order)
+
+    def record(self, row):
+        return self.columns.records[self.order[row]]
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        self.sort_field = self.FIELDS[column]
+        self.descending = order == Qt.DescendingOrder
+        self._show()
+
+    def set_filter(self, text):
+        self.columns.set_filter(text)
+        self._show()
+
+    def set_limit(self, limit):
+        self.limit = limit or None
+        self._show()
+
+    @timed
+    def update(self, records):
+        added, removed, changed = self.columns.apply(records, self.key)
+        self._show(set(changed))
+
+    def ordered(self):
+        """The slots to show, sorted; candidates start in the current row order."""
+        columns = self.columns
+        alive = columns.alive
+        visible = columns.visible()
+        placed = bytearray(len(alive))
+        candidates = array("q")
+        for slot in self.order:
+            if alive[slot] and (visible is None or slot in visible):
+                candidates.append(slot)
+                placed[slot] = 1
+        if visible is None:
+            # Alive but not yet placed, selected at C speed
+            candidates.extend(compress(range(len(alive)), map(operator.gt, alive, placed)))
+        else:
+            for slot in sorted(visible):
+                if not placed[slot] and alive[slot]:
+                    candidates.append(slot)
+        return sort_slots(candidates, columns.column(self.sort_field), self.descending, self.limit)
+
+    def _show(self, changed=()):
+        """Move from the current rows to ordered() with row removes, a re-layout and inserts."""
+        order = self.ordered()
+        current = self.order
+        if not current:
+            if order:
+                self.beginInsertRows(QModelIndex(), 0, len(order) - 1)
+                current[:] = order
+                self.endInsertRows()
+            return
+        shown = set(order)
+        gone = [row for row, slot in enumerate(current) if slot not in shown]
+        for first, last in reversed(contiguous_ranges(gone)):
+            self.beginRemoveRows(QModelIndex(), first, last)
+            del current[first:last + 1]
+            self.endRemoveRows()
+
+        survivors = set(current)
+        arranged = [slot for slot in order if slot in survivors]
+        if arranged != current:
+            self.layoutAboutToBeChanged.emit()
+            rows = {slot: row for row, slot in enumerate(arranged)}
+            persistent = self.persistentIndexList()
+            self.changePersistentIndexList(persistent, [
+                self.index(rows[current[index.row()]], index.column()) for index in persistent
+            ])
+            current[:] = arranged
+            self.layoutChanged.emit()
+        else:
+            last_column = len(self.HEADERS) - 1
+            changed_rows = [row for row, slot in enumerate(current) if slot in changed] if changed else ()
+            for first, last in contiguous_ranges(changed_rows):
+                self.dataChanged.emit(self.index(first, 0), self.index(last, last_column))
+
+        # Ascending, so every run lands after rows that are already final
+        new_rows = [row for row, slot in enumerate(order) if slot not in survivors]
+        for first, last in contiguous_ranges(new_rows):
+            self.beginInsertRows(QModelIndex(), first, last)
+            current[first:first] = order[first:last + 1]
+            self.endInsertRows()
+
+# ==========================
+# Process Tree Model
+# ==========================
+class ProcessNode:
+    """One process in the tree plus the CPU/RSS/I/O totals of its subtree."""
+    __slots__ = ("key", "record", "parent", "children", "row", "cpu", "rss", "io")
+
+    def __init__(self, key, record):
+        self.key = key
+        self.record = record
+        self.parent = None
+        self.children = []
+        self.row = 0
+        self.cpu = self.rss = self.io = 0.0
+
+class ProcessTreeModel(QAbstractItemModel):
+    """Processes arranged by parent PID, keyed by (pid, create_time).
+
+    Every node carries the totals of its subtree. A snapshot is applied as
+    a diff: a changed process adds its delta to its ancestors, a new one
+    adds itself, and a re-parented subtree is subtracted from its old
+    ancestors and added to the new ones, so a refresh costs O(changes x
+    depth) rather than a walk of the whole forest. PID reuse is a new key;
+    a parent that started after its child is a recycled PID, not the parent.
+    """
+    HEADERS = ("Name", "PID", "CPU Usage (%)", "Memory", "I/O")
+    FIELDS = ("name", "pid", "cpu", "rss", "io")
+
+    def __init__(self):
+        super().__init__()
+        self.roots = []
+        self.nodes = {}  # key -> ProcessNode
+
+    @staticmethod
+    def key(record):
+        return record.pid, record.create_time
+
+    # Qt model interface
+    def children(self, parent):
+        return self.roots if parent is None else parent.children
+
+    def node(self, index):
+        return index.internalPointer() if index.isValid() else None
+
+    def index(self, row, column, parent=QModelIndex()):
+        siblings = self.children(self.node(parent))
+        if 0 <= row < len(siblings) and 0 <= column < len(self.HEADERS):
+            return self.createIndex(row, column, siblings[row])
+        return QModelIndex()
+
+    def parent(self, index):
+        node = self.node(index)
+        if node is None or node.parent is None:
+            return QModelIndex()
+        return self.createIndex(node.parent.row, 0, node.parent)
+
+    def node_index(self, node, column=0):
+        return QModelIndex() if node is None else self.createIndex(node.row, column, node)
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.column() > 0:
+            return 0
+        return len(self.children(self.node(parent)))
+
+    def hasChildren(self, parent=QModelIndex()):
+        return self.rowCount(parent) > 0
+
+    def columnCount(self, parent=QModelIndex()):
+        return len(self.HEADERS)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        node = index.internalPointer()
+        column = index.column()
+        if role == Qt.DisplayRole:
+            if column == 0:
+                return node.record.name
+            if column == 1:
+                return str(node.record.pid)
+            unreadable = node.record.unreadable
+            if unreadable and not node.children and self.FIELDS[column] in unreadable.split():
+                return ""
+            if column == 2:
+                return f"{max(node.cpu, 0.0):.1f}"
+            if column == 3:
+                return format_bytes(max(node.rss, 0))
+            return f"{format_bytes(max(node.io, 0.0))}/s"
+        if role == Qt.TextAlignmentRole and column > 0:
+            return int(Qt.AlignRight | Qt.AlignVCenter)
+        if role == Qt.ToolTipRole and node.children:
+            record = node.record
+            return (f"Own: {record.cpu:.1f}% CPU, {format_bytes(record.rss)}, {format_bytes(record.io)}/s\n"
+                    f"Subtree of {self.subtree_size(node):,} processes")
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.HEADERS[section]
+        return None
+
+    def record(self, index):
+        node = self.node(index)
+        return None if node is None else node.record
+
+    def subtree_size(self, node):
+        count, stack = 0, [node]
+        while stack:
+            current = stack.pop()
+            count += 1
+            stack.extend(current.children)
+        return count
+
+    # Incremental maintenance
+    def _resolve_parent(self, record, pids):
+        """The parent node for a record, given pid -> key for the new snapshot."""
+        if record.ppid == record.pid:
+            return None
+        parent = self.nodes.get(pids.get(record.ppid))
+        if parent is None or parent.record.create_time > record.create_time:
+            return None  # Gone, or a newer process that reused the parent's PID
+        return parent
+
+    def _add_totals(self, node, cpu, rss, io):
+        while node is not None:
+            node.cpu += cpu
+            node.rss += rss
+            node.io += io
+            node = node.parent
+
+    def _detach(self, nodes):
+        """Unlink nodes from their parents, removing each run of adjacent rows at once.
+
+        Runs are removed bottom-up, so only the rows below each run are
+        renumbered; detaching one at a time renumbered a long top-level list
+        for every node.
+        """
+        groups = {}
+        for node in nodes:
+            groups.setdefault(id(node.parent), (node.parent, []))[1].append(node)
+        for parent, group in groups.values():
+            siblings = self.children(parent)
+            rows = sorted(node.row for node in group)
+            end = len(rows)
+            while end:
+                start = end - 1
+                while start and rows[start - 1] == rows[start] - 1:
+                    start -= 1
+                first, last = rows[start], rows[end - 1]
+                self.beginRemoveRows(self.node_index(parent), first, last)
+                del siblings[first:last + 1]
+                for row in range(first, len(siblings)):
+                    siblings[row].row = row
+                self.endRemoveRows()
+                end = start
+            for node in group:
+                self._add_totals(parent, -node.cpu, -node.rss, -node.io)
+                node.parent = None
+
+    def _attach(self, node, parent):
+        siblings = self.children(parent)
+        self.beginInsertRows(self.node_index(parent), len(siblings), len(siblings))
+        node.parent = parent
+        node.row = len(siblings)
+        siblings.append(node)
+        self.endInsertRows()
+        self._add_totals(parent, node.cpu, node.rss, node.io)
+
+    def _build(self, incoming, pids):
+        """Populate an empty model in one reset; used for the first snapshot."""
+        self.beginResetModel()
+        for key, record in incoming.items():
+            node = self.nodes[key] = ProcessNode(key, record)
+            node.cpu, node.rss, node.io = record.cpu, record.rss, record.io
+        for node in self.nodes.values():
+            parent = self._resolve_parent(node.record, pids)
+            node.parent = parent
+            siblings = self.children(parent)
+            node.row = len(siblings)
+            siblings.append(node)
+        # Sum subtrees bottom-up: children before parents in reverse BFS order
+        order = list(self.roots)
+        for node in order:
+            order.extend(node.children)
+        for node in reversed(order):
+            if node.parent is not None:
+                node.parent.cpu += node.cpu
+                node.parent.rss += node.rss
+                node.parent.io += node.io
+        self.endResetModel()
+
+    @timed
+    def update(self, records):
+        incoming = {self.key(record): record for record in records}
+        pids = {record.pid: key for key, record in incoming.items()}
+        if not self.nodes:
+            self._build(incoming, pids)
+            return
+        added = {key: ProcessNode(key, record) for key, record in incoming.items() if key not in self.nodes}
+
+        # Survivors: add each change in own usage to the node and its ancestors
+        dirty = set()
+        moved = []  # Nodes whose parent may have changed
+        for key, record in incoming.items():
+            node = self.nodes.get(key)
+            if node is None or record == node.record:
+                continue
+            old, node.record = node.record, record
+            if record.ppid != old.ppid:
+                moved.append(node)
+            delta = (record.cpu - old.cpu, record.rss - old.rss, record.io - old.io)
+            ancestor = node
+            if any(delta):
+                self._add_totals(node, *delta)
+                while ancestor is not None and ancestor not in dirty:
+                    dirty.add(ancestor)
+                    ancestor = ancestor.parent
+            else:
+                dirty.add(node)
+
+        # Vanished processes: surviving orphans move to the top level until
+        # re-parented below, then each vanished subtree goes in one removal
+        gone = {key: node for key, node in self.nodes.items() if key not in incoming}
+        orphans = [child for node in gone.values() for child in node.children if child.key not in gone]
+        self._detach(orphans)
+        for child in orphans:
+            self._attach(child, None)
+        moved.extend(orphans)
+        self._detach([node for node in gone.values()
+                      if node.parent is None or node.parent.key not in gone])
+        for key, node in gone.items():
+            del self.nodes[key]
+            dirty.discard(node)
+
+        # New processes, parents before children
+        self.nodes.update(added)
+
+        def attach(node):
+            del added[node.key]
+            parent = self._resolve_parent(node.record, pids)
+            if parent is not None and parent.key in added:
+                attach(parent)
+            record = node.record
+            node.cpu, node.rss, node.io = record.cpu, record.rss, record.io
+            self._attach(node, parent)
+        while added:
+            attach(next(iter(added.values())))
+
+        # Re-parented or orphaned survivors, and top-level nodes whose parent
+        # has just appeared (e.g. it was unreadable before)
+        moves = {}
+        for node in moved + self.roots:
+            parent = self._resolve_parent(node.record, pids)
+            if parent is not node.parent:
+                moves[node.key] = node, parent
+        self._detach([node for node, parent in moves.values()])
+        for node, parent in moves.values():
+            # Checked once detached, so a cycle among several moves is still caught
+            self._attach(node, None if self._is_descendant(parent, node) else parent)
+
+        self._emit_changed(dirty)
+
+    def _is_descendant(self, candidate, node):
+        """True if candidate lies in node's subtree (attaching would make a cycle)."""
+        while candidate is not None:
+            if candidate is node:
+                return True
+            candidate = candidate.parent
+        return False
+
+    def _emit_changed(self, dirty):
+        """One dataChanged per parent, spanning its changed children."""
+        spans = {}
+        for node in dirty:
+            span = spans.get(id(node.parent))
+            if span is None:
+                spans[id(node.parent)] = [node.parent, node.row, node.row]
+            else:
+                span[1] = min(span[1], node.row)
+                span[2] = max(span[2], node.row)
+        last_column = len(self.HEADERS) - 1
+        for parent, first, last in spans.values():
+            siblings = self.children(parent)
+            self.dataChanged.emit(self.createIndex(first, 0, siblings[first]),
+                                  self.createIndex(last, last_column, siblings[last]))
+
+# ==========================
+# Process Termination
+# ==========================
+class TerminationSignals(QObject):
+    started = pyqtSignal(object, int)        # job, processes found
+    result = pyqtSignal(object, int, str)    # job, pid, outcome
+    finished = pyqtSignal(object)            # job
+
+class TerminationJob:
+    """Ends a set of processes, optionally with their descendants, off the GUI thread.
+
+    Every process gets SIGTERM up front and they are all waited on together
+    through psutil.wait_procs, so a batch costs one grace period however
+    large it is; anything still running after grace seconds gets SIGKILL.
+    For a tree, each process found is suspended before its children are
+    looked up, so a fork bomb cannot spawn faster than the sweep finds it.
+
+    targets are (pid, create_time) pairs; a PID that now belongs to a newer
+    process is left alone, and so are ChaoSmart and its ancestors, which a
+    tree sweep would otherwise suspend along with the app itself. Outcomes
+    are "terminated", "killed" (needed SIGKILL), "exited" (already gone),
+    "denied", "protected" and "survived".
+    """
+    SWEEPS = 20
+
+    def __init__(self, targets, tree=False, grace=3.0, kill_wait=2.0):
+        self.targets = list(targets)
+        self.tree = tree
+        self.grace = grace
+        self.kill_wait = kill_wait
+        self.protected = self.protected_pids()
+        self.total = len(self.targets)  # Updated once a tree sweep has run
+        self.outcomes = {}  # Filled in on the GUI thread from result signals
+
+    @staticmethod
+    def protected_pids():
+        """ChaoSmart's own PID and those of its ancestors."""
+        own = psutil.Process()
+        pids = {own.pid}
+        try:
+            pids.update(parent.pid for parent in own.parents())
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            pass
+        return pids
+
+    def _open(self, report):
+        found = {}
+        for pid, create_time in self.targets:
+            if pid in self.protected:
+                report(pid, "protected")
+                continue
+            try:
+                proc = psutil.Process(pid)
+                if proc.create_time() != create_time:
+                    report(pid, "exited")  # The PID has been reused since the snapshot
+                    continue
+            except psutil.NoSuchProcess:
+                report(pid, "exited")
+                continue
+            except psutil.AccessDenied:
+                report(pid, "denied")
+                continue
+            found[pid] = proc
+        return found
+
+    @staticmethod
+    def _ended(proc):
+        """Zombies count as ended; they only wait for their parent to reap them."""
+        try:
+            return proc.status() == psutil.STATUS_ZOMBIE
+        except psutil.NoSuchProcess:
+            return True
+
+    def _sweep(self, found, suspended):
+        """Add every descendant of found to it, suspending each one as it is found.
+
+        Suspended processes are appended to suspended for run() to resume.
+        """
+        pending = list(found.values())
+        for _ in range(self.SWEEPS):
+            for proc in pending:
+                try:
+                    proc.suspend()
+                    suspended.append(proc)
+                except (psutil.NoSuchProcess, psutil.AccessDenied):
+                    pass
+            # One pass over the process table per generation, not per process
+            pending = []
+            for proc in psutil.process_iter(["ppid"]):
+                if proc.pid not in found and proc.pid not in self.protected and proc.info["ppid"] in found:
+                    found[proc.pid] = proc
+                    pending.append(proc)
+            if not pending:
+                break
+
+    def run(self, report, started=lambda total: None):
+        """Call report(pid, outcome) from this thread as each process is accounted for.
+
+        started(total) is called once the tree sweep knows how many there are.
+        """
+        found = self._open(report)
+        early = len(self.targets) - len(found)
+        suspended = []
+        try:
+            if self.tree:
+                self._sweep(found, suspended)
+            started(early + len(found))
+
+            signalled = []
+            for proc in found.values():
+                try:
+                    proc.terminate()
+                    signalled.append(proc)
+                except psutil.NoSuchProcess:
+                    report(proc.pid, "exited")
+                except psutil.AccessDenied:
+                    report(proc.pid, "denied")
+        finally:
+            # A stopped process only acts on SIGTERM once it is resumed, and
+            # one that could not be signalled must not be left frozen
+            self._resume(suspended)
+
+        _, alive = psutil.wait_procs(signalled, timeout=self.grace,
+                                     callback=lambda proc: report(proc.pid, "terminated"))
+        killed = []
+        for proc in alive:
+            if self._ended(proc):
+                report(proc.pid, "terminated")
+                continue
+            try:
+                proc.kill()
+                killed.append(proc)
+            except psutil.NoSuchProcess:
+                report(proc.pid, "terminated")
+            except psutil.AccessDenied:
+                report(proc.pid, "denied")
+        _, alive = psutil.wait_procs(killed, timeout=self.kill_wait,
+                                     callback=lambda proc: report(proc.pid, "killed"))
+        for proc in alive:
+            report(proc.pid, "killed" if self._ended(proc) else "survived")
+
+    @staticmethod
+    def _resume(suspended):
+        for proc in suspended:
+            try:
+                proc.resume()
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                pass
+
+# ==========================
+# Process Manager Tab
+# ==========================
+class ProcessManagerTab(QWidget):
+    def __init__(self, refresh_interval=None, cached_records=()):
+        super().__init__()
+        layout = QVBoxLayout()
+
+        # Table View
+        self.registry = ProcessRegistry()
+        self.process_model = ProcessTableModel()
+        self.process_table = QTableView()
+        self.process_table.setModel(self.process_model)
+        self.process_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.process_table.verticalHeader().setVisible(False)
+        self.process_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.process_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.process_table.setFont(QFont("Arial", 12))
+        self.process_table.setSortingEnabled(True)
+        self.process_table.sortByColumn(0, Qt.AscendingOrder)
+
+        # Apply styles to the table
+        self.process_table.setStyleSheet("""
+            QTableView {
+                background-color: #2d2d2d;
+                color: #ffffff;
+                border: 1px solid #555;
+            }
+            QHeaderView::section {
+                background-color: #0078d7;
+                color: #ffffff;
+                padding: 4px;
+                font-weight: bold;
+            }
+            QTableView::item:selected {
+                background-color: #1e90ff;
+                color: #ffffff;
+            }
+        """)
+
+        # Name filter and top-N
+        self.filter_input = QLineEdit()
+        self.filter_input.setPlaceholderText("Filter by process name")
+        self.filter_input.textChanged.connect(self.process_model.set_filter)
+        self.limit_spin = QSpinBox()
+        self.limit_spin.setRange(0, 100000)
+        self.limit_spin.setSpecialValueText("All")
+        self.limit_spin.setPrefix("Top ")
+        self.limit_spin.valueChanged.connect(self.process_model.set_limit)
+        filter_layout = QHBoxLayout()
+        filter_layout.addWidget(self.filter_input)
+        filter_layout.addWidget(self.limit_spin)
+
+        # Tree View, organized by parent PID with subtree totals
+        self.tree_model = ProcessTreeModel()
+        self.process_tree = QTreeView()
+        self.process_tree.setModel(self.tree_model)
+        self.process_tree.setUniformRowHeights(True)
+        self.process_tree.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.process_tree.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        self.process_tree.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.process_tree.setFont(QFont("Arial", 12))
+        self.process_tree.header().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.process_tree.setStyleSheet(self.process_table.styleSheet().replace("QTableView", "QTreeView"))
+        self.process_tree.hide()
+
+        # Buttons
+        self.refresh_button = QPushButton("Refresh Processes")
+        self.kill_button = QPushButton("Kill Selected")
+        self.kill_tree_button = QPushButton("Kill Tree")
+        self.grace_spin = QSpinBox()
+        self.grace_spin.setRange(0, 60)
+        self.grace_spin.setValue(3)
+        self.grace_spin.setPrefix("Grace ")
+        self.grace_spin.setSuffix(" s")
+        self.grace_spin.setToolTip("How long to wait after SIGTERM before sending SIGKILL")
+        self.tree_checkbox = QCheckBox("Tree View")
+        self.tree_checkbox.toggled.connect(self.set_tree_view)
+        self.status_label = QLabel()
+
+        # Button Animations
+        self.add_hover_animation(self.refresh_button)
+        self.add_hover_animation(self.kill_button)
+        self.add_hover_animation(self.kill_tree_button)
+
+        self.refresh_button.clicked.connect(self.load_processes)
+        self.kill_button.clicked.connect(lambda: self.kill_processes(tree=False))
+        self.kill_tree_button.clicked.connect(lambda: self.kill_processes(tree=True))
+
+        # Button Layout
+        button_layout = QHBoxLayout()
+        button_layout.addWidget(self.refresh_button)
+        button_layout.addWidget(self.kill_button)
+        button_layout.addWidget(self.kill_tree_button)
+        button_layout.addWidget(self.grace_spin)
+        button_layout.addStretch()
+        button_layout.addWidget(self.tree_checkbox)
+
+        # Add Widgets to Layout
+        layout.addLayout(filter_layout)
+        layout.addWidget(self.process_table)
+        layout.addWidget(self.process_tree)
+        layout.addWidget(self.status_label)
+        layout.addLayout(button_layout)
+
+        self.setLayout(layout)
+
+        # Terminations run on their own threads and report back through these
+        self.termination = None
+        self.termination_signals = TerminationSignals()
+        self.termination_signals.started.connect(self.termination_started, Qt.QueuedConnection)
+        self.termination_signals.result.connect(self.termination_result, Qt.QueuedConnection)
+        self.termination_signals.finished.connect(self.termination_finished, Qt.QueuedConnection)
+
+        # Show the last known processes until the first snapshot arrives
+        if cached_records:
+            self.process_model.update(cached_records)
+
+        # Snapshots are taken off the GUI thread; without a refresh_interval
+        # they are driven by the RefreshScheduler through refresh()
+        self.snapshot_worker = ProcessSnapshotWorker(self.registry, refresh_interval)
+        self.snapshot_worker.snapshot_ready.connect(self.show_processes)
+        self.snapshot_worker.snapshot_failed.connect(
+            lambda error: self.status_label.setText(f"Cannot list processes: {str(error) or type(error).__name__}"))
+        self.snapshot_worker.start()
+
+    def show_processes(self, records):
+        # Only the visible view is kept up to date; the other catches up when shown
+        if self.tree_checkbox.isChecked():
+            self.tree_model.update(records)
+        else:
+            self.process_model.update(records)
+
+    def set_tree_view(self, enabled):
+        self.process_tree.setVisible(enabled)
+        self.process_table.setVisible(not enabled)
+        self.filter_input.setEnabled(not enabled)
+        self.limit_spin.setEnabled(not enabled)
+        if self.snapshot_worker.latest:
+            self.show_processes(self.snapshot_worker.latest)
+
+    def selected_records(self):
+        if self.tree_checkbox.isChecked():
+            return [self.tree_model.record(index) for index in self.process_tree.selectionModel().selectedRows()]
+        return [self.process_model.record(index.row()) for index in self.process_table.selectionModel().selectedRows()]
+
+    def add_hover_animation(self, button):
+        """Add a simple hover animation to buttons."""
+        effect = QGraphicsOpacityEffect()
+        button.setGraphicsEffect(effect)
+        self.anim = QPropertyAnimation(effect, b"opacity")
+        self.anim.setDuration(300)
+        button.enterEvent = lambda event: self.start_animation(1.0)
+        button.leaveEvent = lambda event: self.start_animation(0.7)
+
+    def start_animation(self, end_value):
+        self.anim.stop()
+        self.anim.setStartValue(self.anim.startValue() if self.anim.startValue() else 0.7)
+        self.anim.setEndValue(end_value)
+        self.anim.start()
+
+    @timed_refresh
+    def load_processes(self):
+        self.snapshot_worker.request()
+
+    @timed_refresh
+    def refresh(self):
+        self.snapshot_worker.request(supersede=False)
+
+    def kill_processes(self, tree=False):
+        records = self.selected_records()
+        if not records:
+            QMessageBox.warning(self, "No Selection", "Please select the processes to kill.")
+            return
+        protected = sorted(record.pid for record in records if record.pid in TerminationJob.protected_pids())
+        if protected:
+            QMessageBox.warning(self, "Not Allowed",
+                                f"PID {', '.join(map(str, protected))} is ChaoSmart or one of the processes "
+                                "that started it; ending it would end ChaoSmart too.")
+            return
+        if len(records) == 1:
+            what = f"process PID {records[0].pid} ({records[0].name})"
+        else:
+            what = f"{len(records)} processes"
+        if tree:
+            what += " and all of its child processes" if len(records) == 1 else " and all of their child processes"
+        reply = QMessageBox.question(
+            self, 'Confirm Kill', f"Are you sure you want to kill {what}?",
+            QMessageBox.Yes | QMessageBox.No, QMessageBox.No
+        )
+        if reply != QMessageBox.Yes:
+            return
+        job = self.termination = TerminationJob([(record.pid, record.create_time) for record in records],
+                                                tree=tree, grace=self.grace_spin.value())
+        self.status_label.setText(f"Terminating {what}...")
+        threading.Thread(target=self._run_termination, args=(job,), name="TerminationJob", daemon=True).start()
+
+    def _run_termination(self, job):
+        signals = self.termination_signals
+        job.run(lambda pid, outcome: signals.result.emit(job, pid, outcome),
+                lambda total: signals.started.emit(job, total))
+        signals.finished.emit(job)
+
+    def termination_started(self, job, total):
+        job.total = total
+        self.show_termination(job)
+
+    def termination_result(self, job, pid, outcome):
+        job.outcomes[pid] = outcome
+        self.show_termination(job)
+
+    def show_termination(self, job):
+        if job is self.termination:
+            self.status_label.setText(f"Terminating: {len(job.outcomes):,} of {job.total:,} processes ended")
+
+    def termination_finished(self, job):
+        counts = {}
+        for outcome in job.outcomes.values():
+            counts[outcome] = counts.get(outcome, 0) + 1
+        ended = counts.get("terminated", 0) + counts.get("killed", 0)
+        summary = f"Ended {ended:,} of {len(job.outcomes):,} processes"
+        if counts.get("killed"):
+            summary += f" ({counts['killed']:,} needed SIGKILL)"
+        if counts.get("exited"):
+            summary += f"; {counts['exited']:,} had already exited"
+        if job is self.termination:
+            self.status_label.setText(summary)
+        failed = sorted(pid for pid, outcome in job.outcomes.items() if outcome in ("denied", "protected", "survived"))
+        if failed:
+            shown = ", ".join(f"{pid} ({job.outcomes[pid]})" for pid in failed[:20])
+            more = f" and {len(failed) - 20:,} more" if len(failed) > 20 else ""
+            QMessageBox.warning(self, "Error", f"{summary}.\nCould not end: {shown}{more}")
+        self.load_processes()
+
+# ==========================
+# Connections Tab
+# ==========================
+ConnectionRecord = namedtuple("ConnectionRecord", "proto laddr lport raddr rport status pid process")
+
+def format_address(address):
+    if not address:
+        return "", 0
+    host = f"[{address.ip}]" if ":" in address.ip else address.ip
+    return f"{host}:{address.port}", address.port
+
+@timed
+def collect_connections(process_names, cancelled=None):
+    """Return a ConnectionRecord per inet socket, joined to process names by PID."""
+    names = process_names()
+    records = []
+    for index, conn in enumerate(psutil.net_connections(kind="inet")):
+        if cancelled is not None and not index % 4096 and cancelled():
+            return None
+        laddr, lport = format_address(conn.laddr)
+        raddr, rport = format_address(conn.raddr)
+        proto = "TCP" if conn.type == socket.SOCK_STREAM else "UDP"
+        if conn.family == socket.AF_INET6:
+            proto += "6"
+        records.append(ConnectionRecord(
+            proto, laddr, lport, raddr, rport, conn.status,
+            conn.pid or 0, names.get(conn.pid, "") if conn.pid else "",
+        ))
+    return records
+
+def connection_filter(text):
+    """Build a predicate from "port:443 state:established nginx" style filters.
+
+    Every term must match. port: checks both ends, state:/status: the socket
+    state, pid: the owning PID; bare words match the process name or either
+    address.
+    """
+    tests = []
+    for term in text.lower().split():
+        field, _, value = term.partition(":")
+        if not value:
+            word = field
+            tests.append(lambda r, w=word: w in r.process.lower() or w in r.laddr or w in r.raddr)
+        elif field == "port" and value.isdigit():
+            tests.append(lambda r, p=int(value): r.lport == p or r.rport == p)
+        elif field in ("state", "status"):
+            tests.append(lambda r, v=value: v in r.status.lower())
+        elif field == "pid" and value.isdigit():
+            tests.append(lambda r, p=int(value): r.pid == p)
+        elif field in ("proc", "process", "name"):
+            tests.append(lambda r, v=value: v in r.process.lower())
+        else:
+            tests.append(lambda r, t=term: t in r.process.lower() or t in r.laddr or t in r.raddr)
+    return lambda record: all(test(record) for test in tests)
+
+class ConnectionTableModel(KeyedTableModel):
+    """Socket rows keyed by (proto, laddr, raddr, pid, status)."""
+    HEADERS = ("Proto", "Local Address", "Remote Address", "Status", "PID", "Process")
+
+    @staticmethod
+    def key(record):
+        return record.proto, record.laddr, record.raddr, record.pid, record.status
+
+    def display(self, record, column):
+        if column == 4:
+            return str(record.pid) if record.pid else ""
+        return (record.proto, record.laddr, record.raddr, record.status, None, record.process)[column]
+
+class ConnectionsTab(QWidget):
+    def __init__(self, process_names, refresh_interval=None):
+        super().__init__()
+        self.process_names = process_names
+        self.records = ()
+        self.matches = connection_filter("")
+        layout = QVBoxLayout()
+
+        # Filter Input
+        self.filter_input = QLineEdit()
+        self.filter_input.setPlaceholderText("Filter, e.g. port:443 state:listen nginx")
+        self.filter_input.setFont(QFont("Arial", 12))
+        self.filter_input.textChanged.connect(self.apply_filter)
+
+        # Table View
+        self.connection_model = ConnectionTableModel()
+        self.connection_table = QTableView()
+        self.connection_table.setModel(self.connection_model)
+        self.connection_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.connection_table.verticalHeader().setVisible(False)
+        self.connection_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.connection_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.connection_table.setFont(QFont("Arial", 12))
+
+        self.status_label = QLabel()
+
+        # Add Widgets to Layout
+        layout.addWidget(self.filter_input)
+        layout.addWidget(self.connection_table)
+        layout.addWidget(self.status_label)
+        self.setLayout(layout)
+
+        # Sockets are collected off the GUI thread, like processes
+        self.snapshot_worker = SnapshotWorker(
+            lambda cancelled: collect_connections(self.process_names, cancelled), refresh_interval
+        )
+        self.snapshot_worker.snapshot_ready.connect(self.connections_loaded)
+        self.snapshot_worker.snapshot_failed.connect(self.connections_failed)
+        self.snapshot_worker.start()
+
+    def load_connections(self):
+        self.snapshot_worker.request()
+
+    @timed_refresh
+    def refresh(self):
+        self.snapshot_worker.request(supersede=False)
+
+    @timed
+    def connections_loaded(self, records):
+        self.records = records
+        self.show_connections()
+
+    def connections_failed(self, error):
+        # e.g. AccessDenied from net_connections() without root on macOS
+        self.status_label.setText(f"Cannot list connections: {str(error) or type(error).__name__}")
+
+    def apply_filter(self, text):
+        self.matches = connection_filter(text)
+        self.show_connections()
+
+    def show_connections(self):
+        matches = self.matches
+        shown = [record for record in self.records if matches(record)]
+        self.connection_model.update(shown)
+        self.status_label.setText(f"{len(shown):,} of {len(self.records):,} connections")
+
+# ==========================
+# Registry Backends
+# ==========================
+REGISTRY_HIVES = (
+    "HKEY_CLASSES_ROOT", "HKEY_CURRENT_USER", "HKEY_LOCAL_MACHINE",
+    "HKEY_USERS", "HKEY_CURRENT_CONFIG",
+)
+HIVE_ALIASES = {
+    "HKCR": "HKEY_CLASSES_ROOT", "HKCU": "HKEY_CURRENT_USER",
+    "HKLM": "HKEY_LOCAL_MACHINE", "HKU": "HKEY_USERS", "HKCC": "HKEY_CURRENT_CONFIG",
+}
+
+# Value types, numbered as in winreg
+REG_NONE, REG_SZ, REG_EXPAND_SZ, REG_BINARY, REG_DWORD = 0, 1, 2, 3, 4
+REG_MULTI_SZ, REG_QWORD = 7, 11
+
+STARTUP_RUN_KEY = "HKEY_CURRENT_USER\\Software\\Microsoft\\Windows\\CurrentVersion\\Run"
+
+def split_registry_path(path):
+    """Split "HIVE\\sub\\key" into a canonical hive name and sub key."""
+    parts = path.strip().strip("\\").split("\\", 1)
+    hive = parts[0].upper()
+    hive = HIVE_ALIASES.get(hive, hive)
+    sub_key = parts[1] if len(parts) > 1 else ""
+    if hive not in REGISTRY_HIVES:
+        hive = "HKEY_CURRENT_USER"
+    return hive, sub_key
+
+def join_registry_path(path, name):
+    return f"{path}\\{name}" if path else name
+
+def encode_registry_data(value_type, data):
+    """Make value data JSON-friendly; binary data is stored as hex."""
+    if isinstance(data, (bytes, bytearray)):
+        return {"hex": bytes(data).hex()}
+    return data
+
+def decode_registry_data(value_type, data):
+    if isinstance(data, dict) and "hex" in data:
+        return bytes.fromhex(data["hex"])
+    return data
+
+class RegistryBackend:
+    """Registry access by full key path, e.g. "HKEY_CURRENT_USER\\Software".
+
+    Missing keys and values raise FileNotFoundError, as winreg does.
+    """
+    def query_info(self, path):
+        """Return (subkey count, value count, last write time)."""
+        raise NotImplementedError
+
+    def subkeys(self, path):
+        raise NotImplementedError
+
+    def values(self, path):
+        """Return a list of (name, data, type) tuples."""
+        raise NotImplementedError
+
+    def create_key(self, path):
+        raise NotImplementedError
+
+    def set_value(self, path, name, value_type, data):
+        raise NotImplementedError
+
+    def delete_value(self, path, name):
+        raise NotImplementedError
+
+    @contextlib.contextmanager
+    def batch(self):
+        """Group many writes, e.g. an import, so the backend can apply them together."""
+        yield
+
+class WinRegistryBackend(RegistryBackend):
+    """The Windows registry through winreg, imported on first use."""
+    def __init__(self):
+        import winreg
+        self.winreg = winreg
+
+    def _open(self, path, access=None):
+        hive, sub_key = split_registry_path(path)
+        return self.winreg.OpenKey(getattr(self.winreg, hive), sub_key, 0,
+                                   self.winreg.KEY_READ if access is None else access)
+
+    def query_info(self, path):
+        with self._open(path) as key:
+            return self.winreg.QueryInfoKey(key)
+
+    def subkeys(self, path):
+        names = []
+        with self._open(path) as key:
+            for index in range(self.winreg.QueryInfoKey(key)[0]):
+                try:
+                    names.append(self.winreg.EnumKey(key, index))
+                except OSError:
+                    break
+        return names
+
+    def values(self, path):
+        values = []
+        with self._open(path) as key:
+            for index in range(self.winreg.QueryInfoKey(key)[1]):
+                try:
+                    values.append(self.winreg.EnumValue(key, index))
+                except OSError:
+                    break
+        return values
+
+    def create_key(self, path):
+        hive, sub_key = split_registry_path(path)
+        self.winreg.CreateKey(getattr(self.winreg, hive), sub_key).Close()
+
+    def set_value(self, path, name, value_type, data):
+        with self._open(path, self.winreg.KEY_SET_VALUE) as key:
+            self.winreg.SetValueEx(key, name, 0, value_type, data)
+
+    def delete_value(self, path, name):
+        with self._open(path, self.winreg.KEY_SET_VALUE) as key:
+            self.winreg.DeleteValue(key, name)
+
+class HiveKey:
+    __slots__ = ("name", "subkeys", "values", "last_write")
+
+    def __init__(self, name):
+        self.name = name
+        self.subkeys = {}  # lower-case name -> HiveKey
+        self.values = {}   # lower-case name -> (name, data, type)
+        self.last_write = 0
+
+class MemoryRegistryBackend(RegistryBackend):
+    """An in-memory hive loaded from, and saved back to, a JSON file.
+
+    Used off Windows and for testing. The file maps hive names to keys of the
+    form {"values": [[name, type, data], ...], "keys": {name: key, ...}}.
+    Reads and writes hold the lock, since imports and searches run on
+    worker threads; every write saves the file, except inside batch(),
+    which saves once at the end.
+    """
+    def __init__(self, path=None):
+        self.path = path
+        self.hives = {hive: HiveKey(hive) for hive in REGISTRY_HIVES}
+        self._lock = threading.RLock()
+        self._batch = 0
+        if path and os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                self.load(json.load(f))
+
+    def load(self, tree):
+        def build(key, node):
+            for name, value_type, data in node.get("values", ()):
+                key.values[name.lower()] = (name, decode_registry_data(value_type, data), value_type)
+            for name, child in node.get("keys", {}).items():
+                key.subkeys[name.lower()] = build(HiveKey(name), child)
+            return key
+        for hive, node in tree.items():
+            build(self.hives[split_registry_path(hive)[0]], node)
+
+    def dump(self):
+        def export(key):
+            node = {}
+            if key.values:
+                node["values"] = [[name, value_type, encode_registry_data(value_type, data)]
+                                  for name, data, value_type in key.values.values()]
+            if key.subkeys:
+                node["keys"] = {child.name: export(child) for child in key.subkeys.values()}
+            return node
+        return {hive: export(key) for hive, key in self.hives.items()}
+
+    def save(self):
+        if self.path:
+            with self._lock:
+                tree = self.dump()
+            tmp = self.path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(tree, f)
+            os.replace(tmp, self.path)
+
+    def _written(self):
+        if not self._batch:
+            self.save()
+
+    @contextlib.contextmanager
+    def batch(self):
+        self._lock.acquire()
+        self._batch += 1
+        try:
+            yield
+        finally:
+            self._batch -= 1
+            outermost = not self._batch
+            self._lock.release()
+            if outermost:
+                self.save()  # Also after a failed batch; outside the lock, so readers only wait for the dump
+
+    def _key(self, path, create=False):
+        hive, sub_key = split_registry_path(path)
+        key = self.hives[hive]
+        for part in filter(None, sub_key.split("\\")):
+            child = key.subkeys.get(part.lower())
+            if child is None:
+                if not create:
+                    raise FileNotFoundError(f"Registry key not found: {path}")
+                child = key.subkeys[part.lower()] = HiveKey(part)
+            key = child
+        return key
+
+    def query_info(self, path):
+        with self._lock:
+            key = self._key(path)
+            return len(key.subkeys), len(key.values), key.last_write
+
+    def subkeys(self, path):
+        with self._lock:
+            return [child.name for child in self._key(path).subkeys.values()]
+
+    def values(self, path):
+        with self._lock:
+            return list(self._key(path).values.values())
+
+    def create_key(self, path):
+        with self._lock:
+            self._key(path, create=True)
+            self._written()
+
+    def set_value(self, path, name, value_type, data):
+        with self._lock:
+            key = self._key(path, create=True)
+            key.values[name.lower()] = (name, data, value_type)
+            key.last_write = time.time()
+            self._written()
+
+    def delete_value(self, path, name):
+        with self._lock:
+            key = self._key(path)
+            if key.values.pop(name.lower(), None) is None:
+                raise FileNotFoundError(f"Registry value not found: {name}")
+            key.last_write = time.time()
+            self._written()
+
+def default_registry_backend():
+    """The real registry on Windows, otherwise a local stand-in hive.
+
+    CHAOSMART_REGISTRY_HIVE can point at a hive file to use it anywhere.
+    """
+    hive_file = os.environ.get("CHAOSMART_REGISTRY_HIVE")
+    if hive_file:
+        return MemoryRegistryBackend(hive_file)
+    if sys.platform == "win32":
+        return WinRegistryBackend()
+    return MemoryRegistryBackend(data_path("registry_hive.json"))
+
+# ==========================
+# Registry Tree Model
+# ==========================
+class RegistryNode:
+    __slots__ = ("name", "path", "parent", "row", "children", "info", "values")
+
+    def __init__(self, name, path, parent, row):
+        self.name = name
+        self.path = path
+        self.parent = parent
+        self.row = row
+        self.children = None  # Fetched on demand
+        self.info = None      # Cached query_info()
+        self.values = None    # Cached values()
+
+class RegistryTreeModel(QAbstractItemModel):
+    """Lazily expanding tree of registry keys with per-key caching."""
+    def __init__(self, backend):
+        super().__init__()
+        self.backend = backend
+        self.roots = [RegistryNode(hive, hive, None, row) for row, hive in enumerate(REGISTRY_HIVES)]
+
+    def node(self, index):
+        return index.internalPointer() if index.isValid() else None
+
+    def key_info(self, node):
+        if node.info is None:
+            try:
+                node.info = self.backend.query_info(node.path)
+            except OSError:
+                node.info = (0, 0, 0)
+        return node.info
+
+    def key_values(self, node):
+        if node.values is None:
+            node.values = self.backend.values(node.path)
+        return node.values
+
+    def index(self, row, column, parent=QModelIndex()):
+        if not self.hasIndex(row, column, parent):
+            return QModelIndex()
+        siblings = self.roots if not parent.isValid() else parent.internalPointer().children
+        return self.createIndex(row, column, siblings[row])
+
+    def parent(self, index):
+        node = self.node(index)
+        if node is None or node.parent is None:
+            return QModelIndex()
+        return self.createIndex(node.parent.row, 0, node.parent)
+
+    def rowCount(self, parent=QModelIndex()):
+        node = self.node(parent)
+        if node is None:
+            return len(self.roots)
+        return len(node.children) if node.children is not None else 0
+
+    def columnCount(self, parent=QModelIndex()):
+        return 1
+
+    def hasChildren(self, parent=QModelIndex()):
+        node = self.node(parent)
+        if node is None:
+            return True
+        if node.children is not None:
+            return bool(node.children)
+        return self.key_info(node)[0] > 0
+
+    def canFetchMore(self, parent):
+        node = self.node(parent)
+        return node is not None and node.children is None and self.key_info(node)[0] > 0
+
+    def fetchMore(self, parent):
+        node = self.node(parent)
+        if node is None or node.children is not None:
+            return
+        try:
+            names = sorted(self.backend.subkeys(node.path), key=str.lower)
+        except OSError:
+            names = []
+        if not names:
+            node.children = []
+            return
+        self.beginInsertRows(parent, 0, len(names) - 1)
+        node.children = [RegistryNode(name, join_registry_path(node.path, name), node, row)
+                         for row, name in enumerate(names)]
+        self.endInsertRows()
+
+    def data(self, index, role=Qt.DisplayRole):
+        node = self.node(index)
+        if node is not None and role == Qt.DisplayRole:
+            return node.name
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return "Key"
+        return None
+
+    def find(self, path):
+        """Return the index of a key path, fetching its ancestors as needed."""
+        hive, sub_key = split_registry_path(path)
+        index = self.index(REGISTRY_HIVES.index(hive), 0)
+        for part in filter(None, sub_key.split("\\")):
+            node = self.node(index)
+            self.fetchMore(index)
+            lowered = part.lower()
+            for child in node.children or ():
+                if child.name.lower() == lowered:
+                    index = self.index(child.row, 0, index)
+                    break
+            else:
+                return QModelIndex()
+        return index
+
+    def invalidate(self, index):
+        """Forget the cached children, info and values of a key."""
+        node = self.node(index)
+        if node is None:
+            return
+        if node.children:
+            self.beginRemoveRows(index, 0, len(node.children) - 1)
+            node.children = None
+            self.endRemoveRows()
+        node.children = None
+        node.info = None
+        node.values = None
+
+# ==========================
+# Registry Search
+# ==========================
+RegistryHit = namedtuple("RegistryHit", "path kind name data")
+
+class RegistrySearch:
+    """Searches a registry subtree in parallel for matching keys and values.
+
+    Key names, value names and value data are matched by case-insensitive
+    substring or regular expression. Hits are streamed to publish() in
+    batches together with the number of keys scanned so far.
+    """
+    def __init__(self, backend, root, pattern, regex=False, workers=8):
+        self.backend = backend
+        self.root = root
+        self.workers = workers
+        if regex:
+            self.matches = re.compile(pattern, re.IGNORECASE).search
+        else:
+            needle = pattern.lower()
+            self.matches = lambda text: needle in text.lower()
+        self.keys_scanned = 0
+        self.hit_count = 0
+        self.cancelled = threading.Event()
+        self._lock = threading.Lock()
+        self._hits = []
+        self._pending = 0
 
-        # Button Animations
-        self.add_hover_animation(self.refresh_button)
-        self.add_hover_animation(self.kill_button)
+    def _search(self, path):
+        handoff = []
+        stack = [path]
+        hits = []
+        scanned = 0
+        while stack and not self.cancelled.is_set():
+            current = stack.pop()
+            scanned += 1
+            try:
+                for name, data, _ in self.backend.values(current):
+                    if self.matches(name):
+                        hits.append(RegistryHit(current, "value", name, data))
+                    elif isinstance(data, (str, list, int)) and self.matches(str(data)):
+                        hits.append(RegistryHit(current, "data", name, data))
+                for name in self.backend.subkeys(current):
+                    child = join_registry_path(current, name)
+                    if self.matches(name):
+                        hits.append(RegistryHit(child, "key", name, None))
+                    if self._pending < self.workers * 4:
+                        handoff.append(child)
+                    else:
+                        stack.append(child)
+            except OSError:
+                continue
+            if len(hits) >= 256:
+                self._flush(hits, scanned)
+                hits, scanned = [], 0
+        self._flush(hits, scanned)
+        return handoff
 
-        self.refresh_button.clicked.connect(self.load_processes)
-        self.kill_button.clicked.connect(self.kill_process)
+    def _flush(self, hits, scanned):
+        with self._lock:
+            self._hits.extend(hits)
+            self.hit_count += len(hits)
+            self.keys_scanned += scanned
 
-        # Button Layout
-        button_layout = QHBoxLayout()
-        button_layout.addWidget(self.refresh_button)
-        button_layout.addWidget(self.kill_button)
-        button_layout.addStretch()
+    def take_hits(self):
+        with self._lock:
+            hits, self._hits = self._hits, []
+            return hits
 
-        # Add Widgets to Layout
-        layout.addWidget(self.process_table)
-        layout.addLayout(button_layout)
+    def run(self, publish, interval=0.2):
+        """Walk the subtree, calling publish(hits) with new hits as they arrive."""
+        self.backend.query_info(self.root)  # Fail early for a missing root
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            pending = {executor.submit(self._search, self.root)}
+            while pending:
+                done, pending = wait(pending, timeout=interval, return_when=FIRST_COMPLETED)
+                for future in done:
+                    for path in future.result():
+                        pending.add(executor.submit(self._search, path))
+                self._pending = len(pending)
+                if self.cancelled.is_set():
+                    for future in pending:
+                        future.cancel()
+                    break
+                publish(self.take_hits())
+        publish(self.take_hits())
 
-        self.setLayout(layout)
-        self.load_processes()
+class RegistrySearchSignals(QObject):
+    # Each carries the generation of the search it came from
+    hits = pyqtSignal(int, object)  # [RegistryHit]
+    finished = pyqtSignal(int, float)  # elapsed seconds
+    failed = pyqtSignal(int, object)  # error
 
-    def add_hover_animation(self, button):
-        """Add a simple hover animation to buttons."""
-        effect = QGraphicsOpacityEffect()
-        button.setGraphicsEffect(effect)
-        self.anim = QPropertyAnimation(effect, b"opacity")
-        self.anim.setDuration(300)
-        button.enterEvent = lambda event: self.start_animation(1.0)
-        button.leaveEvent = lambda event: self.start_animation(0.7)
+# ==========================
+# Registry Snapshots
+# ==========================
+SNAPSHOT_FORMAT = "chaosmart-registry-snapshot/1"
+RegistryChange = namedtuple("RegistryChange", "kind path name old new")
 
-    def start_animation(self, end_value):
-        self.anim.stop()
-        self.anim.setStartValue(self.anim.startValue() if self.anim.startValue() else 0.7)
-        self.anim.setEndValue(end_value)
-        self.anim.start()
+def snapshot_order(relative_path):
+    """Sort key matching the pre-order walk used by export_snapshot()."""
+    return tuple(part.lower() for part in relative_path.split("\\")) if relative_path else ()
 
-    def load_processes(self):
-        self.process_table.setRowCount(0)
-        for proc in psutil.process_iter(['pid', 'name', 'cpu_percent']):
+def export_snapshot(backend, root, path, cancelled=lambda: False):
+    """Stream the subtree under root to a JSON-lines snapshot file.
+
+    Keys are written depth-first with siblings sorted case-insensitively, so
+    the file is ordered by snapshot_order() and two snapshots can be diffed
+    with a single merge pass. Returns the number of keys written.
+    """
+    count = 0
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(json.dumps({"format": SNAPSHOT_FORMAT, "root": root, "created": time.time()}) + "\n")
+        stack = [""]
+        while stack:
+            if cancelled():
+                break
+            relative = stack.pop()
+            full = join_registry_path(root, relative) if relative else root
             try:
-                pid = proc.info['pid']
-                name = proc.info['name']
-                cpu = proc.info['cpu_percent']
-                row_position = self.process_table.rowCount()
-                self.process_table.insertRow(row_position)
-                self.process_table.setItem(row_position, 0, QTableWidgetItem(str(pid)))
-                self.process_table.setItem(row_position, 1, QTableWidgetItem(name))
-                self.process_table.setItem(row_position, 2, QTableWidgetItem(str(cpu)))
-            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                values = sorted(backend.values(full), key=lambda value: value[0].lower())
+                subkeys = sorted(backend.subkeys(full), key=str.lower, reverse=True)
+            except OSError:
                 continue
+            f.write(json.dumps({
+                "k": relative,
+                "v": [[name, value_type, encode_registry_data(value_type, data)]
+                      for name, data, value_type in values],
+            }, sort_keys=True, separators=(",", ":")) + "\n")
+            count += 1
+            stack.extend(join_registry_path(relative, name) for name in subkeys)
+    if cancelled():
+        os.remove(tmp)
+    else:
+        os.replace(tmp, path)
+    return count
 
-    def kill_process(self):
-        selected_items = self.process_table.selectedItems()
-        if selected_items:
-            pid = int(selected_items[0].text())
-            reply = QMessageBox.question(
-                self, 'Confirm Kill',
-                f"Are you sure you want to kill process PID {pid}?",
-                QMessageBox.Yes | QMessageBox.No, QMessageBox.No
-            )
-            if reply == QMessageBox.Yes:
-                try:
-                    proc = psutil.Process(pid)
-                    proc.terminate()
-                    proc.wait(timeout=3)
-                    QMessageBox.information(self, "Success", f"Process PID {pid} terminated.")
-                    self.load_processes()
-                except psutil.NoSuchProcess:
-                    QMessageBox.warning(self, "Error", "Process does not exist.")
-                except psutil.AccessDenied:
-                    QMessageBox.warning(self, "Error", "Access Denied.")
-                except psutil.TimeoutExpired:
-                    QMessageBox.warning(self, "Error", "Could not terminate process.")
+def read_snapshot(path):
+    """Yield (relative key path, [[name, type, data], ...]) from a snapshot file."""
+    with open(path, encoding="utf-8") as f:
+        header = json.loads(f.readline() or "{}")
+        if header.get("format") != SNAPSHOT_FORMAT:
+            raise ValueError(f"{path} is not a ChaoSmart registry snapshot")
+        for line in f:
+            record = json.loads(line)
+            yield record["k"], record["v"]
+
+def snapshot_root(path):
+    with open(path, encoding="utf-8") as f:
+        return json.loads(f.readline() or "{}").get("root", "")
+
+def import_snapshot(backend, path, root):
+    """Write every key and value of a snapshot under root. Returns keys written."""
+    count = 0
+    with backend.batch():
+        for relative, values in read_snapshot(path):
+            full = join_registry_path(root, relative) if relative else root
+            backend.create_key(full)
+            for name, value_type, data in values:
+                backend.set_value(full, name, value_type, decode_registry_data(value_type, data))
+            count += 1
+    return count
+
+def diff_snapshots(old_path, new_path):
+    """Yield RegistryChanges between two snapshots as a streaming merge join."""
+    def changes_in(relative, old_values, new_values):
+        old = {name.lower(): (name, value_type, data) for name, value_type, data in old_values}
+        new = {name.lower(): (name, value_type, data) for name, value_type, data in new_values}
+        for key in sorted(old.keys() | new.keys()):
+            if key not in new:
+                yield RegistryChange("value removed", relative, old[key][0], old[key][2], None)
+            elif key not in old:
+                yield RegistryChange("value added", relative, new[key][0], None, new[key][2])
+            elif old[key][1:] != new[key][1:]:
+                yield RegistryChange("value changed", relative, new[key][0], old[key][2], new[key][2])
+
+    old_iter = read_snapshot(old_path)
+    new_iter = read_snapshot(new_path)
+    old = next(old_iter, None)
+    new = next(new_iter, None)
+    while old is not None or new is not None:
+        old_order = snapshot_order(old[0]) if old is not None else None
+        new_order = snapshot_order(new[0]) if new is not None else None
+        if new is None or (old is not None and old_order < new_order):
+            yield RegistryChange("key removed", old[0], None, None, None)
+            old = next(old_iter, None)
+        elif old is None or new_order < old_order:
+            yield RegistryChange("key added", new[0], None, None, None)
+            yield from changes_in(new[0], (), new[1])
+            new = next(new_iter, None)
         else:
-            QMessageBox.warning(self, "No Selection", "Please select a process to kill.")
+            yield from changes_in(new[0], old[1], new[1])
+            old = next(old_iter, None)
+            new = next(new_iter, None)
+
+class RegistrySnapshotSignals(QObject):
+    changes = pyqtSignal(object)  # [RegistryChange]
+    finished = pyqtSignal(str)
+    failed = pyqtSignal(object)
+    written = pyqtSignal(str)     # key whose subtree a job wrote to
+
+class RegistryDiffDialog(QDialog):
+    COLORS = {"added": QColor("#4caf50"), "removed": QColor("#f44336"), "changed": QColor("#ffc107")}
+    BATCH = 500
+
+    def __init__(self, old_path, new_path, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Registry Snapshot Diff")
+        self.resize(900, 600)
+        self.cancelled = threading.Event()
+        layout = QVBoxLayout()
+        self.change_list = QListWidget()
+        self.change_list.setUniformItemSizes(True)
+        self.status_label = QLabel("Comparing...")
+        layout.addWidget(QLabel(f"Old: {old_path}\nNew: {new_path}"))
+        layout.addWidget(self.change_list)
+        layout.addWidget(self.status_label)
+        self.setLayout(layout)
+
+        self.signals = RegistrySnapshotSignals()
+        self.signals.changes.connect(self.add_changes, Qt.QueuedConnection)
+        self.signals.finished.connect(self.status_label.setText, Qt.QueuedConnection)
+        self.signals.failed.connect(lambda e: self.status_label.setText(f"Diff failed: {e}"), Qt.QueuedConnection)
+        threading.Thread(target=self._run, args=(old_path, new_path), name="RegistryDiff", daemon=True).start()
+
+    def _run(self, old_path, new_path):
+        root = snapshot_root(new_path)
+        batch = []
+        total = 0
+        try:
+            for change in diff_snapshots(old_path, new_path):
+                if self.cancelled.is_set():
+                    return
+                batch.append(change._replace(path=join_registry_path(root, change.path) if change.path else root))
+                if len(batch) >= self.BATCH:
+                    self.signals.changes.emit(batch)
+                    total += len(batch)
+                    batch = []
+        except (OSError, ValueError) as e:
+            self.signals.failed.emit(e)
+            return
+        if batch:
+            self.signals.changes.emit(batch)
+            total += len(batch)
+        self.signals.finished.emit(f"{total:,} changes")
+
+    def add_changes(self, changes):
+        for change in changes:
+            if change.kind.startswith("key"):
+                text = f"{change.kind}: {change.path}"
+            elif change.kind == "value changed":
+                text = f"{change.kind}: {change.path} -> {change.name}: {change.old} => {change.new}"
+            else:
+                value = change.new if change.old is None else change.old
+                text = f"{change.kind}: {change.path} -> {change.name}: {value}"
+            self.change_list.addItem(text)
+            item = self.change_list.item(self.change_list.count() - 1)
+            item.setForeground(self.COLORS[change.kind.split()[1]])
+        self.status_label.setText(f"Comparing... {self.change_list.count():,} changes")
+
+    def closeEvent(self, event):
+        self.cancelled.set()
+        super().closeEvent(event)
 
 # ==========================
 # Registry Editor Tab
 # ==========================
 class RegistryEditorTab(QWidget):
-    def __init__(self):
+    def __init__(self, backend):
         super().__init__()
+        self.backend = backend
         layout = QVBoxLayout()
 
         # Fonts
@@ -448,57 +4379,274 @@ class RegistryEditorTab(QWidget):
         self.load_button.setFixedWidth(100)
         self.load_button.clicked.connect(self.load_registry_key)
 
+        # Key Tree
+        self.tree_model = RegistryTreeModel(backend)
+        self.key_tree = QTreeView()
+        self.key_tree.setModel(self.tree_model)
+        self.key_tree.setFont(QFont("Arial", 12))
+        self.key_tree.setUniformRowHeights(True)
+        self.key_tree.selectionModel().currentChanged.connect(self.key_selected)
+
         # Value List
         self.value_list = QListWidget()
         self.value_list.setFont(QFont("Arial", 12))
 
+        splitter = QSplitter(Qt.Horizontal)
+        splitter.addWidget(self.key_tree)
+        splitter.addWidget(self.value_list)
+        splitter.setStretchFactor(1, 1)
+
+        # Search Controls
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText("Search key names, value names and data under the current key")
+        self.search_input.setFont(QFont("Arial", 12))
+        self.search_input.returnPressed.connect(self.start_search)
+        self.regex_check = QCheckBox("Regex")
+        self.search_button = QPushButton("Search")
+        self.search_button.clicked.connect(self.start_search)
+        self.cancel_search_button = QPushButton("Cancel")
+        self.cancel_search_button.clicked.connect(self.cancel_search)
+        search_layout = QHBoxLayout()
+        search_layout.addWidget(self.search_input)
+        search_layout.addWidget(self.regex_check)
+        search_layout.addWidget(self.search_button)
+        search_layout.addWidget(self.cancel_search_button)
+
+        # Snapshot Buttons
+        self.export_button = QPushButton("Export Snapshot")
+        self.export_button.clicked.connect(self.export_snapshot)
+        self.import_button = QPushButton("Import Snapshot")
+        self.import_button.clicked.connect(self.import_snapshot)
+        self.diff_button = QPushButton("Compare Snapshots")
+        self.diff_button.clicked.connect(self.compare_snapshots)
+        snapshot_layout = QHBoxLayout()
+        snapshot_layout.addWidget(self.export_button)
+        snapshot_layout.addWidget(self.import_button)
+        snapshot_layout.addWidget(self.diff_button)
+        snapshot_layout.addStretch()
+        self.snapshot_signals = RegistrySnapshotSignals()
+        self.snapshot_signals.finished.connect(self.snapshot_finished, Qt.QueuedConnection)
+        self.snapshot_signals.failed.connect(self.snapshot_failed, Qt.QueuedConnection)
+        self.snapshot_signals.written.connect(self.reload_key, Qt.QueuedConnection)
+
+        # Search Results
+        self.search_results = QListWidget()
+        self.search_results.setFont(QFont("Arial", 12))
+        self.search_results.itemDoubleClicked.connect(self.open_search_hit)
+        self.search_status = QLabel()
+        self.search = None
+        self.search_generation = 0
+        self.search_started = 0.0
+        self.search_signals = RegistrySearchSignals()
+        self.search_signals.hits.connect(self.search_hits, Qt.QueuedConnection)
+        self.search_signals.finished.connect(self.search_finished, Qt.QueuedConnection)
+        self.search_signals.failed.connect(self.search_failed, Qt.QueuedConnection)
+
         # Add Widgets to Layout
         layout.addWidget(self.key_label)
         layout.addWidget(self.key_input)
         layout.addWidget(self.load_button)
-        layout.addWidget(self.value_list)
+        layout.addWidget(splitter)
+        layout.addLayout(snapshot_layout)
+        layout.addLayout(search_layout)
+        layout.addWidget(self.search_results)
+        layout.addWidget(self.search_status)
 
         self.setLayout(layout)
 
-    def load_registry_key(self):
-        key_path = self.key_input.text()
-        root_key, sub_key = self.parse_registry_path(key_path)
+    def key_selected(self, index):
+        node = self.tree_model.node(index)
+        if node is None:
+            return
+        self.key_input.setText(node.path)
+        self.show_values(node)
+
+    def show_values(self, node):
+        self.value_list.clear()
         try:
-            registry_key = winreg.OpenKey(root_key, sub_key, 0, winreg.KEY_READ)
-            self.value_list.clear()
-            index = 0
-            while True:
-                try:
-                    value = winreg.EnumValue(registry_key, index)
-                    self.value_list.addItem(f"{value[0]}: {value[1]}")
-                    index += 1
-                except OSError:
-                    break
-            winreg.CloseKey(registry_key)
+            values = self.tree_model.key_values(node)
         except FileNotFoundError:
             QMessageBox.warning(self, "Error", "Registry key not found.")
+            return
         except Exception as e:
             QMessageBox.warning(self, "Error", f"Failed to load registry key:\n{e}")
+            return
+        self.value_list.addItems([f"{name}: {data}" for name, data, _ in values])
+
+    @timed_refresh
+    def load_registry_key(self):
+        hive, sub_key = self.parse_registry_path(self.key_input.text())
+        index = self.tree_model.find(join_registry_path(hive, sub_key))
+        if not index.isValid():
+            QMessageBox.warning(self, "Error", "Registry key not found.")
+            return
+        # Loading a key explicitly always re-reads its values
+        node = self.tree_model.node(index)
+        node.values = None
+        node.info = None
+        self.key_tree.setCurrentIndex(index)
+        self.key_tree.scrollTo(index)
+        self.show_values(node)
 
     def parse_registry_path(self, path):
-        hive_map = {
-            "HKEY_CLASSES_ROOT": winreg.HKEY_CLASSES_ROOT,
-            "HKEY_CURRENT_USER": winreg.HKEY_CURRENT_USER,
-            "HKEY_LOCAL_MACHINE": winreg.HKEY_LOCAL_MACHINE,
-            "HKEY_USERS": winreg.HKEY_USERS,
-            "HKEY_CURRENT_CONFIG": winreg.HKEY_CURRENT_CONFIG
-        }
-        parts = path.split("\\", 1)
-        hive = parts[0]
-        sub_key = parts[1] if len(parts) > 1 else ""
-        return hive_map.get(hive.upper(), winreg.HKEY_CURRENT_USER), sub_key
+        return split_registry_path(path)
+
+    def export_snapshot(self):
+        root = join_registry_path(*self.parse_registry_path(self.key_input.text()))
+        path, _ = QFileDialog.getSaveFileName(self, "Export Registry Snapshot", "", "Registry snapshots (*.jsonl)")
+        if not path:
+            return
+        self.search_status.setText(f"Exporting {root}...")
+        self.run_snapshot_job(lambda: f"Exported {export_snapshot(self.backend, root, path):,} keys to {path}")
+
+    def import_snapshot(self):
+        path, _ = QFileDialog.getOpenFileName(self, "Import Registry Snapshot", "", "Registry snapshots (*.jsonl)")
+        if not path:
+            return
+        try:
+            root = snapshot_root(path)
+        except (OSError, ValueError) as e:
+            QMessageBox.warning(self, "Error", f"Cannot read snapshot:\n{e}")
+            return
+        reply = QMessageBox.question(
+            self, 'Confirm Import',
+            f"Write all keys and values from this snapshot under {root}?",
+            QMessageBox.Yes | QMessageBox.No, QMessageBox.No
+        )
+        if reply == QMessageBox.Yes:
+            self.search_status.setText(f"Importing into {root}...")
+
+            def job():
+                try:
+                    return f"Imported {import_snapshot(self.backend, path, root):,} keys into {root}"
+                finally:
+                    self.snapshot_signals.written.emit(root)  # Also after a partial import
+            self.run_snapshot_job(job)
+
+    def compare_snapshots(self):
+        old_path, _ = QFileDialog.getOpenFileName(self, "Old Snapshot", "", "Registry snapshots (*.jsonl)")
+        if not old_path:
+            return
+        new_path, _ = QFileDialog.getOpenFileName(self, "New Snapshot", "", "Registry snapshots (*.jsonl)")
+        if not new_path:
+            return
+        dialog = RegistryDiffDialog(old_path, new_path, self)
+        dialog.setAttribute(Qt.WA_DeleteOnClose)
+        dialog.show()
+
+    def run_snapshot_job(self, job):
+        def run():
+            try:
+                message = job()
+            except (OSError, ValueError) as e:
+                self.snapshot_signals.failed.emit(e)
+                return
+            self.snapshot_signals.finished.emit(message)
+        threading.Thread(target=run, name="RegistrySnapshot", daemon=True).start()
+
+    def snapshot_finished(self, message):
+        self.search_status.setText(message)
+
+    def snapshot_failed(self, error):
+        self.search_status.setText("")
+        QMessageBox.warning(self, "Error", f"Snapshot failed:\n{error}")
+
+    def reload_key(self, path):
+        """Drop the tree's cached copy of a key written in the background and show it again."""
+        model = self.tree_model
+        hive, sub_key = split_registry_path(path)
+        index = model.index(REGISTRY_HIVES.index(hive), 0)
+        # The deepest cached key on the path; everything below it is re-fetched
+        for part in filter(None, sub_key.split("\\")):
+            children = model.node(index).children
+            child = next((child for child in children or () if child.name.lower() == part.lower()), None)
+            if child is None:
+                break
+            index = model.index(child.row, 0, index)
+        model.invalidate(index)
+        index = model.find(path)
+        if index.isValid():
+            self.key_tree.setCurrentIndex(index)
+            self.key_tree.scrollTo(index)
+            self.show_values(model.node(index))
+
+    def start_search(self):
+        pattern = self.search_input.text()
+        if not pattern:
+            return
+        self.cancel_search()
+        # Anything the previous search still delivers is stale from here on
+        self.search_generation += 1
+        self.search = None
+        root = join_registry_path(*self.parse_registry_path(self.key_input.text()))
+        try:
+            search = RegistrySearch(self.backend, root, pattern, regex=self.regex_check.isChecked())
+        except re.error as e:
+            self.search_status.setText("")
+            QMessageBox.warning(self, "Error", f"Invalid regular expression:\n{e}")
+            return
+        self.search = search
+        self.search_started = time.monotonic()
+        self.search_results.clear()
+        self.search_status.setText(f"Searching {root}...")
+        threading.Thread(target=self._run_search, args=(search, self.search_generation, self.search_started),
+                         name="RegistrySearch", daemon=True).start()
+
+    def _run_search(self, search, generation, started):
+        signals = self.search_signals
+        try:
+            search.run(lambda hits: signals.hits.emit(generation, hits))
+        except Exception as e:
+            signals.failed.emit(generation, e)
+            return
+        signals.finished.emit(generation, time.monotonic() - started)
+
+    def cancel_search(self):
+        if self.search is not None:
+            self.search.cancelled.set()
+
+    def search_hits(self, generation, hits):
+        if generation != self.search_generation:
+            return
+        search = self.search
+        if hits:
+            labels = {"key": "Key", "value": "Value", "data": "Data"}
+            self.search_results.addItems([
+                f"[{labels[hit.kind]}] {hit.path}" + ("" if hit.kind == "key" else f" -> {hit.name}: {hit.data}")
+                for hit in hits
+            ])
+        elapsed = max(time.monotonic() - self.search_started, 1e-6)
+        self.search_status.setText(
+            f"Searching... {search.hit_count:,} hits, {search.keys_scanned:,} keys "
+            f"({search.keys_scanned / elapsed:,.0f} keys/s)"
+        )
+
+    def search_finished(self, generation, elapsed):
+        if generation != self.search_generation:
+            return
+        search = self.search
+        state = "Cancelled" if search.cancelled.is_set() else "Done"
+        self.search_status.setText(
+            f"{state}: {search.hit_count:,} hits, {search.keys_scanned:,} keys in {elapsed:.1f} s "
+            f"({search.keys_scanned / max(elapsed, 1e-6):,.0f} keys/s)"
+        )
+
+    def search_failed(self, generation, error):
+        if generation == self.search_generation:
+            self.search_status.setText(f"Search failed: {str(error) or type(error).__name__}")
+
+    def open_search_hit(self, item):
+        path = item.text().split("] ", 1)[1].split(" -> ", 1)[0]
+        self.key_input.setText(path)
+        self.load_registry_key()
 
 # ==========================
 # Startup Manager Tab
 # ==========================
 class StartupManagerTab(QWidget):
-    def __init__(self):
+    def __init__(self, backend):
         super().__init__()
+        self.backend = backend
         layout = QVBoxLayout()
 
         # Fonts
@@ -554,20 +4702,12 @@ class StartupManagerTab(QWidget):
         self.anim.setEndValue(end_value)
         self.anim.start()
 
+    @timed_refresh
     def load_startup_items(self):
         self.startup_list.clear()
-        reg_path = r"Software\Microsoft\Windows\CurrentVersion\Run"
         try:
-            registry_key = winreg.OpenKey(winreg.HKEY_CURRENT_USER, reg_path, 0, winreg.KEY_READ)
-            i = 0
-            while True:
-                try:
-                    name, value, _ = winreg.EnumValue(registry_key, i)
-                    self.startup_list.addItem(f"{name}: {value}")
-                    i += 1
-                except OSError:
-                    break
-            winreg.CloseKey(registry_key)
+            for name, value, _ in self.backend.values(STARTUP_RUN_KEY):
+                self.startup_list.addItem(f"{name}: {value}")
         except Exception as e:
             QMessageBox.warning(self, "Error", f"Failed to load startup items:\n{e}")
 
@@ -575,9 +4715,8 @@ class StartupManagerTab(QWidget):
         selected = self.startup_list.currentItem()
         if selected:
             name, path = selected.text().split(": ", 1)
-            reg_path = r"Software\Microsoft\Windows\CurrentVersion\Run"
             try:
-                winreg.SetValueEx(winreg.OpenKey(winreg.HKEY_CURRENT_USER, reg_path, 0, winreg.KEY_SET_VALUE), name, 0, winreg.REG_SZ, path)
+                self.backend.set_value(STARTUP_RUN_KEY, name, REG_SZ, path)
                 QMessageBox.information(self, "Success", f"Enabled startup item: {name}")
             except Exception as e:
                 QMessageBox.warning(self, "Error", f"Failed to enable startup item:\n{e}")
@@ -588,9 +4727,8 @@ class StartupManagerTab(QWidget):
         selected = self.startup_list.currentItem()
         if selected:
             name, _ = selected.text().split(": ", 1)
-            reg_path = r"Software\Microsoft\Windows\CurrentVersion\Run"
             try:
-                winreg.DeleteValue(winreg.OpenKey(winreg.HKEY_CURRENT_USER, reg_path, 0, winreg.KEY_SET_VALUE), name)
+                self.backend.delete_value(STARTUP_RUN_KEY, name)
                 QMessageBox.information(self, "Success", f"Disabled startup item: {name}")
                 self.load_startup_items()
             except FileNotFoundError:
@@ -600,12 +4738,630 @@ class StartupManagerTab(QWidget):
         else:
             QMessageBox.warning(self, "No Selection", "Please select a startup item to disable.")
 
+# ==========================
+# Performance Panel
+# ==========================
+class PerformancePanel(QWidget):
+    """Tool window listing p50/p99 per instrumented hook, toggled with F12."""
+    HEADERS = ("Hook", "Calls", "Mean (ms)", "p50 (ms)", "p99 (ms)", "Max (ms)")
+    FIELDS = ("count", "mean_ms", "p50_ms", "p99_ms", "max_ms")
+
+    def __init__(self, parent=None):
+        super().__init__(parent, Qt.Tool)
+        self.setWindowTitle("ChaoSmart - Performance")
+        self.resize(720, 420)
+        layout = QVBoxLayout()
+
+        self.table = QTableWidget(0, len(self.HEADERS))
+        self.table.setHorizontalHeaderLabels(self.HEADERS)
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+
+        self.dump_button = QPushButton("Save Histograms...")
+        self.dump_button.clicked.connect(self.dump)
+        self.profile_count = QSpinBox()
+        self.profile_count.setRange(1, 1000)
+        self.profile_count.setValue(20)
+        self.profile_button = QPushButton("Profile Next Refreshes...")
+        self.profile_button.clicked.connect(self.profile)
+        self.status_label = QLabel()
+
+        button_layout = QHBoxLayout()
+        button_layout.addWidget(self.dump_button)
+        button_layout.addStretch()
+        button_layout.addWidget(self.profile_count)
+        button_layout.addWidget(self.profile_button)
+
+        layout.addWidget(self.table)
+        layout.addLayout(button_layout)
+        layout.addWidget(self.status_label)
+        self.setLayout(layout)
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(1000)
+        self.timer.timeout.connect(self.update_table)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.update_table()
+        self.timer.start()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.timer.stop()
+
+    def update_table(self):
+        summaries = INSTRUMENTS.summaries()
+        self.table.setRowCount(len(summaries))
+        for row, (name, summary) in enumerate(summaries.items()):
+            self.table.setItem(row, 0, QTableWidgetItem(name))
+            for column, field in enumerate(self.FIELDS, 1):
+                value = summary[field]
+                item = QTableWidgetItem(f"{value:,}" if field == "count" else f"{value:.2f}")
+                item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                self.table.setItem(row, column, item)
+
+    def dump(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Save Histograms", data_path("hotpaths.json"), "JSON (*.json)")
+        if path:
+            try:
+                INSTRUMENTS.dump(path)
+                self.status_label.setText(f"Saved to {path}")
+            except OSError as e:
+                QMessageBox.warning(self, "Error", f"Failed to save histograms:\n{e}")
+
+    def profile(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Save Profile", data_path("refresh_profile.prof"),
+                                              "Profiles (*.prof)")
+        if path:
+            count = self.profile_count.value()
+            INSTRUMENTS.profile_next(count, path)
+            self.status_label.setText(f"Profiling the next {count} refreshes into {path}")
+
+# ==========================
+# Alerts
+# ==========================
+class SlidingWindow:
+    """Count, sum and least-squares sums over the last `seconds` of samples.
+
+    add() is amortised O(1): a new point is added to the running sums and
+    points that fall out of the window are subtracted again, so mean() and
+    slope() never rescan the window. Times are stored relative to an origin
+    that moves forward once a day; re-basing recomputes the sums from the
+    points, which also drops any rounding drift from the add/subtract pairs.
+    """
+    REBASE_SECONDS = 86400.0
+
+    def __init__(self, seconds):
+        self.seconds = seconds
+        self.points = deque()  # (t - origin, value)
+        self.origin = None
+        self.n = 0
+        self.sum_t = self.sum_v = self.sum_tt = self.sum_tv = 0.0
+
+    def add(self, timestamp, value):
+        if self.origin is None or timestamp - self.origin > self.REBASE_SECONDS:
+            self._rebase(timestamp)
+        t = timestamp - self.origin
+        self.points.append((t, value))
+        self._accumulate(t, value, 1)
+        cutoff = t - self.seconds
+        while self.points[0][0] < cutoff:
+            old_t, old_value = self.points.popleft()
+            self._accumulate(old_t, old_value, -1)
+
+    def _accumulate(self, t, value, sign):
+        self.n += sign
+        self.sum_t += sign * t
+        self.sum_v += sign * value
+        self.sum_tt += sign * t * t
+        self.sum_tv += sign * t * value
+
+    def _rebase(self, timestamp):
+        shift = 0.0 if self.origin is None else self.origin - timestamp
+        self.origin = timestamp
+        points, self.points = self.points, deque()
+        self.n = 0
+        self.sum_t = self.sum_v = self.sum_tt = self.sum_tv = 0.0
+        for t, value in points:
+            self.points.append((t + shift, value))
+            self._accumulate(t + shift, value, 1)
+
+    def span(self):
+        return self.points[-1][0] - self.points[0][0] if self.points else 0.0
+
+    def mean(self):
+        return self.sum_v / self.n if self.n else None
+
+    def slope(self):
+        """Least-squares change per second, or None with fewer than two distinct times."""
+        denominator = self.n * self.sum_tt - self.sum_t * self.sum_t
+        if self.n < 2 or denominator <= 0:
+            return None
+        return (self.n * self.sum_tv - self.sum_t * self.sum_v) / denominator
+
+Alert = namedtuple("Alert", "rule state value timestamp message")  # state: "firing" or "resolved"
+
+class AlertRule:
+    """One condition from alerts.json, evaluated on every new value of its metric.
+
+    `of` picks what is compared with above/below: the latest "value", the
+    "mean" over the window, or the "rate" of change per second over the
+    window. fills_within instead alerts when the metric, at its current rate,
+    reaches limit within that many seconds. `for` is how long the condition
+    must hold before the alert fires. Window-based checks wait until half
+    the window is covered, so a rate is never fitted to two noisy points.
+    """
+    KINDS = ("value", "mean", "rate")
+
+    def __init__(self, name, metric, above=None, below=None, of="value", window=60.0, hold=0.0,
+                 fills_within=None, limit=100.0):
+        if of not in self.KINDS:
+            raise ValueError(f"{name}: 'of' must be one of {', '.join(self.KINDS)}")
+        if (above is None and below is None) == (fills_within is None):
+            raise ValueError(f"{name}: needs 'above' or 'below', or 'fills_within'")
+        if window <= 0:
+            raise ValueError(f"{name}: 'window' must be positive")
+        self.name = name
+        self.metric = metric
+        self.above = above
+        self.below = below
+        self.of = "fill" if fills_within is not None else of
+        self.window = window if self.of != "value" else None
+        self.hold = hold
+        self.fills_within = fills_within
+        self.limit = limit
+        self.since = None  # When the condition started holding
+        self.firing = False
+        self.measured = None
+
+    @classmethod
+    def from_config(cls, config):
+        if not isinstance(config, dict) or not isinstance(config.get("metric"), str):
+            raise ValueError(f"rule needs a 'metric': {config!r}")
+        name = str(config.get("name", config["metric"]))
+        optional = lambda key: None if config.get(key) is None else float(config[key])
+        try:
+            numbers = dict(above=optional("above"), below=optional("below"), fills_within=optional("fills_within"),
+                           window=float(config.get("window", 60)), hold=float(config.get("for", 0)),
+                           limit=float(config.get("limit", 100)))
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"{name}: {e}") from None
+        return cls(name, config["metric"], of=config.get("of", "value"), **numbers)
+
+    def measure(self, value, window):
+        """The quantity the rule compares, or None until the window has enough data."""
+        if self.of == "value":
+            return value
+        if window.span() < self.window / 2:
+            return None
+        if self.of == "mean":
+            return window.mean()
+        slope = window.slope()
+        if slope is None or self.of == "rate":
+            return slope
+        return (self.limit - value) / slope if slope > 0 else float("inf")  # Seconds until full
+
+    def breached(self, measured):
+        if self.of == "fill":
+            return measured < self.fills_within
+        return (self.above is not None and measured > self.above) or (self.below is not None and measured < self.below)
+
+    def update(self, timestamp, value, window):
+        """Return "firing" or "resolved" when the alert changes state, else None."""
+        measured = self.measured = self.measure(value, window)
+        if measured is None:
+            return None
+        if self.breached(measured):
+            if self.since is None:
+                self.since = timestamp
+            if not self.firing and timestamp - self.since >= self.hold:
+                self.firing = True
+                return "firing"
+        else:
+            self.since = None
+            if self.firing:
+                self.firing = False
+                return "resolved"
+        return None
+
+    def describe(self, value):
+        """A one-line message for the latest value and the last measure()."""
+        if self.of == "fill":
+            eta = "not filling" if self.measured == float("inf") else f"{self.measured:.0f} s to go"
+            return f"{self.metric} at {value:.1f} reaches {self.limit:g} within {self.fills_within:g} s ({eta})"
+        what = {"value": self.metric, "mean": f"mean {self.metric}", "rate": f"{self.metric} per second"}[self.of]
+        bound = f"above {self.above:g}" if self.above is not None else f"below {self.below:g}"
+        held = f" for {self.hold:g} s" if self.hold else ""
+        return f"{what} {bound}{held} (now {self.measured:g})"
+
+class AlertEngine:
+    """Evaluates AlertRules on every sample and passes state changes to sinks.
+
+    Metrics are the sampler's values (cpu, cpu0, memory, disk, disk_read,
+    ...), plus "fs:<mountpoint>" (percent used), "disk_read:<disk>" and
+    "disk_write:<disk>", and "process_cpu:<name>", "process_rss:<name>" and
+    "process_io:<name>" (the largest among processes of that name) from
+    process snapshots. Rules are grouped by metric and rules with the same
+    metric and window share one SlidingWindow, so a sample costs O(1) per
+    rule. Sinks are callables taking an Alert, called on the observing
+    thread; they must hand slow work off. A sink that raises is logged and
+    does not keep the alert from the others.
+    """
+    PROCESS_FIELDS = {"process_cpu": "cpu", "process_rss": "rss", "process_io": "io"}
+
+    def __init__(self, rules, sinks=()):
+        self.rules = list(rules)
+        self.sinks = list(sinks)
+        self.by_metric = {}  # metric -> ([SlidingWindow], [(rule, window)])
+        for rule in self.rules:
+            windows, entries = self.by_metric.setdefault(rule.metric, ([], []))
+            window = None
+            if rule.window is not None:
+                window = next((w for w in windows if w.seconds == rule.window), None)
+                if window is None:
+                    window = SlidingWindow(rule.window)
+                    windows.append(window)
+            entries.append((rule, window))
+        self.needs_disks = any(metric.partition(":")[0] in ("fs", "disk_read", "disk_write")
+                               and ":" in metric for metric in self.by_metric)
+        self.process_metrics = {}  # name -> [(metric, field)]
+        for metric in self.by_metric:
+            prefix, _, name = metric.partition(":")
+            if prefix in self.PROCESS_FIELDS and name:
+                self.process_metrics.setdefault(name, []).append((metric, self.PROCESS_FIELDS[prefix]))
+        self.active = {}  # rule name -> Alert while firing
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path=None, desktop=None):
+        """The engine for ~/.chaosmart/alerts.json, or None without the file or rules.
+
+        {"rules": [...], "log": true, "webhook": "https://...", "desktop": true}.
+        desktop() creates the desktop notification sink, if there is one.
+        Raises ValueError if the file is not valid.
+        """
+        path = path or data_path("alerts.json")
+        try:
+            with open(path, encoding="utf-8") as f:
+                config = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, json.JSONDecodeError) as e:
+            raise ValueError(f"{path}: {e}") from None
+        if not isinstance(config, dict) or not isinstance(config.get("rules", []), list):
+            raise ValueError(f"{path}: expected an object with a list of rules")
+        rules = [AlertRule.from_config(rule) for rule in config.get("rules", [])]
+        if not rules:
+            return None
+        sinks = []
+        if config.get("log", True):
+            sinks.append(AlertLogSink(data_path("alerts.log")))
+        if config.get("webhook"):
+            sinks.append(WebhookSink(config["webhook"]))
+        if desktop is not None and config.get("desktop", True):
+            sinks.append(desktop())
+        return cls(rules, sinks)
+
+    def watch(self, sampler):
+        """Evaluate every new sample of a MetricsSampler."""
+        sampler.listeners.append(lambda sample: self.observe_sample(sample, sampler.disk_snapshot()))
+
+    @property
+    def needs_processes(self):
+        return bool(self.process_metrics) or "processes" in self.by_metric
+
+    def observe(self, timestamp, values):
+        with self._lock:
+            for metric, (windows, entries) in self.by_metric.items():
+                value = values.get(metric)
+                if value is None:
+                    continue
+                for window in windows:
+                    window.add(timestamp, value)
+                for rule, window in entries:
+                    state = rule.update(timestamp, value, window)
+                    if state is not None:
+                        self._notify(Alert(rule.name, state, value, timestamp, rule.describe(value)))
+
+    def _notify(self, alert):
+        if alert.state == "firing":
+            self.active[alert.rule] = alert
+        else:
+            self.active.pop(alert.rule, None)
+        for sink in self.sinks:
+            try:
+                sink(alert)
+            except Exception:
+                log.exception("Alert sink %r failed", sink)
+
+    def observe_sample(self, sample, disks=None):
+        """Evaluate a MetricsSampler sample, with its disk_snapshot() for fs:/disk_* rules."""
+        values = sample
+        if self.needs_disks and disks is not None:
+            names, read, write, partitions = disks
+            values = dict(sample)
+            for row, disk in enumerate(names):
+                values[f"disk_read:{disk}"] = read[row]
+                values[f"disk_write:{disk}"] = write[row]
+            for row, mountpoint in enumerate(partitions.mountpoints):
+                if partitions.states[row] == PartitionPoller.OK:
+                    values[f"fs:{mountpoint}"] = partitions.percent[row]
+        self.observe(sample["timestamp"], values)
+
+    def observe_processes(self, timestamp, records):
+        """Evaluate process_* rules against a ProcessRegistry snapshot."""
+        values = {"processes": len(records)}
+        wanted = self.process_metrics
+        for record in records:
+            metrics = wanted.get(record.name)
+            if metrics is not None:
+                for metric, field in metrics:
+                    value = getattr(record, field)
+                    if value > values.get(metric, -1):
+                        values[metric] = value
+        # A rule whose process is not running sees zero, so it can resolve
+        for metrics in wanted.values():
+            for metric, field in metrics:
+                values.setdefault(metric, 0)
+        self.observe(timestamp, values)
+
+def open_alert_engine(desktop=None):
+    """The AlertEngine for ~/.chaosmart/alerts.json, or None; a bad file is reported, not fatal."""
+    try:
+        return AlertEngine.load(desktop=desktop)
+    except ValueError as e:
+        log.warning("Alerts disabled: %s", e)
+        return None
+
+class AlertLogSink:
+    """Appends each alert to a JSON-lines file."""
+    def __init__(self, path):
+        self.path = path
+
+    def __call__(self, alert):
+        try:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(alert._asdict()) + "\n")
+        except OSError:
+            pass  # Alerts still reach the other sinks
+
+class WebhookSink:
+    """POSTs each alert as JSON from a daemon thread, so a slow endpoint never
+    holds up the sampler. Failed deliveries are logged and counted, not
+    retried; while the endpoint is down at most `backlog` alerts wait, and
+    the oldest is dropped to make room for a new one."""
+    def __init__(self, url, timeout=5.0, backlog=100):
+        self.url = url
+        self.timeout = timeout
+        self.failures = 0
+        self.dropped = 0
+        self.queue = queue.Queue(maxsize=backlog)
+        threading.Thread(target=self._run, name="WebhookSink", daemon=True).start()
+
+    def __call__(self, alert):
+        while True:
+            try:
+                self.queue.put_nowait(alert)
+                return
+            except queue.Full:
+                try:
+                    self.queue.get_nowait()
+                    self.dropped += 1
+                except queue.Empty:
+                    pass
+
+    def _run(self):
+        import urllib.request  # Pulls in http.client and ssl; kept off the startup path
+        while True:
+            alert = self.queue.get()
+            try:
+                request = urllib.request.Request(self.url, data=json.dumps(alert._asdict()).encode(),
+                                                 headers={"Content-Type": "application/json"})
+                urllib.request.urlopen(request, timeout=self.timeout).close()
+            except Exception:
+                # Includes http.client errors such as RemoteDisconnected
+                self.failures += 1
+                log.exception("Webhook delivery to %s failed", self.url)
+
+class TrayNotifier(QObject):
+    """Desktop notifications through a tray icon; callable from any thread."""
+    alert = pyqtSignal(object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.tray = QSystemTrayIcon(QApplication.style().standardIcon(QStyle.SP_MessageBoxWarning), parent)
+        self.tray.setToolTip("ChaoSmart alerts")
+        self.tray.show()
+        self.alert.connect(self.show_alert, Qt.QueuedConnection)
+
+    def __call__(self, alert):
+        self.alert.emit(alert)
+
+    def show_alert(self, alert):
+        if alert.state == "firing":
+            self.tray.showMessage(f"Alert: {alert.rule}", alert.message, QSystemTrayIcon.Warning)
+        else:
+            self.tray.showMessage(f"Resolved: {alert.rule}", alert.message, QSystemTrayIcon.Information)
+
+# ==========================
+# Refresh Scheduler
+# ==========================
+class RefreshJob:
+    __slots__ = ("widget", "callback", "interval", "cost", "backoff", "due", "last_duration")
+
+    def __init__(self, widget, callback, interval, cost):
+        self.widget = widget
+        self.callback = callback
+        self.interval = interval  # ms, or None to refresh only on request
+        self.cost = cost          # ms budget per refresh
+        self.backoff = 1
+        self.due = 0.0 if interval is not None else None
+        self.last_duration = 0.0
+
+class RefreshScheduler(QObject):
+    """One timer that refreshes the registered tabs that are actually visible.
+
+    Each tab registers a callback with a desired interval and a cost budget.
+    Hidden tabs and a minimized window are never polled; a requested refresh
+    for them is remembered and runs when they are shown. Requests that pile
+    up before the next run are coalesced, and a refresh that overruns its
+    budget doubles that tab's interval (up to max_backoff) until it fits
+    again.
+    """
+    def __init__(self, window, max_backoff=16):
+        super().__init__()
+        self.window = window
+        self.max_backoff = max_backoff
+        self.jobs = []
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.run_due)
+
+    def register(self, widget, callback, interval=None, cost=10):
+        job = RefreshJob(widget, callback, interval, cost)
+        self.jobs.append(job)
+        self.wake()
+        return job
+
+    def visible(self, job):
+        return job.widget.isVisible() and not self.window.isMinimized()
+
+    def request(self, widget=None):
+        """Ask for an immediate refresh of one widget, or of all of them."""
+        for job in self.jobs:
+            if widget is None or job.widget is widget:
+                job.due = 0.0
+        self.wake()
+
+    def wake(self):
+        """Re-plan the timer, e.g. after a tab switch or window state change."""
+        now = time.monotonic()
+        due = [job.due for job in self.jobs if job.due is not None and self.visible(job)]
+        if not due:
+            self.timer.stop()
+            return
+        delay = max(0, int((min(due) - now) * 1000))
+        if not self.timer.isActive() or self.timer.remainingTime() > delay:
+            self.timer.start(delay)
+
+    def run_due(self):
+        now = time.monotonic()
+        for job in self.jobs:
+            if job.due is not None and job.due <= now and self.visible(job):
+                self.run(job)
+        self.wake()
+
+    def run(self, job):
+        started = time.perf_counter()
+        try:
+            job.callback()
+        except Exception:
+            # A failing refresh waits for its next interval like any other
+            log.exception("Refresh of %s failed", type(job.widget).__name__)
+        finally:
+            job.last_duration = (time.perf_counter() - started) * 1000
+            if job.last_duration > job.cost:
+                job.backoff = min(job.backoff * 2, self.max_backoff)
+            elif job.backoff > 1:
+                job.backoff //= 2
+            job.due = None if job.interval is None else time.monotonic() + job.interval * job.backoff / 1000
+
+# ==========================
+# Startup
+# ==========================
+STARTUP_SNAPSHOT = "last_snapshot.json"
+STARTUP_REPORT = "startup_report.json"
+
+def load_startup_snapshot(path=None):
+    """Return (metrics sample or None, process records) saved by the last session."""
+    try:
+        with open(path or data_path(STARTUP_SNAPSHOT), encoding="utf-8") as f:
+            data = json.load(f)
+        return data.get("metrics"), [ProcessRecord(*row) for row in data.get("processes", ())]
+    except (OSError, ValueError, TypeError, AttributeError):
+        # Missing, corrupt or from an older schema; start empty
+        return None, []
+
+def save_startup_snapshot(metrics, records, path=None):
+    data = {"metrics": metrics, "processes": [list(record) for record in records]}
+    try:
+        with open(path or data_path(STARTUP_SNAPSHOT), "w", encoding="utf-8") as f:
+            json.dump(data, f)
+    except OSError:
+        pass
+
+class StartupTimer:
+    """Records how long startup takes, up to the first painted frame.
+
+    Marks are milliseconds since the timer was created; the process start
+    time (when psutil can tell) adds the interpreter and import cost in
+    front of that. Tab build costs are recorded separately because tabs are
+    built on first activation, possibly long after startup.
+    """
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.wall_started = time.time()
+        self.marks = OrderedDict()
+        self.tab_costs = OrderedDict()
+
+    def elapsed(self):
+        return (time.perf_counter() - self.started) * 1000
+
+    def mark(self, name):
+        if name not in self.marks:
+            self.marks[name] = round(self.elapsed(), 2)
+
+    def measure_tab(self, title, started):
+        self.tab_costs[title] = round((time.perf_counter() - started) * 1000, 2)
+
+    def report(self):
+        report = {"marks_ms": dict(self.marks), "tab_build_ms": dict(self.tab_costs)}
+        try:
+            process_started = psutil.Process().create_time()
+        except Exception:
+            process_started = None
+        if process_started is not None and "first_paint" in self.marks:
+            before = (self.wall_started - process_started) * 1000
+            report["process_start_to_first_paint_ms"] = round(before + self.marks["first_paint"], 2)
+        return report
+
+    def write(self, path=None):
+        try:
+            with open(path or data_path(STARTUP_REPORT), "w", encoding="utf-8") as f:
+                json.dump(self.report(), f, indent=2)
+        except OSError:
+            pass
+
+class LazyTab(QWidget):
+    """Placeholder page that builds the real tab the first time it is shown."""
+    def __init__(self, factory):
+        super().__init__()
+        self.factory = factory
+        self.widget = None
+        layout = QVBoxLayout()
+        layout.setContentsMargins(0, 0, 0, 0)
+        self.setLayout(layout)
+
+    def build(self):
+        if self.widget is None:
+            self.widget = self.factory()
+            self.layout().addWidget(self.widget)
+            # Visible straight away rather than on the next event loop pass,
+            # so the scheduler sees it in the same tab change
+            self.widget.show()
+        return self.widget
+
 # ==========================
 # Main Application Window
 # ==========================
 class MainWindow(QMainWindow):
-    def __init__(self):
+    FADE_IN_MS = 150
+
+    def __init__(self, startup_timer=None):
         super().__init__()
+        self.startup = startup_timer or StartupTimer()
         self.setWindowTitle("ChaoSmart - PC Utility Tool")
         self.setWindowIcon(QIcon())  # Optionally, set a custom icon here
         self.setGeometry(100, 100, 1000, 800)
@@ -617,21 +5373,55 @@ class MainWindow(QMainWindow):
         self.tabs = QTabWidget()
         self.setCentralWidget(self.tabs)
 
-        # Initialize Each Tab
-        self.system_info_tab = SystemInfoTab()
-        self.network_info_tab = NetworkInfoTab()
-        self.file_explorer_tab = FileExplorerTab()
-        self.process_manager_tab = ProcessManagerTab()
-        self.registry_editor_tab = RegistryEditorTab()
-        self.startup_manager_tab = StartupManagerTab()
-
-        # Add Tabs with Icons
-        self.tabs.addTab(self.system_info_tab, QIcon('system_info.png'), "System Info")
-        self.tabs.addTab(self.network_info_tab, QIcon('network_info.png'), "Network Info")
-        self.tabs.addTab(self.file_explorer_tab, QIcon('file_explorer.png'), "File Explorer")
-        self.tabs.addTab(self.process_manager_tab, QIcon('process_manager.png'), "Process Manager")
-        self.tabs.addTab(self.registry_editor_tab, QIcon('registry_editor.png'), "Registry Editor")
-        self.tabs.addTab(self.startup_manager_tab, QIcon('startup_manager.png'), "Startup Manager")
+        # Background metrics sampler shared by the tabs, persisted to disk
+        self.store = open_metric_store()
+        self.sampler = MetricsSampler(store=self.store)
+        self.sampler.start()
+
+        # Last session's numbers, shown until live data arrives
+        self.cached_sample, self.cached_records = load_startup_snapshot()
+
+        # Central refresh scheduler; only the visible tab is polled
+        self.scheduler = RefreshScheduler(self)
+
+        # Alert rules run on the sampler thread
+        desktop = (lambda: TrayNotifier(self)) if QSystemTrayIcon.isSystemTrayAvailable() else None
+        self.alerts = open_alert_engine(desktop)
+        if self.alerts is not None:
+            self.alerts.watch(self.sampler)
+
+        # Process history and process alert rules get snapshots from the Process
+        # tab while it is polled, else from this worker; see update_process_worker()
+        self.process_worker = None
+        if self.store is not None or (self.alerts is not None and self.alerts.needs_processes):
+            period = self.store.process_period if self.store is not None else 5.0
+            self.process_worker = ProcessSnapshotWorker(ProcessRegistry(), int(period * 1000))
+            self.process_worker.snapshot_ready.connect(self.background_processes)
+            self.process_worker.snapshot_failed.connect(
+                lambda error: log.warning("Background process snapshot failed: %r", error))
+
+        # Tabs are built on first activation; until then their attribute is None
+        self.system_info_tab = None
+        self.network_info_tab = None
+        self.file_explorer_tab = None
+        self.process_manager_tab = None
+        self.connections_tab = None
+        self.registry_editor_tab = None
+        self.startup_manager_tab = None
+        self._registry_backend = None
+        self.tab_specs = [
+            ("system_info_tab", "System Info", 'system_info.png', self.build_system_info_tab),
+            ("network_info_tab", "Network Info", 'network_info.png', self.build_network_info_tab),
+            ("file_explorer_tab", "File Explorer", 'file_explorer.png', self.build_file_explorer_tab),
+            ("process_manager_tab", "Process Manager", 'process_manager.png', self.build_process_manager_tab),
+            ("connections_tab", "Connections", 'connections.png', self.build_connections_tab),
+            ("registry_editor_tab", "Registry Editor", 'registry_editor.png', self.build_registry_editor_tab),
+            ("startup_manager_tab", "Startup Manager", 'startup_manager.png', self.build_startup_manager_tab),
+        ]
+        for attr, title, icon, builder in self.tab_specs:
+            self.tabs.addTab(LazyTab(builder), QIcon(icon), title)
+        self.tabs.currentChanged.connect(self.tab_changed)
+        self.tab_changed(self.tabs.currentIndex())
 
         # Refresh Button with Animation
         self.refresh_button = QPushButton("Refresh All")
@@ -656,8 +5446,86 @@ class MainWindow(QMainWindow):
         container.setLayout(main_layout)
         self.setCentralWidget(container)
 
+        # Hot-path latency: event-loop probe plus the F12 performance panel
+        self.event_loop_probe = EventLoopProbe()
+        self.event_loop_probe.start()
+        self.performance_panel = None
+        QShortcut(QKeySequence("F12"), self, self.toggle_performance_panel)
+
         # Add Fade-in Animation for the Entire Window
         self.fade_in()
+        self.startup.mark("window_constructed")
+
+    @property
+    def registry_backend(self):
+        if self._registry_backend is None:
+            self._registry_backend = default_registry_backend()
+        return self._registry_backend
+
+    def tab_changed(self, index):
+        page = self.tabs.widget(index)
+        if isinstance(page, LazyTab) and page.widget is None:
+            attr, title, icon, builder = self.tab_specs[index]
+            started = time.perf_counter()
+            setattr(self, attr, page.build())
+            self.startup.measure_tab(title, started)
+        self.scheduler.wake()
+        self.update_process_worker()
+
+    def build_system_info_tab(self):
+        tab = SystemInfoTab(self.sampler, self.cached_sample)
+        self.scheduler.register(tab, tab.update_info, interval=1000, cost=5)
+        return tab
+
+    def build_network_info_tab(self):
+        tab = NetworkInfoTab(self.sampler)
+        self.scheduler.register(tab, tab.update_info, interval=3000, cost=10)
+        return tab
+
+    def build_file_explorer_tab(self):
+        tab = FileExplorerTab()
+        self.scheduler.register(tab, tab.refresh)
+        return tab
+
+    def build_process_manager_tab(self):
+        tab = ProcessManagerTab(cached_records=self.cached_records)
+        self.scheduler.register(tab, tab.refresh, interval=3000, cost=5)
+        tab.snapshot_worker.snapshot_ready.connect(self.background_processes)
+        return tab
+
+    def build_connections_tab(self):
+        tab = ConnectionsTab(self.process_names)
+        self.scheduler.register(tab, tab.refresh, interval=3000, cost=5)
+        return tab
+
+    def build_registry_editor_tab(self):
+        tab = RegistryEditorTab(self.registry_backend)
+        self.scheduler.register(tab, tab.load_registry_key)
+        return tab
+
+    def build_startup_manager_tab(self):
+        tab = StartupManagerTab(self.registry_backend)
+        self.scheduler.register(tab, tab.load_startup_items)
+        return tab
+
+    def process_names(self):
+        """pid -> name, from the process tab's snapshot when it has one.
+
+        Runs on the connections worker thread.
+        """
+        if self.process_manager_tab is not None:
+            records = self.process_manager_tab.snapshot_worker.latest
+            if records:
+                return {record.pid: record.name for record in records}
+        names = {}
+        for proc in psutil.process_iter(['name']):
+            names[proc.pid] = proc.info['name']
+        return names
+
+    def toggle_performance_panel(self):
+        if self.performance_panel is None:
+            self.performance_panel = PerformancePanel(self)
+        self.performance_panel.setVisible(not self.performance_panel.isVisible())
 
     def add_button_animation(self, button):
         """Add a hover animation to buttons."""
@@ -679,27 +5547,311 @@ class MainWindow(QMainWindow):
         self.effect = QGraphicsOpacityEffect()
         self.setGraphicsEffect(self.effect)
         self.animation = QPropertyAnimation(self.effect, b"opacity")
-        self.animation.setDuration(1000)  # 1 second
+        self.animation.setDuration(self.FADE_IN_MS)
         self.animation.setStartValue(0)
         self.animation.setEndValue(1)
+        # An opacity effect re-renders the whole window offscreen; drop it once opaque
+        self.animation.finished.connect(lambda: self.setGraphicsEffect(None))
         self.animation.start()
 
+    def event(self, event):
+        if event.type() == QEvent.Paint and "first_paint" not in self.startup.marks:
+            self.startup.mark("first_paint")
+            QTimer.singleShot(0, self.startup.write)
+        return super().event(event)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.scheduler.wake()
+        self.update_process_worker()
+
+    def changeEvent(self, event):
+        super().changeEvent(event)
+        if event.type() == QEvent.WindowStateChange:
+            self.scheduler.wake()
+            self.update_process_worker()
+
+    def update_process_worker(self):
+        """Run the background process snapshots only when nobody else takes them.
+
+        The Process tab's own snapshots stand in while it is polled; a
+        minimized window only needs them for process alert rules.
+        """
+        worker = self.process_worker
+        if worker is None:
+            return
+        minimized = self.isMinimized()
+        tab_polled = (self.process_manager_tab is not None and self.process_manager_tab.isVisible()
+                      and not minimized)
+        wanted = not tab_polled and (not minimized or (self.alerts is not None and self.alerts.needs_processes))
+        if wanted and not worker.active:
+            worker.start()
+        elif not wanted and worker.active:
+            worker.pause()
+
+    def background_processes(self, records):
+        timestamp = time.time()
+        if self.store is not None:
+            self.store.record_processes(timestamp, records)
+        if self.alerts is not None and self.alerts.needs_processes:
+            self.alerts.observe_processes(timestamp, records)
+
+    def closeEvent(self, event):
+        self.scheduler.timer.stop()
+        self.event_loop_probe.stop()
+        self.sampler.stop()
+        records = self.cached_records
+        if self.process_worker is not None:
+            self.process_worker.stop()
+            records = self.process_worker.latest or records
+        if self.process_manager_tab is not None:
+            self.process_manager_tab.snapshot_worker.stop()
+            records = self.process_manager_tab.snapshot_worker.latest or records
+        if self.connections_tab is not None:
+            self.connections_tab.snapshot_worker.stop()
+        if self.file_explorer_tab is not None:
+            self.file_explorer_tab.loader.cancel()
+            self.file_explorer_tab.index.stop()
+        save_startup_snapshot(self.sampler.latest() or self.cached_sample, records)
+        if self.store is not None:
+            self.store.close()
+        super().closeEvent(event)
+
     def refresh_all(self):
-        self.system_info_tab.update_info()
-        self.network_info_tab.update_info()
-        self.file_explorer_tab.load_directory()
-        self.process_manager_tab.load_processes()
-        self.registry_editor_tab.load_registry_key()
-        self.startup_manager_tab.load_startup_items()
+        # Hidden tabs refresh when they are next shown
+        self.scheduler.request()
         # Removed QMessageBox to eliminate "Refreshed" message
 
+# ==========================
+# Headless Daemon
+# ==========================
+def prometheus_label(value):
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+def render_prometheus(sample, rates, records, top=20, disks=None):
+    """Prometheus text exposition of one sample, network rates, process list and
+    optionally a MetricsSampler.disk_snapshot()."""
+    lines = []
+
+    def metric(name, kind, help_text, values):
+        lines.append(f"# HELP chaosmart_{name} {help_text}")
+        lines.append(f"# TYPE chaosmart_{name} {kind}")
+        for labels, value in values:
+            label_text = ",".join(f'{key}="{prometheus_label(val)}"' for key, val in labels)
+            lines.append(f"chaosmart_{name}{{{label_text}}} {value}" if labels else f"chaosmart_{name} {value}")
+
+    if sample is not None:
+        metric("cpu_percent", "gauge", "System-wide CPU utilisation.", [((), sample["cpu"])])
+        metric("memory_percent", "gauge", "Physical memory in use.", [((), sample["memory"])])
+        metric("disk_percent", "gauge", "Root filesystem space in use.", [((), sample["disk"])])
+        metric("sample_timestamp_seconds", "gauge", "Time of the latest sample.", [((), sample["timestamp"])])
+        cores = sorted((int(name[3:]), value) for name, value in sample.items()
+                       if name.startswith("cpu") and name[3:].isdigit())
+        metric("cpu_core_percent", "gauge", "Per-core CPU utilisation.",
+               [((("core", core),), value) for core, value in cores])
+    if disks is not None:
+        names, read, write, partitions = disks
+        metric("disk_read_bytes_per_second", "gauge", "Bytes read per second, per disk.",
+               [((("disk", disk),), round(read[row], 2)) for row, disk in enumerate(names)])
+        metric("disk_written_bytes_per_second", "gauge", "Bytes written per second, per disk.",
+               [((("disk", disk),), round(write[row], 2)) for row, disk in enumerate(names)])
+        answered = [row for row, state in enumerate(partitions.states) if state == PartitionPoller.OK]
+        metric("filesystem_size_bytes", "gauge", "File system size.",
+               [((("mountpoint", partitions.mountpoints[row]), ("fstype", partitions.fstypes[row])),
+                 partitions.total[row]) for row in answered])
+        metric("filesystem_used_bytes", "gauge", "File system space in use.",
+               [((("mountpoint", partitions.mountpoints[row]), ("fstype", partitions.fstypes[row])),
+                 partitions.used[row]) for row in answered])
+        metric("filesystem_responding", "gauge", "0 while a file system does not answer within the timeout.",
+               [((("mountpoint", partitions.mountpoints[row]),), int(state != PartitionPoller.HUNG))
+                for row, state in enumerate(partitions.states)])
+    for index, (suffix, help_text) in enumerate((
+            ("receive_bytes_per_second", "Bytes received per second."),
+            ("transmit_bytes_per_second", "Bytes sent per second."),
+            ("receive_packets_per_second", "Packets received per second."),
+            ("transmit_packets_per_second", "Packets sent per second."))):
+        metric(f"network_{suffix}", "gauge", help_text,
+               [((("interface", nic),), round(rate[index], 2)) for nic, rate in sorted(rates.items())])
+    if records is not None:
+        metric("processes", "gauge", "Number of running processes.", [((), len(records))])
+        busiest = heapq.nlargest(top, records, key=lambda record: record.cpu)
+        metric("process_cpu_percent", "gauge", f"CPU utilisation of the {top} busiest processes.",
+               [((("pid", record.pid), ("name", record.name)), record.cpu) for record in busiest])
+    lines.append("")
+    return "\n".join(lines)
+
+class MetricsDaemon:
+    """Serves the sampler's numbers over HTTP without a QApplication.
+
+    A collector thread takes process snapshots and renders every new sample
+    once, as Prometheus text and as a JSON line. Alert rules from
+    alerts.json are evaluated too, with the log and webhook sinks. The asyncio server only
+    hands out those cached bytes, so a scrape never calls psutil and costs
+    the same however often it happens.
+
+    GET /metrics  Prometheus text format
+    GET /stream   one JSON line per sample until the client disconnects
+    GET /latest   the latest JSON line
+    """
+    def __init__(self, host="127.0.0.1", port=9464, interval=1.0, process_interval=5.0):
+        self.host = host
+        self.port = port
+        self.store = open_metric_store()
+        self.sampler = MetricsSampler(interval=interval, store=self.store)
+        self.registry = ProcessRegistry()
+        self.process_interval = process_interval
+        self.records = None
+        self.alerts = open_alert_engine()
+        if self.alerts is not None:
+            self.alerts.watch(self.sampler)
+        self.metrics_body = render_prometheus(None, {}, None).encode()
+        self.latest_line = b"{}\n"
+        self.generation = 0
+        self.loop = None
+        self.updated = None
+        self.server = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def collect(self):
+        last_timestamp = None
+        last_processes = 0.0
+        failure = None
+        while not self._stop.is_set():
+            try:
+                now = time.monotonic()
+                if now - last_processes >= self.process_interval:
+                    last_processes = now  # A failed snapshot waits for the next period too
+                    self.records = self.registry.snapshot(cancelled=self._stop.is_set)
+                    if self.store is not None and self.records:
+                        self.store.record_processes(time.time(), self.records)
+                    if self.alerts is not None and self.alerts.needs_processes and self.records is not None:
+                        self.alerts.observe_processes(time.time(), self.records)
+                sample = self.sampler.latest()
+                if sample is not None and sample["timestamp"] != last_timestamp:
+                    last_timestamp = sample["timestamp"]
+                    interfaces, rates, history = self.sampler.network_snapshot()
+                    body = render_prometheus(sample, rates, self.records, disks=self.sampler.disk_snapshot()).encode()
+                    record = dict(sample,
+                                  network={nic: [round(value, 2) for value in rate] for nic, rate in rates.items()},
+                                  processes=None if self.records is None else len(self.records))
+                    line = (json.dumps(record) + "\n").encode()
+                    self.loop.call_soon_threadsafe(self.publish, body, line)
+                failure = None
+            except Exception as e:
+                # As in MetricsSampler._run: keep collecting, log each new error once
+                if repr(e) != failure:
+                    log.exception("Collecting daemon metrics failed")
+                failure = repr(e)
+            self._stop.wait(self.sampler.interval / 2)
+
+    def publish(self, body, line):
+        self.metrics_body = body
+        self.latest_line = line
+        self.generation += 1
+        self.updated.set()
+        self.updated = asyncio.Event()
+
+    async def handle(self, reader, writer):
+        try:
+            request = await reader.readline()
+            while (await reader.readline()).strip():
+                pass  # Headers are not used
+            parts = request.decode("latin-1").split()
+            path = parts[1] if len(parts) > 1 else ""
+            if path == "/metrics":
+                await self.respond(writer, b"200 OK", b"text/plain; version=0.0.4", self.metrics_body)
+            elif path == "/latest":
+                await self.respond(writer, b"200 OK", b"application/json", self.latest_line)
+            elif path == "/stream":
+                await self.stream(writer)
+            else:
+                await self.respond(writer, b"404 Not Found", b"text/plain", b"Not found\n")
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except (asyncio.LimitOverrunError, ValueError):
+            # A request or header line longer than the stream limit
+            try:
+                await self.respond(writer, b"400 Bad Request", b"text/plain", b"Bad request\n")
+            except ConnectionError:
+                pass
+        finally:
+            writer.close()
+
+    async def respond(self, writer, status, content_type, body):
+        writer.write(b"HTTP/1.1 " + status + b"\r\nContent-Type: " + content_type +
+                     b"\r\nContent-Length: " + str(len(body)).encode() +
+                     b"\r\nConnection: close\r\n\r\n" + body)
+        await writer.drain()
+
+    async def stream(self, writer):
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/x-ndjson\r\n"
+                     b"Cache-Control: no-cache\r\nConnection: close\r\n\r\n")
+        writer.write(self.latest_line)
+        await writer.drain()
+        while not writer.is_closing():
+            await self.updated.wait()
+            writer.write(self.latest_line)
+            await writer.drain()
+
+    async def serve(self):
+        self.loop = asyncio.get_running_loop()
+        self.updated = asyncio.Event()
+        self.sampler.start()
+        self._thread = threading.Thread(target=self.collect, name="MetricsDaemon", daemon=True)
+        self._thread.start()
+        self.server = await asyncio.start_server(self.handle, self.host, self.port)
+        try:
+            async with self.server:
+                await self.server.serve_forever()
+        finally:
+            self.stop()
+
+    def stop(self):
+        self._stop.set()
+        self.sampler.stop()
+        if self._thread is not None:
+            self._thread.join(timeout=self.sampler.interval + 1)
+            self._thread = None
+        if self.store is not None:
+            self.store.close()
+            self.store = None
+
+def option_value(name, default):
+    """Value following a --name option in sys.argv, or the default."""
+    if name in sys.argv:
+        index = sys.argv.index(name)
+        if index + 1 < len(sys.argv):
+            return sys.argv[index + 1]
+    return default
+
+def run_headless():
+    daemon = MetricsDaemon(host=option_value("--host", "127.0.0.1"),
+                           port=int(option_value("--port", "9464")))
+    print(f"Serving metrics on http://{daemon.host}:{daemon.port}/metrics")
+    try:
+        asyncio.run(daemon.serve())
+    except KeyboardInterrupt:
+        pass
+
 # ==========================
 # Entry Point
 # ==========================
 def main():
+    if "--headless" in sys.argv:
+        run_headless()
+        return
+    startup = StartupTimer()
+    if sys.platform == "win32" and not is_admin():
+        run_as_admin()
     app = QApplication(sys.argv)
-    window = MainWindow()
+    startup.mark("qapplication")
+    window = MainWindow(startup)
     window.show()
+    if "--profile-refreshes" in sys.argv:
+        INSTRUMENTS.profile_next(int(option_value("--profile-refreshes", "20")), data_path("refresh_profile.prof"))
+    if "--startup-report" in sys.argv:
+        QTimer.singleShot(0, lambda: print(json.dumps(startup.report(), indent=2)))
     sys.exit(app.exec_())
 
 if __name__ == "__main__":